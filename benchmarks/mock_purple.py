@@ -0,0 +1,68 @@
+"""
+Scripted purple agent for benchmarks.
+
+Replies to each conversation turn with the next JSON action from a fixed
+script (tool calls first, then a plain response), so green-agent overhead can
+be measured without an LLM behind the purple agent.
+"""
+import asyncio
+import json
+from typing import Any, Optional
+
+from a2a.server.agent_execution import AgentExecutor, RequestContext
+from a2a.server.apps import A2AStarletteApplication
+from a2a.server.events import EventQueue
+from a2a.server.request_handlers import DefaultRequestHandler
+from a2a.server.tasks import InMemoryTaskStore
+from a2a.types import AgentCapabilities, AgentCard
+from a2a.utils import new_agent_text_message
+from starlette.applications import Starlette
+
+DEFAULT_SCRIPT: list[dict[str, Any]] = [
+    {"name": "get_users", "arguments": {}},
+    {"name": "respond", "arguments": {"content": "All done. Is there anything else I can help with?"}},
+]
+
+
+class ScriptedExecutor(AgentExecutor):
+    """Answers turn N of every conversation with `script[N % len(script)]`."""
+
+    def __init__(self, script: list[dict[str, Any]], latency_sec: float = 0.0):
+        self.script = script
+        self.latency_sec = latency_sec
+        self._turns: dict[str, int] = {}
+
+    async def execute(self, context: RequestContext, event_queue: EventQueue) -> None:
+        turn = self._turns.get(context.context_id, 0)
+        self._turns[context.context_id] = turn + 1
+        if self.latency_sec:
+            await asyncio.sleep(self.latency_sec)
+        action = self.script[turn % len(self.script)]
+        await event_queue.enqueue_event(
+            new_agent_text_message(f"<json>{json.dumps(action)}</json>", context_id=context.context_id)
+        )
+
+    async def cancel(self, context: RequestContext, event_queue: EventQueue) -> None:
+        pass
+
+
+def create_app(
+    card_url: str,
+    script: Optional[list[dict[str, Any]]] = None,
+    latency_sec: float = 0.0,
+) -> Starlette:
+    agent_card = AgentCard(
+        name="MockPurpleAgent",
+        description="Scripted purple agent used by the benchmark suite",
+        url=card_url,
+        version="1.0.0",
+        default_input_modes=["text"],
+        default_output_modes=["text"],
+        capabilities=AgentCapabilities(streaming=True),
+        skills=[],
+    )
+    request_handler = DefaultRequestHandler(
+        agent_executor=ScriptedExecutor(script or DEFAULT_SCRIPT, latency_sec=latency_sec),
+        task_store=InMemoryTaskStore(),
+    )
+    return A2AStarletteApplication(agent_card=agent_card, http_handler=request_handler).build()
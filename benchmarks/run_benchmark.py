@@ -0,0 +1,305 @@
+"""
+End-to-end benchmark for the tau2 green agent.
+
+Starts the green agent app from src/server.py and a scripted purple agent
+(benchmarks/mock_purple.py) in this process, replaces the user simulator LLM
+with ScriptedUserSimulator, and sends EvalRequests over loopback HTTP for
+every (num_tasks, max_concurrency) combination. Only localhost is contacted.
+Each combination runs in its own spawned process, so its peak RSS is not
+inherited from an earlier one.
+
+With --user-llm-cache-dir the real user simulator is used instead, replaying
+turns recorded earlier (--user-llm-cache record needs the user LLM once).
+
+Usage:
+    TAU2_DATA_DIR=... python benchmarks/run_benchmark.py --num-tasks 5 10 --concurrency 1 4
+    python benchmarks/run_benchmark.py --baseline benchmarks/results/baseline.json
+    python benchmarks/run_benchmark.py --user-llm-cache-dir benchmarks/user_turns --user-llm-cache replay
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import platform
+import resource
+import socket
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional
+from uuid import uuid4
+
+import httpx
+import uvicorn
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+sys.path.append(str(BENCHMARKS_DIR.parent / "src"))
+sys.path.append(str(BENCHMARKS_DIR))
+
+import agent as green_agent  # noqa: E402
+import executor as green_executor  # noqa: E402
+import messenger  # noqa: E402
+import mock_purple  # noqa: E402
+import server as green_server  # noqa: E402
+from domain_cache import domain_cache  # noqa: E402
+from result_cache import ResultCache  # noqa: E402
+from stub_user import ScriptedUserSimulator  # noqa: E402
+from timings import percentile  # noqa: E402
+
+DEFAULT_RESULTS_DIR = BENCHMARKS_DIR / "results"
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class TurnLatencyRecorder:
+    """Times every purple-agent turn made through `ConversationSession.exchange`."""
+
+    def __init__(self):
+        self.latencies: list[float] = []
+        self._original_exchange = messenger.ConversationSession.exchange
+
+    def install(self) -> None:
+        original_exchange = self._original_exchange
+        recorder = self
+
+        async def timed_exchange(session, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await original_exchange(session, *args, **kwargs)
+            finally:
+                recorder.latencies.append(time.perf_counter() - start)
+
+        messenger.ConversationSession.exchange = timed_exchange
+
+    def uninstall(self) -> None:
+        messenger.ConversationSession.exchange = self._original_exchange
+
+
+async def _start_server(app, port: int) -> tuple[uvicorn.Server, asyncio.Task]:
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        if task.done():
+            task.result()
+        await asyncio.sleep(0.05)
+    return server, task
+
+
+async def _send_eval_request(green_url: str, purple_url: str, config: dict[str, Any]) -> dict[str, Any]:
+    payload = {"participants": {"agent": purple_url}, "config": config}
+    rpc = {
+        "jsonrpc": "2.0",
+        "id": uuid4().hex,
+        "method": "message/send",
+        "params": {
+            "message": {
+                "kind": "message",
+                "role": "user",
+                "messageId": uuid4().hex,
+                "contextId": uuid4().hex,
+                "parts": [{"kind": "text", "text": json.dumps(payload)}],
+            }
+        },
+    }
+    async with httpx.AsyncClient(timeout=None) as client:
+        response = await client.post(f"{green_url}/", json=rpc)
+        response.raise_for_status()
+    body = response.json()
+    if "error" in body:
+        raise RuntimeError(f"Green agent returned an error: {body['error']}")
+    for artifact in body["result"].get("artifacts") or []:
+        for part in artifact["parts"]:
+            if part.get("kind") == "data" and "summary" in part.get("data", {}):
+                return part["data"]
+    raise RuntimeError(f"No Result artifact in response: {json.dumps(body)[:500]}")
+
+
+async def run_configuration(args: argparse.Namespace, num_tasks: int, concurrency: int) -> dict[str, Any]:
+    """Start both servers, run one EvalRequest and return its measurements."""
+    user_turn_cache = None
+    if args.user_llm_cache_dir:
+        user_turn_cache = ResultCache(args.user_llm_cache_dir, name="user_turn")
+    else:
+        ScriptedUserSimulator.user_turns = args.user_turns
+        green_agent.UserSimulator = ScriptedUserSimulator
+    # Each configuration starts a fresh process; keep loading tau2 and the
+    # domain data out of the measured run.
+    domain_cache.get_tasks(args.domain)
+
+    purple_port, green_port = _free_port(), _free_port()
+    purple_url = f"http://127.0.0.1:{purple_port}"
+    green_url = f"http://127.0.0.1:{green_port}"
+    purple, purple_task = await _start_server(
+        mock_purple.create_app(f"{purple_url}/", latency_sec=args.purple_latency), purple_port
+    )
+    executor = green_executor.Executor(user_turn_cache=user_turn_cache)
+    await executor.warm_up()
+    green, green_task = await _start_server(
+        green_server.create_app(f"{green_url}/", executor=executor, warm_up=False), green_port
+    )
+
+    recorder = TurnLatencyRecorder()
+    recorder.install()
+    try:
+        config = {
+            "domain": args.domain,
+            "num_tasks": num_tasks,
+            "max_concurrency": concurrency,
+            "max_steps": args.max_steps,
+            "timeout_seconds": args.timeout_seconds,
+            "retries": 0,
+        }
+        if user_turn_cache is not None:
+            config["user_llm_cache"] = args.user_llm_cache
+        start = time.perf_counter()
+        result = await _send_eval_request(green_url, purple_url, config)
+        wall_sec = time.perf_counter() - start
+    finally:
+        recorder.uninstall()
+        green.should_exit = True
+        purple.should_exit = True
+        await asyncio.gather(green_task, purple_task)
+
+    completed = result["summary"]["total"]
+    return {
+        "num_tasks": num_tasks,
+        "max_concurrency": concurrency,
+        "tasks_completed": completed,
+        "wall_sec": wall_sec,
+        "tasks_per_sec": completed / wall_sec if wall_sec > 0 else 0.0,
+        "turns": len(recorder.latencies),
+        "turn_latency_sec": {
+            "p50": percentile(recorder.latencies, 50),
+            "p95": percentile(recorder.latencies, 95),
+            "p99": percentile(recorder.latencies, 99),
+            "max": max(recorder.latencies, default=None),
+        },
+        "peak_rss_mb": _peak_rss_mb(),
+        "phase_timings": result.get("timings", {}),
+        "failure_reasons": sorted(
+            {t["failure_reason"] for t in result.get("tasks", []) if t["failure_reason"]}
+        ),
+    }
+
+
+def _run_configuration_in_process(args: argparse.Namespace, num_tasks: int, concurrency: int) -> dict[str, Any]:
+    return asyncio.run(run_configuration(args, num_tasks, concurrency))
+
+
+def run_benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    runs = []
+    for num_tasks in args.num_tasks:
+        for concurrency in args.concurrency:
+            # ru_maxrss only ever grows, so every configuration gets a new process.
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+                run = pool.submit(_run_configuration_in_process, args, num_tasks, concurrency).result()
+            runs.append(run)
+            print(
+                f"num_tasks={num_tasks:<4} concurrency={concurrency:<3} "
+                f"tasks/sec={run['tasks_per_sec']:.2f} "
+                f"turn p50={_fmt_ms(run['turn_latency_sec']['p50'])} "
+                f"p95={_fmt_ms(run['turn_latency_sec']['p95'])} "
+                f"peak_rss={run['peak_rss_mb']:.0f}MB"
+            )
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "green_agent_version": green_agent._get_version("tau2-green-agent", "0.1.0"),
+            "tau2_bench_version": green_agent._get_version("tau2", "unknown"),
+        },
+        "settings": {
+            "domain": args.domain,
+            "user_turns": args.user_turns,
+            "max_steps": args.max_steps,
+            "purple_latency_sec": args.purple_latency,
+            "user_llm_cache": args.user_llm_cache if args.user_llm_cache_dir else None,
+        },
+        "runs": runs,
+    }
+
+
+def _fmt_ms(value: Optional[float]) -> str:
+    return "n/a" if value is None else f"{value * 1000:.1f}ms"
+
+
+def compare_to_baseline(report: dict[str, Any], baseline: dict[str, Any], max_regression: float) -> bool:
+    """Print per-run deltas against `baseline`; return False if throughput regressed too far."""
+    baseline_runs = {(r["num_tasks"], r["max_concurrency"]): r for r in baseline.get("runs", [])}
+    ok = True
+    for run in report["runs"]:
+        base = baseline_runs.get((run["num_tasks"], run["max_concurrency"]))
+        if base is None or not base["tasks_per_sec"]:
+            continue
+        change = run["tasks_per_sec"] / base["tasks_per_sec"] - 1
+        regressed = change < -max_regression
+        ok = ok and not regressed
+        print(
+            f"num_tasks={run['num_tasks']:<4} concurrency={run['max_concurrency']:<3} "
+            f"tasks/sec {base['tasks_per_sec']:.2f} -> {run['tasks_per_sec']:.2f} ({change:+.1%})"
+            f"{'  REGRESSION' if regressed else ''}"
+        )
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the tau2 green agent against a scripted purple agent.")
+    parser.add_argument("--domain", default="mock", help="tau2 domain to evaluate (default: mock)")
+    parser.add_argument("--num-tasks", type=int, nargs="+", default=[5], help="num_tasks values to run")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4], help="max_concurrency values to run")
+    parser.add_argument("--user-turns", type=int, default=3, help="user turns before the stub user stops")
+    parser.add_argument("--max-steps", type=int, default=50, help="max_steps per simulation")
+    parser.add_argument("--timeout-seconds", type=int, default=300, help="per-task timeout")
+    parser.add_argument("--purple-latency", type=float, default=0.0, help="artificial purple-agent delay per turn (seconds)")
+    parser.add_argument(
+        "--user-llm-cache-dir",
+        type=Path,
+        help="use the real user simulator with turns recorded in this directory instead of the stub",
+    )
+    parser.add_argument(
+        "--user-llm-cache",
+        choices=["record", "replay"],
+        default="replay",
+        help="record new user turns (calls the user LLM) or only replay recorded ones (default: replay)",
+    )
+    parser.add_argument("--output", type=Path, help="where to write the JSON report (default: benchmarks/results/)")
+    parser.add_argument("--baseline", type=Path, help="previous JSON report to compare against")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.2,
+        help="fail if tasks/sec drops by more than this fraction versus --baseline (default: 0.2)",
+    )
+    args = parser.parse_args()
+
+    report = run_benchmark(args)
+
+    output = args.output
+    if output is None:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        output = DEFAULT_RESULTS_DIR / f"benchmark-{stamp}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Wrote {output}")
+
+    if args.baseline:
+        if not compare_to_baseline(report, json.loads(args.baseline.read_text()), args.max_regression):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""
+Deterministic stand-in for tau2's LLM-backed UserSimulator.
+
+Sends a fixed number of canned user turns and then the stop token, without
+calling any LLM, so benchmark runs need no API key or network access.
+"""
+from tau2.data_model.message import MultiToolMessage, UserMessage
+from tau2.user.user_simulator import UserSimulator
+
+STOP_TOKEN = "###STOP###"
+
+
+class ScriptedUserSimulator(UserSimulator):
+    """Drop-in replacement for `UserSimulator` that replays canned turns."""
+
+    user_turns = 3
+
+    def generate_next_message(self, message, state):
+        if isinstance(message, MultiToolMessage):
+            state.messages.extend(message.tool_messages)
+        else:
+            state.messages.append(message)
+
+        sent = sum(1 for msg in state.messages if isinstance(msg, UserMessage))
+        if sent >= self.user_turns:
+            content = STOP_TOKEN
+        else:
+            content = f"Scripted user turn {sent + 1}: please look up my account."
+
+        user_message = UserMessage(role="user", content=content)
+        state.messages.append(user_message)
+        return user_message, state
@@ -4,22 +4,38 @@ Tau2 Green Agent - Evaluates purple agents on tau-bench tasks.
 This agent runs tau2-bench evaluation and returns pass_rate and time_used.
 """
 import asyncio
+import hashlib
 import json
 import logging
+import threading
 import time
 import uuid
-from dataclasses import dataclass
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from importlib import metadata
-from typing import Any, List, Optional
+from typing import Any, Callable, List, Optional
 
-import nest_asyncio
 from pydantic import BaseModel, ConfigDict, Field, HttpUrl, ValidationError, field_validator
 
 from a2a.server.tasks import TaskUpdater
 from a2a.types import Message, TaskState, Part, TextPart, DataPart
 from a2a.utils import get_message_text, new_agent_text_message
 
-from messenger import Messenger
+from domain_cache import domain_cache
+from early_stop import DEFAULT_CONFIDENCE, DEFAULT_MIN_TASKS, EarlyStop
+from evaluation_pool import EvaluationPool
+from messenger import ConversationSession, FirstEventTimeoutError, Messenger
+from metrics import EVALUATIONS_IN_FLIGHT, PHASE_DURATION, TASKS_COMPLETED
+from orchestration import AsyncStepDriver, simulation_stats
+from resilience import CircuitOpenError
+from result_cache import ResultCache, cache_key
+from results_export import ResultsExport
+from scheduler import Admission, SimulationScheduler, SlotLease
+from task_store import CheckpointStore
+from timings import AGENT_TURN, EVALUATION, EvalTimings, PhaseTimer
+from trajectories import TrajectoryStore
+from user_turns import MODES as USER_LLM_CACHE_MODES, OFF, CachingUserSimulator, UserTurnReplayMiss
 
 from tau2.agent.base import BaseAgent, ValidAgentInputMessage
 from tau2.agent.llm_agent import LLMAgentState
@@ -34,21 +50,81 @@ from tau2.data_model.message import (
 from tau2.data_model.simulation import TerminationReason
 from tau2.environment.tool import Tool
 from tau2.orchestrator.orchestrator import Orchestrator
-from tau2.registry import registry
-from tau2.run import get_tasks
 from tau2.user.user_simulator import UserSimulator
-from tau2.evaluator.evaluator import evaluate_simulation, EvaluationType
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("tau2_green_agent")
 
-# Allow nested event loops
-nest_asyncio.apply()
-
 RESPOND_ACTION_NAME = "respond"
 ALLOWED_DOMAINS = {"mock", "airline", "retail", "telecom"}
 MAX_NUM_TASKS = 50
 MAX_RETRIES = 5
+MAX_CONCURRENCY = 16
+MAX_BATCH_AGENTS = 8
+# The A2A task store keeps every streamed chunk, so a chunk's error is truncated.
+MAX_STREAMED_ERROR_CHARS = 1000
+# Participant roles evaluated as purple agents: "agent", or "agent_<name>" in a batch.
+AGENT_ROLE = "agent"
+BATCH_ROLE_PREFIX = "agent_"
+PROMPT_CACHE_SIZE = 32
+TEXT_PROTOCOL = "text"
+DELTA_PROTOCOL = "delta"
+MESSAGE_PROTOCOLS = (TEXT_PROTOCOL, DELTA_PROTOCOL)
+# Marks the DataPart payloads of the delta protocol.
+DELTA_PROTOCOL_ID = "tau2-delta/v1"
+MAX_SCHEDULING_WEIGHT = 10.0
+# Seconds between queue position updates while an evaluation waits for a slot.
+QUEUE_STATUS_INTERVAL = 10.0
+# Config fields that do not change any task's result; left out of checkpoint keys.
+RESULT_NEUTRAL_FIELDS = {
+    "max_concurrency",
+    "stream_results",
+    "scheduling_weight",
+    "cache_results",
+    "agent_fingerprint",
+    "user_llm_cache",
+    "early_stop_pass_rate",
+    "early_stop_confidence",
+    "early_stop_min_tasks",
+}
+# Failures that may be transient and are not stored in the result cache.
+# "unknown" is cached when the conversation ended normally with no reward, which
+# is as deterministic as a pass, but not when it carries an error: then an
+# unexpected exception or evaluate_simulation failure produced it.
+UNCACHEABLE_FAILURES = {
+    "timeout",
+    "first_event_timeout",
+    "agent_error",
+    "circuit_open",
+    "replay_miss",
+}
+
+
+def _is_cacheable(result: "TaskResult") -> bool:
+    if result.failure_reason in UNCACHEABLE_FAILURES:
+        return False
+    return not (result.failure_reason == "unknown" and result.error)
+
+
+RESPOND_ACTION_SCHEMA = {
+    "type": "function",
+    "function": {
+        "name": RESPOND_ACTION_NAME,
+        "description": "Respond directly to the user with a message instead of calling a tool.",
+        "parameters": {
+            "properties": {
+                "content": {
+                    "description": "The message content to send to the user.",
+                    "title": "Content",
+                    "type": "string"
+                }
+            },
+            "required": ["content"],
+            "title": "parameters",
+            "type": "object"
+        }
+    }
+}
 
 
 class InvalidResponseError(ValueError):
@@ -68,9 +144,22 @@ class EvalConfig(BaseModel):
     timeout_seconds: int = Field(default=300, gt=0)
     max_steps: int = Field(default=50, gt=0)
     retries: int = Field(default=2, ge=0, le=MAX_RETRIES)
+    compact_prompt: bool = Field(default=False)
+    message_protocol: str = Field(default=TEXT_PROTOCOL)
+    streaming: bool = Field(default=False)
+    first_event_timeout_seconds: Optional[float] = Field(default=None, gt=0)
+    stream_results: bool = Field(default=False)
+    max_concurrency: int = Field(default=1, ge=1, le=MAX_CONCURRENCY)
+    scheduling_weight: float = Field(default=1.0, gt=0, le=MAX_SCHEDULING_WEIGHT)
+    cache_results: bool = Field(default=False)
+    agent_fingerprint: Optional[str] = Field(default=None, min_length=1)
+    early_stop_pass_rate: Optional[float] = Field(default=None, gt=0, lt=1)
+    early_stop_confidence: float = Field(default=DEFAULT_CONFIDENCE, gt=0.5, lt=1)
+    early_stop_min_tasks: int = Field(default=DEFAULT_MIN_TASKS, ge=1)
     task_ids: Optional[list[str]] = None
     user_llm: str = Field(default="openai/gpt-4.1")
     user_llm_args: dict[str, Any] = Field(default_factory=lambda: {"temperature": 0.0})
+    user_llm_cache: str = Field(default=OFF)
 
     @field_validator("domain")
     @classmethod
@@ -81,6 +170,24 @@ class EvalConfig(BaseModel):
             )
         return value
 
+    @field_validator("message_protocol")
+    @classmethod
+    def validate_message_protocol(cls, value: str) -> str:
+        if value not in MESSAGE_PROTOCOLS:
+            raise ValueError(
+                f"Unsupported message_protocol '{value}'. Choose from {list(MESSAGE_PROTOCOLS)}."
+            )
+        return value
+
+    @field_validator("user_llm_cache")
+    @classmethod
+    def validate_user_llm_cache(cls, value: str) -> str:
+        if value not in USER_LLM_CACHE_MODES:
+            raise ValueError(
+                f"Unsupported user_llm_cache '{value}'. Choose from {list(USER_LLM_CACHE_MODES)}."
+            )
+        return value
+
 
 class EvalRequest(BaseModel):
     """Request format sent by the AgentBeats platform to green agents."""
@@ -99,6 +206,16 @@ class TaskRunData:
     eval_error: Optional[str] = None
 
 
+@dataclass
+class AgentEvaluation:
+    """A finished evaluation of one purple agent, ready to publish."""
+    role: str
+    agent_url: str
+    checkpoint_key: str
+    result_data: dict[str, Any]
+    summary: str
+
+
 @dataclass
 class TaskResult:
     task_id: str
@@ -109,6 +226,8 @@ class TaskResult:
     tool_calls: int
     failure_reason: Optional[str]
     error: Optional[str]
+    timings: dict[str, float] = field(default_factory=dict)
+    cached: bool = False
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -120,12 +239,114 @@ class TaskResult:
             "tool_calls": self.tool_calls,
             "failure_reason": self.failure_reason,
             "error": self.error,
+            "timings": self.timings,
+            "cached": self.cached,
         }
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "TaskResult":
+        return cls(**data)
+
 
-def tools_to_str(tools: List[Tool]) -> str:
+class ResultStream:
+    """
+    Publishes an evaluation as one `Result` artifact built from appended chunks.
+
+    Each finished task is sent as a DataPart chunk (`index` plus the
+    `TaskResult` fields) in completion order; `finish` sends the summary
+    parts as the last chunk. The A2A task store appends every chunk to the
+    stored task, so it keeps them all until the task is gone; a chunk's
+    `error` is cut to `MAX_STREAMED_ERROR_CHARS` to bound their size.
+    """
+
+    def __init__(self, updater: TaskUpdater, name: str = "Result"):
+        self.updater = updater
+        self.name = name
+        self.artifact_id = uuid.uuid4().hex
+        self._started = False
+
+    async def _add_chunk(self, parts: list[Part], last_chunk: bool = False) -> None:
+        append = self._started
+        self._started = True
+        await self.updater.add_artifact(
+            parts=parts,
+            artifact_id=self.artifact_id,
+            name=self.name,
+            append=append,
+            last_chunk=last_chunk,
+        )
+
+    async def add_task_result(self, index: int, result: TaskResult) -> None:
+        data = {"index": index, **result.to_dict()}
+        if data["error"] and len(data["error"]) > MAX_STREAMED_ERROR_CHARS:
+            data["error"] = data["error"][:MAX_STREAMED_ERROR_CHARS] + "..."
+        await self._add_chunk([Part(root=DataPart(data=data))])
+
+    async def finish(self, parts: list[Part]) -> None:
+        await self._add_chunk(parts, last_chunk=True)
+
+
+def _dumps(obj: Any, compact: bool = False) -> str:
+    if compact:
+        return json.dumps(obj, separators=(",", ":"))
+    return json.dumps(obj, indent=2)
+
+
+def tools_to_str(tools: List[Tool], compact: bool = False) -> str:
     """Convert tau-bench tools to JSON schema format."""
-    return json.dumps([tool.openai_schema for tool in tools], indent=2)
+    return _dumps([tool.openai_schema for tool in tools], compact)
+
+
+_prompt_cache: OrderedDict[tuple, str] = OrderedDict()
+_prompt_cache_lock = threading.Lock()
+
+
+def render_agent_prompt(domain_policy: str, tools: List[Tool], compact: bool = False) -> str:
+    """
+    Build the purple-agent system prompt with policy and tools.
+
+    Rendering serializes every tool schema, so results are kept in a small
+    LRU cache keyed by (policy, tool names, compact) and shared across tasks.
+    """
+    key = (domain_policy, tuple(tool.name for tool in tools), compact)
+    with _prompt_cache_lock:
+        prompt = _prompt_cache.get(key)
+        if prompt is not None:
+            _prompt_cache.move_to_end(key)
+            return prompt
+
+    prompt = f"""{domain_policy}
+
+Here's a list of tools you can use (you can use at most one tool at a time):
+{tools_to_str(tools, compact)}
+
+and
+
+{_dumps(RESPOND_ACTION_SCHEMA, compact)}
+
+
+Please respond in JSON format.
+The JSON should contain:
+- "name": the tool call function name.
+- "arguments": the arguments for the tool call.
+
+You should only use one tool at a time!
+You cannot respond to user and use a tool at the same time!
+
+Examples of responses:
+<json>
+{_dumps({"name": "echo", "arguments": {"message": "test"}}, compact)}
+</json>
+
+<json>
+{_dumps({"name": RESPOND_ACTION_NAME, "arguments": {"content": "Hello, how can I help you today?"}}, compact)}
+</json>
+"""
+    with _prompt_cache_lock:
+        _prompt_cache[key] = prompt
+        if len(_prompt_cache) > PROMPT_CACHE_SIZE:
+            _prompt_cache.popitem(last=False)
+    return prompt
 
 
 def extract_text_from_message(message: MultiToolMessage | UserMessage | ToolMessage) -> str | None:
@@ -141,6 +362,49 @@ def extract_text_from_message(message: MultiToolMessage | UserMessage | ToolMess
         return str(message.content) if hasattr(message, 'content') else str(message)
 
 
+DELTA_INSTRUCTIONS = (
+    "Follow the policy and use the tools in this message's data. Reply with exactly one action, "
+    'either as a data part or as JSON text with "name" (a tool name, or '
+    f'"{RESPOND_ACTION_NAME}" to message the user) and "arguments". '
+    "Later messages carry only the new conversation messages."
+)
+
+
+def message_to_data(message: MultiToolMessage | UserMessage | ToolMessage) -> list[dict[str, Any]]:
+    """
+    Encode tau2 messages for the delta protocol.
+
+    Tool results are sent as data: JSON tool output is decoded rather than
+    formatted into text, and the tool call id and error flag are kept.
+    """
+    if isinstance(message, MultiToolMessage):
+        return [data for tool_message in message.tool_messages for data in message_to_data(tool_message)]
+    if isinstance(message, ToolMessage):
+        content = message.content
+        if isinstance(content, str):
+            try:
+                content = json.loads(content)
+            except ValueError:
+                pass
+        return [{
+            "role": "tool",
+            "tool_call_id": message.id,
+            "content": content,
+            "error": bool(getattr(message, "error", False)),
+        }]
+    return [{"role": str(message.role), "content": message.content}]
+
+
+def render_delta_context(domain_policy: str, tools: List[Tool]) -> dict[str, Any]:
+    """The policy and tool schemas sent once, on the first turn of the delta protocol."""
+    return {
+        "protocol": DELTA_PROTOCOL_ID,
+        "instructions": DELTA_INSTRUCTIONS,
+        "policy": domain_policy,
+        "tools": [tool.openai_schema for tool in tools] + [RESPOND_ACTION_SCHEMA],
+    }
+
+
 def _count_turns_and_tool_calls(messages: list) -> tuple[int, int, bool]:
     turns = len(messages)
     tool_calls = 0
@@ -168,6 +432,16 @@ def _extract_json_payload(response: str) -> str:
     return text
 
 
+def evaluation_key(agent_url: str, config: EvalConfig) -> str:
+    """Hash of everything that determines an evaluation's task results."""
+    payload = {
+        "agent_url": agent_url,
+        "config": config.model_dump(exclude=RESULT_NEUTRAL_FIELDS),
+        "tau2_version": _get_version("tau2", "unknown"),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
 def _get_version(package: str, fallback: str) -> str:
     try:
         return metadata.version(package)
@@ -188,67 +462,38 @@ class RemoteA2AAgent(BaseAgent):
         self,
         tools: List[Tool],
         domain_policy: str,
-        messenger: Messenger,
-        agent_url: str,
+        session: ConversationSession,
         timeout_seconds: int,
         retries: int,
+        compact_prompt: bool = False,
+        timer: Optional[PhaseTimer] = None,
+        streaming: bool = False,
+        first_event_timeout: Optional[float] = None,
+        message_protocol: str = TEXT_PROTOCOL,
     ):
         self.tools = tools
         self.domain_policy = domain_policy
-        self.messenger = messenger
-        self.agent_url = agent_url
+        self.session = session
         self.timeout_seconds = timeout_seconds
         self.retries = retries
+        self.compact_prompt = compact_prompt
+        self.streaming = streaming
+        self.first_event_timeout = first_event_timeout
+        self.message_protocol = message_protocol
+        self.timer = timer or PhaseTimer()
+        self._agent_prompt: Optional[str] = None
         self._is_first_message = True
+        # (incoming message, reply, error) produced by prefetch_next_message
+        self._staged: Optional[tuple[Any, Optional[tuple], Optional[Exception]]] = None
 
     @property
     def agent_prompt(self) -> str:
         """Build the system prompt with policy and tools."""
-        return f"""{self.domain_policy}
-
-Here's a list of tools you can use (you can use at most one tool at a time):
-{tools_to_str(self.tools)}
-
-and
-
-{json.dumps({
-    "type": "function",
-    "function": {
-        "name": RESPOND_ACTION_NAME,
-        "description": "Respond directly to the user with a message instead of calling a tool.",
-        "parameters": {
-            "properties": {
-                "content": {
-                    "description": "The message content to send to the user.",
-                    "title": "Content",
-                    "type": "string"
-                }
-            },
-            "required": ["content"],
-            "title": "parameters",
-            "type": "object"
-        }
-    }
-}, indent=2)}
-
-
-Please respond in JSON format.
-The JSON should contain:
-- "name": the tool call function name.
-- "arguments": the arguments for the tool call.
-
-You should only use one tool at a time!
-You cannot respond to user and use a tool at the same time!
-
-Examples of responses:
-<json>
-{json.dumps({"name": "echo", "arguments": {"message": "test"}}, indent=2)}
-</json>
-
-<json>
-{json.dumps({"name": RESPOND_ACTION_NAME, "arguments": {"content": "Hello, how can I help you today?"}}, indent=2)}
-</json>
-"""
+        if self._agent_prompt is None:
+            self._agent_prompt = render_agent_prompt(
+                self.domain_policy, self.tools, compact=self.compact_prompt
+            )
+        return self._agent_prompt
 
     def get_init_state(self, message_history: Optional[list] = None) -> LLMAgentState:
         """Get the initial state of the agent."""
@@ -272,56 +517,98 @@ Examples of responses:
         self, message: ValidAgentInputMessage, state: LLMAgentState
     ) -> tuple[AssistantMessage, LLMAgentState]:
         """
-        Generate the next message by delegating to the remote purple agent.
+        Return the reply to `message` from the remote purple agent.
 
-        This method is synchronous (as required by tau2), but internally
-        uses asyncio to communicate with the remote agent.
+        tau2 calls this synchronously from `Orchestrator.step`. Under
+        `AsyncStepDriver` the reply has already been awaited on the event loop
+        by `prefetch_next_message`, so this only hands it over. There is no
+        synchronous path: a private event loop per turn would open (and leak)
+        a connection pool per turn.
         """
+        staged, self._staged = self._staged, None
+        if staged is not None and staged[0] is message:
+            _, reply, error = staged
+            if error is not None:
+                raise error
+            return reply
+        raise RuntimeError("RemoteA2AAgent must be driven by AsyncStepDriver")
+
+    async def prefetch_next_message(self, message: ValidAgentInputMessage, state: LLMAgentState) -> None:
+        """Await the reply to `message` and stage it for `generate_next_message`."""
+        try:
+            with self.timer.measure(AGENT_TURN):
+                reply = await self.agenerate_next_message(message, state)
+        except Exception as exc:
+            self._staged = (message, None, exc)
+        else:
+            self._staged = (message, reply, None)
+
+    async def agenerate_next_message(
+        self, message: ValidAgentInputMessage, state: LLMAgentState
+    ) -> tuple[AssistantMessage, LLMAgentState]:
+        """Generate the next message by delegating to the remote purple agent."""
         # Update state with incoming message
         if isinstance(message, MultiToolMessage):
             state.messages.extend(message.tool_messages)
         else:
             state.messages.append(message)
 
-        outgoing_text = extract_text_from_message(message)
-
-        # If first message, prepend system prompt and all messages.
-        if self._is_first_message:
-            outgoing_text = f"{self.agent_prompt}\n\nNow here are the user messages:\n{'\n'.join([extract_text_from_message(message) for message in state.messages])}"
+        if self.message_protocol == DELTA_PROTOCOL:
+            outgoing = self._delta_parts(message, state)
+        else:
+            outgoing = extract_text_from_message(message)
+            # If first message, prepend system prompt and all messages.
+            if self._is_first_message:
+                outgoing = f"{self.agent_prompt}\n\nNow here are the user messages:\n{'\n'.join([extract_text_from_message(message) for message in state.messages])}"
 
         # Call remote agent via A2A
         try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-        try:
-            response = loop.run_until_complete(
-                self.messenger.talk_to_agent(
-                    message=outgoing_text,
-                    url=str(self.agent_url),
-                    new_conversation=self._is_first_message,
-                    timeout=self.timeout_seconds,
-                    retries=self.retries,
-                )
+            outputs = await self.session.exchange(
+                outgoing,
+                new_conversation=self._is_first_message,
+                timeout=self.timeout_seconds,
+                retries=self.retries,
+                streaming=self.streaming,
+                first_event_timeout=self.first_event_timeout,
             )
         except Exception as exc:
             raise RemoteAgentError(str(exc)) from exc
         self._is_first_message = False
 
-        # Parse the response
-        assistant_message = self._parse_response(response)
+        # Parse the response, preferring an action sent as structured data
+        action = next(
+            (data for data in outputs["data"] if "name" in data and "arguments" in data), None
+        )
+        if action is not None:
+            assistant_message = self._parse_action(action)
+        else:
+            assistant_message = self._parse_response(outputs["response"])
         state.messages.append(assistant_message)
 
         return assistant_message, state
 
+    def _delta_parts(self, message: ValidAgentInputMessage, state: LLMAgentState) -> list[Part]:
+        """Only the new messages; the first turn also carries the policy and tools."""
+        if self._is_first_message:
+            payload = render_delta_context(self.domain_policy, self.tools)
+            payload["messages"] = [data for msg in state.messages for data in message_to_data(msg)]
+            return [Part(root=TextPart(text=DELTA_INSTRUCTIONS)), Part(root=DataPart(data=payload))]
+        payload = {"protocol": DELTA_PROTOCOL_ID, "messages": message_to_data(message)}
+        return [Part(root=DataPart(data=payload))]
+
     def _parse_response(self, response: str) -> AssistantMessage:
         """Parse the purple agent's response into an AssistantMessage."""
         try:
             payload = _extract_json_payload(response)
             action_dict = json.loads(payload)
-            if "name" not in action_dict or "arguments" not in action_dict:
+        except json.JSONDecodeError as e:
+            raise InvalidResponseError(f"Invalid response payload: {e}") from e
+        return self._parse_action(action_dict)
+
+    def _parse_action(self, action_dict: Any) -> AssistantMessage:
+        """Turn a `{"name": ..., "arguments": ...}` action into an AssistantMessage."""
+        try:
+            if not isinstance(action_dict, dict) or "name" not in action_dict or "arguments" not in action_dict:
                 raise InvalidResponseError("Missing 'name' or 'arguments' in response JSON.")
 
             is_tool_call = action_dict["name"] != RESPOND_ACTION_NAME
@@ -346,7 +633,7 @@ Examples of responses:
                     content=None,
                     tool_calls=[tool_call],
                 )
-        except (json.JSONDecodeError, KeyError, InvalidResponseError) as e:
+        except (KeyError, TypeError, InvalidResponseError) as e:
             raise InvalidResponseError(f"Invalid response payload: {e}") from e
 
 
@@ -356,20 +643,74 @@ class Agent:
     required_roles: list[str] = ["agent"]  # The purple agent being tested
     required_config_keys: list[str] = []
 
-    def __init__(self):
-        self.messenger = Messenger()
+    def __init__(
+        self,
+        messenger: Optional[Messenger] = None,
+        scheduler: Optional[SimulationScheduler] = None,
+        checkpoints: Optional[CheckpointStore] = None,
+        result_cache: Optional[ResultCache] = None,
+        user_turn_cache: Optional[ResultCache] = None,
+        evaluation_pool: Optional[EvaluationPool] = None,
+        results_export: Optional[ResultsExport] = None,
+        trajectory_store: Optional[TrajectoryStore] = None,
+        user_step_threads: Optional[ThreadPoolExecutor] = None,
+    ):
+        # A shared messenger belongs to the caller; only close one we created.
+        self._owns_messenger = messenger is None
+        self.messenger = messenger or Messenger()
+        # Without a server-wide scheduler, only max_concurrency limits this agent.
+        self.scheduler = scheduler or SimulationScheduler(max_simulations=MAX_CONCURRENCY)
+        # Blocking user simulator turns run here, one thread per simulation slot.
+        self._owns_user_step_threads = user_step_threads is None
+        self.user_step_threads = user_step_threads or ThreadPoolExecutor(
+            max_workers=self.scheduler.max_simulations, thread_name_prefix="tau2-user-step"
+        )
+        # Finished tasks are checkpointed here so a resubmitted request can resume.
+        self.checkpoints = checkpoints
+        # Used only by requests that set cache_results.
+        self.result_cache = result_cache
+        # Recorded user simulator turns, for requests that set user_llm_cache.
+        self.user_turn_cache = user_turn_cache
+        # Without a shared pool, simulations are evaluated inline.
+        self.evaluation_pool = evaluation_pool or EvaluationPool()
+        # Every run and task result is also appended here, when configured.
+        self.results_export = results_export
+        # Each simulation's messages are streamed to disk here, when configured.
+        self.trajectory_store = trajectory_store
+
+    async def close(self) -> None:
+        """Release network resources held by this agent."""
+        if self._owns_messenger:
+            self.messenger.reset()
+            await self.messenger.aclose()
+        if self._owns_user_step_threads:
+            self.user_step_threads.shutdown(wait=False)
+
+    @staticmethod
+    def agent_roles(request: EvalRequest) -> list[str]:
+        """Participant roles to evaluate: "agent" and any "agent_<name>" batch roles."""
+        return sorted(
+            role for role in request.participants
+            if role == AGENT_ROLE or role.startswith(BATCH_ROLE_PREFIX)
+        )
 
     def validate_request(self, request: EvalRequest) -> tuple[bool, str]:
-        missing_roles = set(self.required_roles) - set(request.participants.keys())
-        if missing_roles:
+        roles = self.agent_roles(request)
+        if not roles:
+            missing_roles = set(self.required_roles) - set(request.participants.keys())
             return False, f"Missing roles: {missing_roles}"
+        if len(roles) > MAX_BATCH_AGENTS:
+            return False, f"Too many agents: {len(roles)} (at most {MAX_BATCH_AGENTS} per batch)"
+        urls = [str(request.participants[role]) for role in roles]
+        if len(set(urls)) != len(urls):
+            return False, "Each agent in a batch needs a distinct URL"
         missing_config_keys = set(self.required_config_keys) - set(request.config.keys())
         if missing_config_keys:
             return False, f"Missing config keys: {missing_config_keys}"
         return True, "ok"
 
     async def run(self, message: Message, updater: TaskUpdater) -> None:
-        """Run tau2 evaluation on the purple agent."""
+        """Run tau2 evaluation on the purple agent, or on each agent of a batch."""
         input_text = get_message_text(message)
 
         try:
@@ -387,148 +728,354 @@ class Agent:
         except ValidationError as e:
             await updater.reject(new_agent_text_message(f"Invalid config: {e}"))
             return
+        if config.user_llm_cache != OFF and self.user_turn_cache is None:
+            await updater.reject(
+                new_agent_text_message("Invalid config: user_llm_cache needs a server started with --user-llm-cache-dir")
+            )
+            return
 
+        roles = self.agent_roles(request)
         logger.info(
-            "Starting tau2 evaluation: domain=%s num_tasks=%s seed=%s timeout_seconds=%s max_steps=%s retries=%s",
+            "Starting tau2 evaluation: agents=%s domain=%s num_tasks=%s seed=%s timeout_seconds=%s max_steps=%s retries=%s max_concurrency=%s",
+            len(roles),
             config.domain,
             config.num_tasks,
             config.seed,
             config.timeout_seconds,
             config.max_steps,
             config.retries,
+            config.max_concurrency,
         )
         start_time = time.perf_counter()
 
+        # Get task objects (loaded once per domain and process, shared by all agents)
+        tasks = domain_cache.get_tasks(config.domain, task_ids=config.task_ids)
+        tasks = tasks[:config.num_tasks]
+
+        if roles == [AGENT_ROLE]:
+            agent_url = str(request.participants[AGENT_ROLE])
+            stream = ResultStream(updater) if config.stream_results else None
+            evaluation = await self._evaluate_agent(AGENT_ROLE, agent_url, tasks, config, updater, stream)
+            parts = [
+                Part(root=TextPart(text=evaluation.summary)),
+                Part(root=DataPart(data=evaluation.result_data)),
+            ]
+            if stream:
+                await stream.finish(parts)
+            else:
+                await updater.add_artifact(parts=parts, name="Result")
+            evaluations = [evaluation]
+        else:
+            evaluations = await self._evaluate_batch(request, roles, tasks, config, updater, start_time)
+
+        # The result is published; a new request with this config starts over.
+        if self.checkpoints:
+            for evaluation in evaluations:
+                await self.checkpoints.clear(evaluation.checkpoint_key)
+
+    async def _evaluate_batch(
+        self,
+        request: EvalRequest,
+        roles: list[str],
+        tasks: list,
+        config: EvalConfig,
+        updater: TaskUpdater,
+        start_time: float,
+    ) -> list[AgentEvaluation]:
+        """
+        Evaluate several purple agents on the same tasks and publish a leaderboard.
+
+        Every agent is its own scheduler admission, so their simulations
+        interleave under the scheduling policy. With `stream_results`, each
+        agent's tasks are streamed to a `Result <role>` artifact. If one agent's
+        evaluation fails, the others are cancelled and the error is raised.
+        """
+
+        async def evaluate(role: str) -> AgentEvaluation:
+            stream = ResultStream(updater, name=f"Result {role}") if config.stream_results else None
+            evaluation = await self._evaluate_agent(
+                role, str(request.participants[role]), tasks, config, updater, stream
+            )
+            if stream:
+                await stream.finish([
+                    Part(root=TextPart(text=evaluation.summary)),
+                    Part(root=DataPart(data=evaluation.result_data)),
+                ])
+            return evaluation
+
+        runs = [asyncio.create_task(evaluate(role)) for role in roles]
+        try:
+            evaluations = list(await asyncio.gather(*runs))
+        except BaseException:
+            # One agent failed (or the request was cancelled): stop the others
+            # so they neither hold simulation slots nor publish into a failed task.
+            for run in runs:
+                run.cancel()
+            await asyncio.gather(*runs, return_exceptions=True)
+            raise
+        leaderboard_data = self._build_leaderboard_data(evaluations, time.perf_counter() - start_time)
+
+        lines = [
+            f"  {entry['rank']}. {entry['role']}: {entry['pass_rate']:.1f}% "
+            f"({entry['passed']}/{entry['total']}) in {entry['time_used_sec']:.1f}s"
+            for entry in leaderboard_data["leaderboard"]
+        ]
+        summary = f"""Tau2 Benchmark Leaderboard
+Domain: {config.domain}
+Agents: {len(evaluations)}
+Tasks per agent: {len(tasks)}
+
+""" + "\n".join(lines)
+        await updater.add_artifact(
+            parts=[Part(root=TextPart(text=summary)), Part(root=DataPart(data=leaderboard_data))],
+            name="Leaderboard",
+        )
+        return evaluations
+
+    @staticmethod
+    def _build_leaderboard_data(evaluations: list[AgentEvaluation], time_used: float) -> dict[str, Any]:
+        """Rank agents by pass rate, then by time used; `agents` holds each full result."""
+        ranked = sorted(
+            evaluations,
+            key=lambda e: (-e.result_data["pass_rate"], e.result_data["summary"]["time_used_sec"]),
+        )
+        return {
+            "leaderboard": [
+                {
+                    "rank": rank,
+                    "role": evaluation.role,
+                    "agent_url": evaluation.agent_url,
+                    "pass_rate": evaluation.result_data["pass_rate"],
+                    "passed": evaluation.result_data["summary"]["passed"],
+                    "total": evaluation.result_data["summary"]["total"],
+                    "time_used_sec": evaluation.result_data["summary"]["time_used_sec"],
+                }
+                for rank, evaluation in enumerate(ranked, start=1)
+            ],
+            "agents": {evaluation.role: evaluation.result_data for evaluation in evaluations},
+            "time_used_sec": time_used,
+        }
+
+    async def _evaluate_agent(
+        self,
+        role: str,
+        agent_url: str,
+        tasks: list,
+        config: EvalConfig,
+        updater: TaskUpdater,
+        stream: Optional[ResultStream] = None,
+    ) -> AgentEvaluation:
+        """Run `tasks` against one purple agent and build its result data."""
+        start_time = time.perf_counter()
         domain = config.domain
-        task_ids = config.task_ids
-        num_tasks = config.num_tasks
-        max_steps = config.max_steps
-        user_llm = config.user_llm
-        user_llm_args = config.user_llm_args
-
-        # Get the purple agent URL
-        agent_url = str(request.participants["agent"])
-
-        # Get task objects
-        task_set_name = domain
-        task_split_name = "base"
-        if task_ids is None:
-            tasks = get_tasks(task_set_name=task_set_name, task_split_name=task_split_name)
+        evaluation_id = uuid.uuid4().hex
+        logger.info("Running %s tasks for domain %s against %s", len(tasks), domain, agent_url)
+        if self.results_export:
+            await asyncio.to_thread(
+                self.results_export.add_run, evaluation_id, domain, agent_url, config.model_dump(mode="json")
+            )
+
+        checkpoint_key = evaluation_key(agent_url, config)
+        resumed: dict[int, TaskResult] = {}
+        if self.checkpoints:
+            for idx, data in (await self.checkpoints.load(checkpoint_key)).items():
+                if idx < len(tasks) and data["task_id"] == tasks[idx].id:
+                    resumed[idx] = TaskResult.from_dict(data)
+
+        label = "" if role == AGENT_ROLE else f"{role}: "
+        if resumed:
+            logger.info("Resuming evaluation %s: %s of %s tasks already finished", checkpoint_key, len(resumed), len(tasks))
+            await updater.update_status(
+                TaskState.working,
+                new_agent_text_message(
+                    f"{label}Resuming evaluation in {domain} domain: {len(resumed)} of {len(tasks)} tasks already finished"
+                )
+            )
         else:
-            tasks = get_tasks(
-                task_set_name=task_set_name,
-                task_split_name=task_split_name,
-                task_ids=task_ids,
+            await updater.update_status(
+                TaskState.working,
+                new_agent_text_message(f"{label}Starting evaluation of {len(tasks)} tasks in {domain} domain")
             )
 
-        tasks = tasks[:num_tasks]
+        # With stream_results, each TaskResult is published as soon as it is
+        # ready and only the per-task rewards are kept here for the summary
+        # (the A2A task store still keeps the published chunks).
+        task_results: list[Optional[TaskResult]] = [None] * len(tasks)
+        task_rewards: list[Optional[tuple[str, float]]] = [None] * len(tasks)
+        num_passed = 0
+        eval_timings = EvalTimings()
+        early_stop = None
+        if config.early_stop_pass_rate is not None:
+            early_stop = EarlyStop(
+                threshold=config.early_stop_pass_rate,
+                confidence=config.early_stop_confidence,
+                min_tasks=config.early_stop_min_tasks,
+            )
 
-        logger.info("Running %s tasks for domain %s against %s", len(tasks), domain, agent_url)
+        async def record(idx: int, result: TaskResult) -> None:
+            nonlocal num_passed
+            task_rewards[idx] = (result.task_id, result.reward)
+            num_passed += result.passed
+            if early_stop is not None:
+                early_stop.add(result.passed)
+            if self.results_export:
+                await asyncio.to_thread(self.results_export.add_task, evaluation_id, result)
+            if stream:
+                await stream.add_task_result(idx, result)
+            else:
+                task_results[idx] = result
+
+        def skip_pending() -> int:
+            """Once the early-stop decision is settled, drop the tasks not yet started."""
+            if early_stop is None or early_stop.decision is None:
+                return 0
+            skipped = 0
+            while not pending.empty():
+                pending.get_nowait()
+                skipped += 1
+            if skipped:
+                early_stop.skipped += skipped
+                logger.info(
+                    "Early stop (%s) for evaluation %s: skipping %s tasks",
+                    early_stop.decision,
+                    evaluation_id,
+                    skipped,
+                )
+            return skipped
 
-        await updater.update_status(
-            TaskState.working,
-            new_agent_text_message(f"Starting evaluation of {len(tasks)} tasks in {domain} domain")
+        for idx, result in sorted(resumed.items()):
+            await record(idx, result)
+
+        fingerprint = None
+        if config.cache_results:
+            if self.result_cache is None:
+                logger.warning("cache_results requested but no result cache is configured")
+            else:
+                fingerprint = await self._agent_fingerprint(agent_url, config)
+        cache_keys: dict[int, str] = {}
+        cache_hits = 0
+        pending: asyncio.Queue = asyncio.Queue()
+        for idx, task in enumerate(tasks):
+            if idx in resumed:
+                continue
+            if fingerprint:
+                cache_keys[idx] = self._result_cache_key(fingerprint, config, task.id, config.seed + idx)
+                cached = self.result_cache.get(cache_keys[idx])
+                if cached is not None:
+                    cache_hits += 1
+                    await record(idx, TaskResult.from_dict({**cached, "cached": True}))
+                    continue
+            pending.put_nowait((idx, task))
+        skip_pending()
+        admission = self.scheduler.register(
+            evaluation_id,
+            num_tasks=pending.qsize(),
+            max_concurrency=config.max_concurrency,
+            weight=config.scheduling_weight,
         )
 
-        metrics: dict[str, Any] = {"tasks": {}}
-        task_results: list[TaskResult] = []
+        # Tasks whose simulation has finished and that only wait for their score.
+        # The worker moves on to its next task meanwhile; at most
+        # max_concurrency tasks are scored this way at once.
+        scoring: set[asyncio.Task] = set()
+        scoring_slots = asyncio.Semaphore(config.max_concurrency)
 
-        try:
-            for idx, task in enumerate(tasks):
-                task_id = task.id
-                logger.info("Task start: id=%s", task_id)
-                await updater.update_status(
-                    TaskState.working,
-                    new_agent_text_message(f"Running task {task_id}...")
-                )
+        def start_task(idx: int, task, lease: SlotLease) -> tuple[asyncio.Task, asyncio.Future]:
+            """Start `task`; the returned future resolves once its simulation has finished."""
+            simulated = asyncio.get_running_loop().create_future()
+
+            def release_slot() -> None:
+                lease.release()
+                if not simulated.done():
+                    simulated.set_result(None)
 
-                task_start = time.perf_counter()
-                run_data: Optional[TaskRunData] = None
-                error_summary: Optional[str] = None
+            run = asyncio.create_task(self._run_task(
+                idx=idx,
+                task=task,
+                agent_url=agent_url,
+                evaluation_id=evaluation_id,
+                config=config,
+                updater=updater,
+                eval_timings=eval_timings,
+                release_slot=release_slot,
+            ))
+            return run, simulated
+
+        async def finish(idx: int, result: TaskResult) -> None:
+            if self.checkpoints:
+                await self.checkpoints.save(checkpoint_key, idx, result.task_id, result.to_dict())
+            if idx in cache_keys and _is_cacheable(result):
+                self.result_cache.put(cache_keys[idx], result.to_dict())
+            await record(idx, result)
+            admission.num_tasks -= skip_pending()
+
+        async def finish_when_scored(idx: int, run: asyncio.Task) -> None:
+            try:
+                await finish(idx, await run)
+            finally:
+                scoring_slots.release()
+
+        async def worker() -> None:
+            while True:
                 try:
-                    run_data = await asyncio.wait_for(
-                        self._run_single_task(
-                            agent_url=agent_url,
-                            domain=domain,
-                            task=task,
-                            max_steps=max_steps,
-                            user_llm=user_llm,
-                            user_llm_args=user_llm_args,
-                            seed=config.seed + idx,
-                            timeout_seconds=config.timeout_seconds,
-                            retries=config.retries,
-                        ),
-                        timeout=config.timeout_seconds,
-                    )
-                    reward = run_data.reward
-                    error_summary = run_data.eval_error
-                    failure_reason = self._classify_failure(
-                        run_data,
-                        error=error_summary,
-                    )
-                except asyncio.TimeoutError:
-                    reward = 0.0
-                    error_summary = f"Task exceeded {config.timeout_seconds}s timeout."
-                    failure_reason = "timeout"
-                    logger.warning("Task %s timeout after %ss", task_id, config.timeout_seconds)
-                except InvalidResponseError as e:
-                    reward = 0.0
-                    error_summary = str(e)
-                    failure_reason = "invalid_response"
-                    logger.warning("Task %s invalid response: %s", task_id, e)
-                except RemoteAgentError as e:
-                    reward = 0.0
-                    error_summary = str(e)
-                    failure_reason = "agent_error"
-                    logger.warning("Task %s agent error: %s", task_id, e)
-                except Exception as e:
-                    reward = 0.0
-                    error_summary = str(e)
-                    failure_reason = "unknown"
-                    logger.exception("Task %s failed with unexpected error", task_id)
-
-                duration_sec = time.perf_counter() - task_start
-                turns = run_data.turns if run_data else 0
-                tool_calls = run_data.tool_calls if run_data else 0
-                passed = reward > 0
+                    idx, task = pending.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                async with self.scheduler.slot(admission) as lease:
+                    run, simulated = start_task(idx, task, lease)
+                    try:
+                        await asyncio.wait((run, simulated), return_when=asyncio.FIRST_COMPLETED)
+                    except asyncio.CancelledError:
+                        run.cancel()
+                        raise
+                if not run.done() and not scoring_slots.locked():
+                    await scoring_slots.acquire()
+                    scoring_task = asyncio.create_task(finish_when_scored(idx, run))
+                    scoring.add(scoring_task)
+                    scoring_task.add_done_callback(scoring.discard)
+                else:
+                    await finish(idx, await run)
+
+        num_workers = min(config.max_concurrency, pending.qsize())
+        workers = [asyncio.create_task(worker()) for _ in range(num_workers)]
+        # Created after the workers so that they have already asked for slots.
+        queue_reporter = asyncio.create_task(self._report_queue_status(admission, updater))
+        EVALUATIONS_IN_FLIGHT.inc()
 
-                metrics["tasks"][task_id] = reward
-                task_results.append(
-                    TaskResult(
-                        task_id=task_id,
-                        passed=passed,
-                        reward=reward,
-                        duration_sec=duration_sec,
-                        turns=turns,
-                        tool_calls=tool_calls,
-                        failure_reason=None if passed else failure_reason,
-                        error=None if passed else error_summary,
-                    )
-                )
+        try:
+            await asyncio.gather(*workers)
+            await asyncio.gather(*scoring)
+            queue_reporter.cancel()
 
-                logger.info(
-                    "Task end: id=%s reward=%s failure_reason=%s duration_sec=%.2f",
-                    task_id,
-                    reward,
-                    failure_reason,
-                    duration_sec,
-                )
+            metrics: dict[str, Any] = {"tasks": {}}
+            # Tasks skipped by early stopping have no reward.
+            for task_id, reward in filter(None, task_rewards):
+                metrics["tasks"][task_id] = reward
 
             time_used = time.perf_counter() - start_time
             total_reward = sum(metrics["tasks"].values())
             num_completed = len(metrics["tasks"])
-            passed = sum(1 for result in task_results if result.passed)
             pass_rate = (total_reward / num_completed * 100) if num_completed > 0 else 0
 
             result_data = self._build_result_data(
                 domain=domain,
                 total_reward=total_reward,
                 num_completed=num_completed,
+                num_passed=num_passed,
                 pass_rate=pass_rate,
                 time_used=time_used,
                 task_rewards=metrics["tasks"],
-                task_results=task_results,
+                task_results=None if stream else [result for result in task_results if result is not None],
                 config=config,
+                timings=eval_timings.to_dict(),
+                resumed_tasks=len(resumed),
+                cache={
+                    "fingerprint": fingerprint,
+                    "hits": cache_hits,
+                    "misses": len(cache_keys) - cache_hits,
+                } if fingerprint else None,
+                early_stop=early_stop.to_dict() if early_stop else None,
+                run_id=evaluation_id,
             )
 
             # Format task results for display
@@ -537,25 +1084,205 @@ class Agent:
                 for task_id, reward in metrics["tasks"].items()
             )
 
-            summary = f"""Tau2 Benchmark Results
+            summary = f"""Tau2 Benchmark Results{"" if role == AGENT_ROLE else f" ({role})"}
 Domain: {domain}
 Tasks: {num_completed}
-Pass Rate: {pass_rate:.1f}% ({passed}/{num_completed})
+Pass Rate: {pass_rate:.1f}% ({num_passed}/{num_completed})
 Time: {time_used:.1f}s
-
+{self._format_early_stop(early_stop)}
 Task Results:
 {task_results_str}"""
-
-            await updater.add_artifact(
-                parts=[
-                    Part(root=TextPart(text=summary)),
-                    Part(root=DataPart(data=result_data)),
-                ],
-                name="Result",
+            return AgentEvaluation(
+                role=role,
+                agent_url=agent_url,
+                checkpoint_key=checkpoint_key,
+                result_data=result_data,
+                summary=summary,
             )
 
         finally:
-            self.messenger.reset()
+            EVALUATIONS_IN_FLIGHT.dec()
+            queue_reporter.cancel()
+            for w in [*workers, *scoring]:
+                w.cancel()
+            self.scheduler.unregister(admission)
+            logger.info("Simulation stats after evaluation %s: %s", evaluation_id, simulation_stats.snapshot())
+            logger.info("Domain cache stats: %s", domain_cache.snapshot())
+
+    @staticmethod
+    def _format_early_stop(early_stop: Optional[EarlyStop]) -> str:
+        if early_stop is None:
+            return ""
+        low, high = early_stop.interval
+        outcome = early_stop.decision or "not settled"
+        return (
+            f"Early stop: {outcome} vs {early_stop.threshold:.0%} target "
+            f"({early_stop.confidence:.0%} CI {low:.1%}-{high:.1%}), {early_stop.skipped} tasks skipped\n"
+        )
+
+    async def _agent_fingerprint(self, agent_url: str, config: EvalConfig) -> Optional[str]:
+        """Identify the purple agent build: the caller's fingerprint, else its card name and version."""
+        if config.agent_fingerprint:
+            return config.agent_fingerprint
+        try:
+            card = await self.messenger.get_agent_card(agent_url)
+        except Exception as e:
+            logger.warning("Result cache disabled: could not fetch agent card from %s: %s", agent_url, e)
+            return None
+        return f"{card.name}@{card.version}"
+
+    @staticmethod
+    def _result_cache_key(fingerprint: str, config: EvalConfig, task_id: str, seed: int) -> str:
+        return cache_key(
+            agent=fingerprint,
+            domain=config.domain,
+            task_id=task_id,
+            seed=seed,
+            user_llm=config.user_llm,
+            user_llm_args=config.user_llm_args,
+            max_steps=config.max_steps,
+            compact_prompt=config.compact_prompt,
+            message_protocol=config.message_protocol,
+            tau2_version=_get_version("tau2", "unknown"),
+        )
+
+    async def _report_queue_status(self, admission: Admission, updater: TaskUpdater) -> None:
+        """Report queue position and estimated start until the first simulation starts."""
+        last_status = None
+        while not admission.admitted.is_set():
+            position, eta = self.scheduler.queue_status(admission)
+            if eta is None:
+                status = f"Queued for a simulation slot (position {position}, start time unknown)"
+            else:
+                status = f"Queued for a simulation slot (position {position}, estimated start in ~{eta:.0f}s)"
+            if status != last_status:
+                await updater.update_status(TaskState.working, new_agent_text_message(status))
+                last_status = status
+            try:
+                await asyncio.wait_for(admission.admitted.wait(), timeout=QUEUE_STATUS_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+        if last_status is not None:
+            logger.info(
+                "Evaluation %s admitted after %.1fs in queue",
+                admission.evaluation_id,
+                admission.queue_wait_sec,
+            )
+
+    async def _run_task(
+        self,
+        idx: int,
+        task,
+        agent_url: str,
+        evaluation_id: str,
+        config: EvalConfig,
+        updater: TaskUpdater,
+        eval_timings: Optional[EvalTimings] = None,
+        release_slot: Optional[Callable[[], None]] = None,
+    ) -> TaskResult:
+        """Run one task under the per-task timeout and classify its outcome."""
+        task_id = task.id
+        logger.info("Task start: id=%s", task_id)
+        await updater.update_status(
+            TaskState.working,
+            new_agent_text_message(f"Running task {task_id}...")
+        )
+
+        task_start = time.perf_counter()
+        timer = PhaseTimer()
+        run_data: Optional[TaskRunData] = None
+        error_summary: Optional[str] = None
+        try:
+            run_data = await asyncio.wait_for(
+                self._run_single_task(
+                    agent_url=agent_url,
+                    evaluation_id=evaluation_id,
+                    domain=config.domain,
+                    task=task,
+                    max_steps=config.max_steps,
+                    user_llm=config.user_llm,
+                    user_llm_args=config.user_llm_args,
+                    seed=config.seed + idx,
+                    timeout_seconds=config.timeout_seconds,
+                    retries=config.retries,
+                    compact_prompt=config.compact_prompt,
+                    message_protocol=config.message_protocol,
+                    streaming=config.streaming,
+                    first_event_timeout=config.first_event_timeout_seconds,
+                    user_llm_cache=config.user_llm_cache,
+                    timer=timer,
+                    release_slot=release_slot,
+                ),
+                timeout=config.timeout_seconds,
+            )
+            reward = run_data.reward
+            error_summary = run_data.eval_error
+            failure_reason = self._classify_failure(
+                run_data,
+                error=error_summary,
+            )
+        except asyncio.TimeoutError:
+            reward = 0.0
+            error_summary = f"Task exceeded {config.timeout_seconds}s timeout."
+            failure_reason = "timeout"
+            logger.warning("Task %s timeout after %ss", task_id, config.timeout_seconds)
+        except InvalidResponseError as e:
+            reward = 0.0
+            error_summary = str(e)
+            failure_reason = "invalid_response"
+            logger.warning("Task %s invalid response: %s", task_id, e)
+        except RemoteAgentError as e:
+            reward = 0.0
+            breaker_state = self.messenger.breaker(agent_url).state
+            error_summary = f"{e} (circuit breaker: {breaker_state})"
+            if isinstance(e.__cause__, CircuitOpenError):
+                failure_reason = "circuit_open"
+            elif isinstance(e.__cause__, FirstEventTimeoutError):
+                failure_reason = "first_event_timeout"
+            else:
+                failure_reason = "agent_error"
+            logger.warning("Task %s agent error (circuit breaker %s): %s", task_id, breaker_state, e)
+        except UserTurnReplayMiss as e:
+            reward = 0.0
+            error_summary = str(e)
+            failure_reason = "replay_miss"
+            logger.warning("Task %s replay miss: %s", task_id, e)
+        except Exception as e:
+            reward = 0.0
+            error_summary = str(e)
+            failure_reason = "unknown"
+            logger.exception("Task %s failed with unexpected error", task_id)
+
+        duration_sec = time.perf_counter() - task_start
+        turns = run_data.turns if run_data else 0
+        tool_calls = run_data.tool_calls if run_data else 0
+        passed = reward > 0
+        if eval_timings is not None:
+            eval_timings.add(timer)
+        TASKS_COMPLETED.inc(failure_reason="none" if passed else failure_reason)
+        for phase, samples in timer.samples.items():
+            for seconds in samples:
+                PHASE_DURATION.observe(seconds, phase=phase)
+
+        logger.info(
+            "Task end: id=%s reward=%s failure_reason=%s duration_sec=%.2f",
+            task_id,
+            reward,
+            failure_reason,
+            duration_sec,
+        )
+
+        return TaskResult(
+            task_id=task_id,
+            passed=passed,
+            reward=reward,
+            duration_sec=duration_sec,
+            turns=turns,
+            tool_calls=tool_calls,
+            failure_reason=None if passed else failure_reason,
+            error=None if passed else error_summary,
+            timings=timer.totals(),
+        )
 
     def _classify_failure(
         self,
@@ -583,16 +1310,22 @@ Task Results:
         domain: str,
         total_reward: float,
         num_completed: int,
+        num_passed: int,
         pass_rate: float,
         time_used: float,
         task_rewards: dict[str, float],
-        task_results: list[TaskResult],
+        task_results: Optional[list[TaskResult]],
         config: EvalConfig,
+        timings: Optional[dict[str, Any]] = None,
+        resumed_tasks: int = 0,
+        cache: Optional[dict[str, Any]] = None,
+        early_stop: Optional[dict[str, Any]] = None,
+        run_id: Optional[str] = None,
     ) -> dict[str, Any]:
         green_version = _get_version("tau2-green-agent", "0.1.0")
         tau2_version = _get_version("tau2", "unknown")
 
-        return {
+        result_data = {
             "domain": domain,
             "score": total_reward,
             "max_score": num_completed,
@@ -601,9 +1334,10 @@ Task Results:
             "time_used": time_used,
             "summary": {
                 "pass_rate": pass_rate,
-                "passed": sum(1 for result in task_results if result.passed),
+                "passed": num_passed,
                 "total": num_completed,
                 "time_used_sec": time_used,
+                "resumed": resumed_tasks,
             },
             "config": {
                 "domain": config.domain,
@@ -612,17 +1346,37 @@ Task Results:
                 "timeout_seconds": config.timeout_seconds,
                 "max_steps": config.max_steps,
                 "retries": config.retries,
+                "compact_prompt": config.compact_prompt,
+                "message_protocol": config.message_protocol,
+                "streaming": config.streaming,
+                "first_event_timeout_seconds": config.first_event_timeout_seconds,
+                "max_concurrency": config.max_concurrency,
+                "stream_results": config.stream_results,
+                "scheduling_weight": config.scheduling_weight,
+                "cache_results": config.cache_results,
             },
-            "tasks": [result.to_dict() for result in task_results],
             "system": {
                 "green_agent_version": green_version,
                 "tau2_bench_version": tau2_version,
             },
+            "timings": timings or {},
         }
+        if cache is not None:
+            result_data["cache"] = cache
+        if early_stop is not None:
+            result_data["early_stop"] = early_stop
+        if run_id is not None:
+            # Identifies this run in --results-export and --trajectory-dir.
+            result_data["run_id"] = run_id
+        # Streamed runs have already published every task as its own chunk.
+        if task_results is not None:
+            result_data["tasks"] = [result.to_dict() for result in task_results]
+        return result_data
 
     async def _run_single_task(
         self,
         agent_url: str,
+        evaluation_id: str,
         domain: str,
         task,
         max_steps: int,
@@ -631,62 +1385,93 @@ Task Results:
         seed: int,
         timeout_seconds: int,
         retries: int,
+        compact_prompt: bool = False,
+        message_protocol: str = TEXT_PROTOCOL,
+        streaming: bool = False,
+        first_event_timeout: Optional[float] = None,
+        user_llm_cache: str = OFF,
+        timer: Optional[PhaseTimer] = None,
+        release_slot: Optional[Callable[[], None]] = None,
     ) -> TaskRunData:
-        """Run a single tau-bench task using native Orchestrator and return reward data."""
-
-        # Get environment from registry
-        env_constructor = registry.get_env_constructor(domain)
-        environment = env_constructor(solo_mode=False)
-
-        # Create the remote agent wrapper
-        agent = RemoteA2AAgent(
-            tools=environment.get_tools(),
-            domain_policy=environment.get_policy(),
-            messenger=self.messenger,
-            agent_url=agent_url,
-            timeout_seconds=timeout_seconds,
-            retries=retries,
-        )
+        """
+        Run a single tau-bench task using native Orchestrator and return reward data.
 
-        # Create user simulator
-        user = UserSimulator(
-            tools=environment.get_user_tools() if environment.user_tools else None,
-            instructions=str(task.user_scenario),
-            llm=user_llm,
-            llm_args=user_llm_args,
-        )
+        `release_slot` is called once the simulation has finished, so that the
+        next simulation can start while this one is being evaluated.
+        """
+        timer = timer or PhaseTimer()
+
+        # Clone a pristine environment for this task
+        environment = domain_cache.new_environment(domain)
+
+        # One conversation per task, so parallel tasks against the same
+        # purple agent never share a context_id.
+        with self.messenger.open_session(agent_url, evaluation_id, task.id, timer=timer) as session:
+            # Create the remote agent wrapper
+            agent = RemoteA2AAgent(
+                tools=environment.get_tools(),
+                domain_policy=environment.get_policy(),
+                session=session,
+                timeout_seconds=timeout_seconds,
+                retries=retries,
+                compact_prompt=compact_prompt,
+                timer=timer,
+                streaming=streaming,
+                first_event_timeout=first_event_timeout,
+                message_protocol=message_protocol,
+            )
 
-        # Create orchestrator
-        orchestrator = Orchestrator(
-            domain=domain,
-            agent=agent,
-            user=user,
-            environment=environment,
-            task=task,
-            max_steps=max_steps,
-            max_errors=10,
-            seed=seed,
-            solo_mode=False,
-            validate_communication=False,
-        )
+            # Create user simulator
+            user_kwargs = dict(
+                tools=environment.get_user_tools() if environment.user_tools else None,
+                instructions=str(task.user_scenario),
+                llm=user_llm,
+                llm_args=user_llm_args,
+            )
+            if user_llm_cache != OFF:
+                user = CachingUserSimulator(store=self.user_turn_cache, mode=user_llm_cache, **user_kwargs)
+            else:
+                user = UserSimulator(**user_kwargs)
 
-        # Run the simulation
-        simulation_run = await asyncio.to_thread(orchestrator.run)
+            # Create orchestrator
+            orchestrator = Orchestrator(
+                domain=domain,
+                agent=agent,
+                user=user,
+                environment=environment,
+                task=task,
+                max_steps=max_steps,
+                max_errors=10,
+                seed=seed,
+                solo_mode=False,
+                validate_communication=False,
+            )
 
+            # Run the simulation, streaming its messages to the trajectory store
+            trajectory = self.trajectory_store.open(evaluation_id, task.id) if self.trajectory_store else None
+            complete = False
+            try:
+                simulation_run = await AsyncStepDriver(
+                    orchestrator,
+                    timer=timer,
+                    on_message=trajectory.write if trajectory else None,
+                    executor=self.user_step_threads,
+                ).run()
+                complete = True
+            finally:
+                if trajectory:
+                    trajectory.close(complete=complete)
+
+        if release_slot is not None:
+            release_slot()
         logger.info(f"Task {task.id} terminated: {simulation_run.termination_reason}")
         logger.debug(f"Task {task.id} messages: {len(simulation_run.messages)}")
         turns, tool_calls, tool_error = _count_turns_and_tool_calls(simulation_run.messages)
 
         # Evaluate the simulation
         try:
-            reward_info = evaluate_simulation(
-                simulation=simulation_run,
-                task=task,
-                evaluation_type=EvaluationType.ACTION,
-                solo_mode=False,
-                domain=domain,
-            )
-            reward = reward_info.reward
+            with timer.measure(EVALUATION):
+                reward = await self.evaluation_pool.evaluate(simulation_run, task, domain)
             eval_error = None
         except Exception as e:
             logger.error(f"Evaluation failed for task {task.id}: {e}")
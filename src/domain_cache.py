@@ -0,0 +1,134 @@
+"""
+Process-level cache of tau2 domain data.
+
+Loading a domain means parsing its task JSON and building its environment
+(including the domain DB). Both are done once per domain here: tasks are
+shared read-only, and every simulation gets a deep copy of a pristine
+environment instead of constructing a new one from disk.
+"""
+import copy
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from tau2.registry import registry
+from tau2.run import get_tasks
+
+from metrics import REGISTRY
+
+logger = logging.getLogger("tau2_green_agent.domain_cache")
+
+DEFAULT_TASK_SPLIT = "base"
+
+
+@dataclass
+class DomainCacheStats:
+    task_hits: int = 0
+    task_misses: int = 0
+    env_hits: int = 0
+    env_misses: int = 0
+    clones: int = 0
+    clone_time_total_sec: float = 0.0
+    clone_time_max_sec: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        task_lookups = self.task_hits + self.task_misses
+        env_lookups = self.env_hits + self.env_misses
+        return {
+            "task_hits": self.task_hits,
+            "task_misses": self.task_misses,
+            "task_hit_rate": self.task_hits / task_lookups if task_lookups else 0.0,
+            "env_hits": self.env_hits,
+            "env_misses": self.env_misses,
+            "env_hit_rate": self.env_hits / env_lookups if env_lookups else 0.0,
+            "clones": self.clones,
+            "clone_time_avg_sec": self.clone_time_total_sec / self.clones if self.clones else 0.0,
+            "clone_time_max_sec": self.clone_time_max_sec,
+        }
+
+
+class DomainCache:
+    """Caches task lists and pristine environments per tau2 domain."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tasks: dict[tuple[str, str], list] = {}
+        self._environments: dict[str, Any] = {}
+        self.stats = DomainCacheStats()
+
+    def get_tasks(
+        self,
+        domain: str,
+        task_split_name: str = DEFAULT_TASK_SPLIT,
+        task_ids: Optional[list[str]] = None,
+    ) -> list:
+        """Return the domain's tasks, optionally restricted to `task_ids`."""
+        key = (domain, task_split_name)
+        with self._lock:
+            tasks = self._tasks.get(key)
+            if tasks is None:
+                self.stats.task_misses += 1
+                tasks = get_tasks(task_set_name=domain, task_split_name=task_split_name)
+                self._tasks[key] = tasks
+            else:
+                self.stats.task_hits += 1
+
+        if task_ids is None:
+            return list(tasks)
+        selected = [task for task in tasks if task.id in task_ids]
+        if len(selected) != len(set(task_ids)):
+            missing = set(task_ids) - {task.id for task in selected}
+            raise ValueError(f"Unknown task ids for domain '{domain}': {sorted(missing)}")
+        return selected
+
+    def new_environment(self, domain: str):
+        """Return a fresh environment for `domain`, cloned from a cached pristine copy."""
+        with self._lock:
+            pristine = self._environments.get(domain)
+            if pristine is None:
+                self.stats.env_misses += 1
+                env_constructor = registry.get_env_constructor(domain)
+                pristine = env_constructor(solo_mode=False)
+                self._environments[domain] = pristine
+            else:
+                self.stats.env_hits += 1
+
+        start = time.perf_counter()
+        environment = copy.deepcopy(pristine)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.stats.clones += 1
+            self.stats.clone_time_total_sec += elapsed
+            self.stats.clone_time_max_sec = max(self.stats.clone_time_max_sec, elapsed)
+        return environment
+
+    def invalidate(self, domain: Optional[str] = None) -> None:
+        """Forget cached data for `domain` (or for every domain) so it is reloaded."""
+        with self._lock:
+            if domain is None:
+                self._tasks.clear()
+                self._environments.clear()
+            else:
+                self._environments.pop(domain, None)
+                for key in [key for key in self._tasks if key[0] == domain]:
+                    del self._tasks[key]
+        logger.info("Invalidated domain cache: %s", domain or "all domains")
+
+    @property
+    def num_environments(self) -> int:
+        return len(self._environments)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {"environments": len(self._environments), **self.stats.to_dict()}
+
+
+domain_cache = DomainCache()
+
+REGISTRY.gauge(
+    "tau2_domain_environments",
+    "Pristine domain environments held by the domain cache.",
+    function=lambda: domain_cache.num_environments,
+)
@@ -0,0 +1,71 @@
+"""
+Early stopping of evaluations on a confidence-bounded pass rate.
+
+After each finished task, the Wilson score interval of the pass rate is
+compared with a target. Once the whole interval lies at or above the target
+("pass") or below it ("fail"), the outcome is settled and the remaining
+tasks need not run. The interval is recomputed after every task without a
+correction for repeated looks, so the stated confidence is nominal;
+`min_tasks` keeps a handful of early results from settling an evaluation.
+"""
+import math
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Any, Optional
+
+PASS = "pass"
+FAIL = "fail"
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_MIN_TASKS = 5
+
+
+def wilson_interval(successes: int, n: int, confidence: float = DEFAULT_CONFIDENCE) -> tuple[float, float]:
+    """Wilson score interval for a binomial proportion (`(0.0, 1.0)` when `n` is 0)."""
+    if n == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(1 - (1 - confidence) / 2)
+    p = successes / n
+    denominator = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+@dataclass
+class EarlyStop:
+    """Tracks one evaluation's passes and decides when its outcome is settled."""
+
+    threshold: float
+    confidence: float = DEFAULT_CONFIDENCE
+    min_tasks: int = DEFAULT_MIN_TASKS
+    passed: int = 0
+    total: int = 0
+    decision: Optional[str] = None
+    skipped: int = 0
+
+    def add(self, passed: bool) -> Optional[str]:
+        """Count a finished task; return the decision once it is settled."""
+        self.passed += passed
+        self.total += 1
+        if self.decision is None and self.total >= self.min_tasks:
+            low, high = self.interval
+            if low >= self.threshold:
+                self.decision = PASS
+            elif high < self.threshold:
+                self.decision = FAIL
+        return self.decision
+
+    @property
+    def interval(self) -> tuple[float, float]:
+        return wilson_interval(self.passed, self.total, self.confidence)
+
+    def to_dict(self) -> dict[str, Any]:
+        low, high = self.interval
+        return {
+            "threshold": self.threshold,
+            "confidence": self.confidence,
+            "decision": self.decision,
+            "ci_low": low,
+            "ci_high": high,
+            "skipped": self.skipped,
+        }
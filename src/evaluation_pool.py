@@ -0,0 +1,124 @@
+"""
+Process pool for `evaluate_simulation`.
+
+Action-based evaluation replays the expected actions against a fresh
+environment, which is CPU-bound and would stall every evaluation sharing the
+server's event loop. `EvaluationPool` runs it in worker processes instead.
+Each worker loads the task lists and builds an environment for the warm-up
+domains when it starts, and keeps its own `domain_cache`, so only the
+simulation (as JSON) and the task id cross the process boundary.
+
+With `workers=0` evaluation runs in a thread of the event loop's default
+executor: it still competes for the GIL, but network I/O of other simulations
+and requests such as `/metrics` go on while it runs.
+tau2 is imported on first use, so creating a pool does not slow server start.
+"""
+import asyncio
+import logging
+import multiprocessing
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from metrics import REGISTRY
+
+if TYPE_CHECKING:
+    from tau2.data_model.simulation import SimulationRun
+
+logger = logging.getLogger("tau2_green_agent.evaluation_pool")
+
+_pools: "weakref.WeakSet[EvaluationPool]" = weakref.WeakSet()
+
+REGISTRY.gauge(
+    "tau2_evaluation_pool_pending",
+    "Simulations submitted to the evaluation process pool and not yet evaluated.",
+    function=lambda: sum(pool.pending for pool in list(_pools)),
+)
+
+
+def _evaluate(simulation: "SimulationRun", task, domain: str) -> float:
+    from tau2.evaluator.evaluator import EvaluationType, evaluate_simulation
+
+    reward_info = evaluate_simulation(
+        simulation=simulation,
+        task=task,
+        evaluation_type=EvaluationType.ACTION,
+        solo_mode=False,
+        domain=domain,
+    )
+    return reward_info.reward
+
+
+def _warm_worker(domains: tuple[str, ...]) -> None:
+    from domain_cache import domain_cache
+
+    for domain in domains:
+        try:
+            domain_cache.get_tasks(domain)
+            domain_cache.new_environment(domain)
+        except Exception:
+            logger.exception("Failed to warm evaluation worker for domain %s", domain)
+
+
+def _evaluate_in_worker(domain: str, task_id: str, simulation_json: str) -> float:
+    """Evaluate a serialized simulation in a worker process and return its reward."""
+    from tau2.data_model.simulation import SimulationRun
+
+    from domain_cache import domain_cache
+
+    simulation = SimulationRun.model_validate_json(simulation_json)
+    task = domain_cache.get_tasks(domain, task_ids=[task_id])[0]
+    return _evaluate(simulation, task, domain)
+
+
+class EvaluationPool:
+    """Runs action-based evaluations in `workers` processes warmed with `domains`."""
+
+    def __init__(self, workers: int = 0, domains: Iterable[str] = ()):
+        self.workers = workers
+        self.domains = tuple(domains)
+        self.pending = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        _pools.add(self)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Forking a process that runs an event loop and worker threads is unsafe.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_worker,
+                initargs=(self.domains,),
+            )
+        return self._executor
+
+    def start(self) -> None:
+        """Start the workers now, so that they warm up before the first evaluation."""
+        if self.workers > 0:
+            executor = self._get_executor()
+            for _ in range(self.workers):
+                executor.submit(int)
+
+    async def evaluate(self, simulation: "SimulationRun", task, domain: str) -> float:
+        """Return the reward of `simulation` for `task`."""
+        if self.workers == 0:
+            return await asyncio.to_thread(_evaluate, simulation, task, domain)
+
+        loop = asyncio.get_running_loop()
+        self.pending += 1
+        try:
+            return await loop.run_in_executor(
+                self._get_executor(), _evaluate_in_worker, domain, task.id, simulation.model_dump_json()
+            )
+        except BrokenProcessPool:
+            logger.error("Evaluation worker died; restarting the evaluation pool")
+            self.close()
+            raise
+        finally:
+            self.pending -= 1
+
+    def close(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
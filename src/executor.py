@@ -1,4 +1,10 @@
+import asyncio
 import logging
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Optional
 
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.events import EventQueue
@@ -15,7 +21,17 @@ from a2a.utils import (
     new_task,
 )
 
-from agent import Agent
+from evaluation_pool import EvaluationPool
+from messenger import Messenger
+from metrics import REGISTRY
+from scheduler import DEFAULT_MAX_SIMULATIONS, DEFAULT_POLICY, SimulationScheduler
+from result_cache import ResultCache
+from results_export import ResultsExport
+from trajectories import TrajectoryStore
+from task_store import CheckpointStore
+
+if TYPE_CHECKING:
+    from agent import Agent
 
 
 TERMINAL_STATES = {
@@ -27,10 +43,181 @@ TERMINAL_STATES = {
 
 logger = logging.getLogger("tau2_green_agent.executor")
 
+DEFAULT_MAX_AGENTS = 256
+DEFAULT_AGENT_TTL_SECONDS = 3600.0
+# Seconds between sweeps for idle agents past their TTL.
+DEFAULT_SWEEP_INTERVAL_SECONDS = 60.0
+
+AGENT_EVICTIONS = REGISTRY.counter(
+    "tau2_agent_registry_evictions_total",
+    "Agents removed from the executor registry, by reason (released, lru, ttl).",
+    ("reason",),
+)
+
+_registries: "weakref.WeakSet[AgentRegistry]" = weakref.WeakSet()
+
+AGENT_REGISTRY_SIZE = REGISTRY.gauge(
+    "tau2_agent_registry_size",
+    "Agents held by executor registries.",
+    function=lambda: sum(len(registry) for registry in list(_registries)),
+)
+
+
+def _import_agent_class() -> type["Agent"]:
+    from agent import Agent
+
+    return Agent
+
+
+class AgentRegistry:
+    """
+    Bounded map of context_id to `Agent`.
+
+    Idle agents are evicted least-recently-used first once more than
+    `max_size` are held, or when unused for `ttl_seconds`. Agents that are
+    running a request are never evicted. Evicted agents are closed. Eviction
+    runs on every acquire and release, and from `sweep` so that an idle
+    replica also drops expired agents.
+    `agent_options` are passed to every `Agent` the registry creates.
+
+    The `agent` module pulls in tau2 and litellm, which takes seconds, so it
+    is imported in a worker thread by `load_agent_class` (on the first
+    request, or earlier from a warm-up task) rather than at server start.
+    """
+
+    def __init__(
+        self,
+        messenger: Messenger,
+        max_size: int = DEFAULT_MAX_AGENTS,
+        ttl_seconds: float = DEFAULT_AGENT_TTL_SECONDS,
+        **agent_options: Any,
+    ):
+        self.messenger = messenger
+        self.agent_options = agent_options
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        # context_id -> (agent, last used on the monotonic clock)
+        self._agents: OrderedDict[str, tuple["Agent", float]] = OrderedDict()
+        self._active: dict[str, int] = {}
+        self._agent_class: Optional[type["Agent"]] = None
+        self._agent_class_loading: Optional[asyncio.Future] = None
+        _registries.add(self)
+
+    async def load_agent_class(self) -> type["Agent"]:
+        """Import the `agent` module without blocking the event loop; only once."""
+        if self._agent_class is None:
+            if self._agent_class_loading is None:
+                self._agent_class_loading = asyncio.ensure_future(asyncio.to_thread(_import_agent_class))
+            try:
+                self._agent_class = await asyncio.shield(self._agent_class_loading)
+            except Exception:
+                self._agent_class_loading = None
+                raise
+        return self._agent_class
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    def get(self, context_id: str) -> Optional["Agent"]:
+        entry = self._agents.get(context_id)
+        return entry[0] if entry else None
+
+    async def acquire(self, context_id: str) -> "Agent":
+        """Return the agent for `context_id`, creating it if needed, and mark it busy."""
+        agent_class = await self.load_agent_class()
+        entry = self._agents.pop(context_id, None)
+        if entry:
+            agent = entry[0]
+        else:
+            agent = agent_class(messenger=self.messenger, **self.agent_options)
+        self._agents[context_id] = (agent, time.monotonic())
+        self._active[context_id] = self._active.get(context_id, 0) + 1
+        await self._evict_idle()
+        return agent
+
+    async def release(self, context_id: str, discard: bool = False) -> None:
+        """Mark the agent idle again; with `discard`, drop and close it right away."""
+        remaining = self._active.get(context_id, 0) - 1
+        if remaining > 0:
+            self._active[context_id] = remaining
+            return
+        self._active.pop(context_id, None)
+        if discard:
+            await self._evict(context_id, "released")
+        elif context_id in self._agents:
+            self._agents[context_id] = (self._agents[context_id][0], time.monotonic())
+            self._agents.move_to_end(context_id)
+        await self._evict_idle()
+
+    async def sweep(self, interval: float = DEFAULT_SWEEP_INTERVAL_SECONDS) -> None:
+        """Evict idle agents every `interval` seconds, until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            await self._evict_idle()
+
+    async def close(self) -> None:
+        for context_id in list(self._agents):
+            await self._evict(context_id, "released")
+
+    async def _evict_idle(self) -> None:
+        now = time.monotonic()
+        for context_id, (_, last_used) in list(self._agents.items()):
+            if context_id not in self._active and now - last_used > self.ttl_seconds:
+                await self._evict(context_id, "ttl")
+        for context_id in list(self._agents):
+            if len(self._agents) <= self.max_size:
+                break
+            if context_id not in self._active:
+                await self._evict(context_id, "lru")
+
+    async def _evict(self, context_id: str, reason: str) -> None:
+        entry = self._agents.pop(context_id, None)
+        if entry is None:
+            return
+        AGENT_EVICTIONS.inc(reason=reason)
+        try:
+            await entry[0].close()
+        except Exception:
+            logger.exception("Failed to close agent for context %s", context_id)
+
 
 class Executor(AgentExecutor):
-    def __init__(self):
-        self.agents: dict[str, Agent] = {} # context_id to agent instance
+    def __init__(
+        self,
+        max_agents: int = DEFAULT_MAX_AGENTS,
+        agent_ttl_seconds: float = DEFAULT_AGENT_TTL_SECONDS,
+        max_simulations: int = DEFAULT_MAX_SIMULATIONS,
+        scheduling_policy: str = DEFAULT_POLICY,
+        checkpoints: Optional[CheckpointStore] = None,
+        result_cache: Optional[ResultCache] = None,
+        user_turn_cache: Optional[ResultCache] = None,
+        evaluation_pool: Optional[EvaluationPool] = None,
+        results_export: Optional[ResultsExport] = None,
+        trajectory_store: Optional[TrajectoryStore] = None,
+    ):
+        # One pooled messenger, one simulation budget, one evaluation pool and
+        # one thread per simulation slot for user turns, shared by every agent
+        # this executor creates.
+        self.messenger = Messenger()
+        self.scheduler = SimulationScheduler(max_simulations=max_simulations, policy=scheduling_policy)
+        self.evaluation_pool = evaluation_pool or EvaluationPool()
+        self.user_step_threads = ThreadPoolExecutor(max_workers=max_simulations, thread_name_prefix="tau2-user-step")
+        self.checkpoints = checkpoints
+        self.results_export = results_export
+        self.trajectory_store = trajectory_store
+        self.agents = AgentRegistry(
+            self.messenger,
+            max_size=max_agents,
+            ttl_seconds=agent_ttl_seconds,
+            scheduler=self.scheduler,
+            checkpoints=checkpoints,
+            result_cache=result_cache,
+            user_turn_cache=user_turn_cache,
+            evaluation_pool=self.evaluation_pool,
+            results_export=results_export,
+            trajectory_store=trajectory_store,
+            user_step_threads=self.user_step_threads,
+        )
 
     async def execute(self, context: RequestContext, event_queue: EventQueue) -> None:
         msg = context.message
@@ -46,10 +233,7 @@ class Executor(AgentExecutor):
             await event_queue.enqueue_event(task)
 
         context_id = task.context_id
-        agent = self.agents.get(context_id)
-        if not agent:
-            agent = Agent()
-            self.agents[context_id] = agent
+        agent = await self.agents.acquire(context_id)
 
         updater = TaskUpdater(event_queue, task.id, context_id)
 
@@ -61,6 +245,26 @@ class Executor(AgentExecutor):
         except Exception as e:
             logger.exception("Task failed with agent error: %s", e)
             await updater.failed(new_agent_text_message(f"Agent error: {e}", context_id=context_id, task_id=task.id))
+        finally:
+            # Agents for finished tasks are not needed again; free them now.
+            await self.agents.release(context_id, discard=updater._terminal_state_reached)
+
+    async def warm_up(self) -> None:
+        """Import tau2 and litellm ahead of the first evaluation."""
+        await self.agents.load_agent_class()
+
+    async def aclose(self) -> None:
+        await self.agents.close()
+        await self.messenger.aclose()
+        self.evaluation_pool.close()
+        self.user_step_threads.shutdown(wait=False)
+        # Close the stores only once no agent can write to them any more.
+        if self.results_export is not None:
+            self.results_export.close()
+        if self.trajectory_store is not None:
+            self.trajectory_store.close()
+        if self.checkpoints is not None:
+            self.checkpoints.close()
 
     async def cancel(self, context: RequestContext, event_queue: EventQueue) -> None:
         raise ServerError(error=UnsupportedOperationError())
@@ -1,34 +1,85 @@
 import asyncio
 import json
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from uuid import uuid4
 
 import httpx
 from a2a.client import (
     A2ACardResolver,
+    Client,
+    ClientCallContext,
     ClientConfig,
     ClientFactory,
     Consumer,
 )
+from a2a.client.errors import A2AClientTimeoutError
 from a2a.types import (
+    AgentCard,
     Message,
     Part,
     Role,
+    TaskState,
     TextPart,
     DataPart,
 )
 
+from metrics import MESSENGER_RETRIES, REGISTRY
+from resilience import (
+    CLOSED,
+    DEFAULT_FAILURE_THRESHOLD,
+    DEFAULT_RESET_TIMEOUT,
+    CircuitBreaker,
+    RetryPolicy,
+    is_retryable,
+    is_unavailable,
+)
+from timings import A2A_FIRST_EVENT, A2A_REQUEST, PhaseTimer
+
 
 DEFAULT_TIMEOUT = 300
 DEFAULT_RETRIES = 2
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+DEFAULT_CARD_TTL = 300.0
+DEFAULT_MAX_BREAKERS = 256
+
+# Task states after which an agent sends no further events for the request.
+FINAL_STATES = {
+    TaskState.completed,
+    TaskState.failed,
+    TaskState.canceled,
+    TaskState.rejected,
+    TaskState.input_required,
+    TaskState.auth_required,
+}
+
+
+class UnexpectedStatusError(RuntimeError):
+    """The agent answered, but its task did not reach the `completed` state."""
+
+
+class FirstEventTimeoutError(A2AClientTimeoutError):
+    """The agent sent nothing within the first-event timeout."""
 
 
 def create_message(
-    *, role: Role = Role.user, text: str, context_id: str | None = None
+    *,
+    role: Role = Role.user,
+    text: str | None = None,
+    parts: list[Part] | None = None,
+    context_id: str | None = None,
 ) -> Message:
+    """Build a message from `text`, from ready-made `parts`, or both (text first)."""
+    message_parts = [Part(TextPart(kind="text", text=text))] if text is not None else []
+    message_parts.extend(parts or [])
     return Message(
         kind="message",
         role=role,
-        parts=[Part(TextPart(kind="text", text=text))],
+        parts=message_parts,
         message_id=uuid4().hex,
         context_id=context_id,
     )
@@ -40,19 +91,107 @@ def merge_parts(parts: list[Part]) -> str:
         if isinstance(part.root, TextPart):
             chunks.append(part.root.text)
         elif isinstance(part.root, DataPart):
-            chunks.append(json.dumps(part.root.data, indent=2))
+            chunks.append(json.dumps(part.root.data, separators=(",", ":")))
     return "\n".join(chunks)
 
 
+def data_parts(parts: list[Part]) -> list[dict]:
+    return [part.root.data for part in parts if isinstance(part.root, DataPart)]
+
+
+async def _collect_outputs(
+    client: Client,
+    message: str | list[Part],
+    context_id: str | None,
+    timeout: int,
+    first_event_timeout: float | None = None,
+) -> dict:
+    """
+    Send `message` and build the reply from the agent's events.
+
+    Events are consumed as they arrive: a streaming agent yields one per
+    SSE event, a non-streaming one a single event. The whole exchange must
+    finish within `timeout` seconds and, if given, the first event must
+    arrive within `first_event_timeout`. `ttfb_sec` in the result is the
+    time until the first event. `message` is either text or a list of
+    parts; `data` in the result holds the reply's DataPart payloads as-is.
+    """
+    if isinstance(message, str):
+        outbound_msg = create_message(text=message, context_id=context_id)
+    else:
+        outbound_msg = create_message(parts=message, context_id=context_id)
+    call_context = ClientCallContext(state={"http_kwargs": {"timeout": timeout}})
+    last_event = None
+    outputs = {"response": "", "data": [], "context_id": None, "ttfb_sec": None}
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    deadline = start + timeout
+    events = client.send_message(outbound_msg, context=call_context)
+    try:
+        while True:
+            wait = deadline - loop.time()
+            first = last_event is None
+            if first and first_event_timeout is not None:
+                wait = min(wait, first_event_timeout)
+            try:
+                event = await asyncio.wait_for(anext(events), timeout=max(wait, 0.0))
+            except StopAsyncIteration:
+                break
+            except asyncio.TimeoutError:
+                if first and first_event_timeout is not None and loop.time() < deadline:
+                    raise FirstEventTimeoutError(f"No response within {first_event_timeout}s")
+                raise A2AClientTimeoutError(f"Response not finished within {timeout}s")
+            if first:
+                outputs["ttfb_sec"] = loop.time() - start
+            last_event = event
+            if isinstance(event, Message) or event[0].status.state in FINAL_STATES:
+                break
+    finally:
+        await events.aclose()
+
+    match last_event:
+        case Message() as msg:
+            outputs["context_id"] = msg.context_id
+            outputs["response"] += merge_parts(msg.parts)
+            outputs["data"] += data_parts(msg.parts)
+
+        case (task, update):
+            outputs["context_id"] = task.context_id
+            outputs["status"] = task.status.state.value
+            msg = task.status.message
+            if msg:
+                outputs["response"] += merge_parts(msg.parts)
+                outputs["data"] += data_parts(msg.parts)
+            if task.artifacts:
+                for artifact in task.artifacts:
+                    outputs["response"] += merge_parts(artifact.parts)
+                    outputs["data"] += data_parts(artifact.parts)
+
+        case _:
+            pass
+
+    return outputs
+
+
 async def send_message(
-    message: str,
+    message: str | list[Part],
     base_url: str,
     context_id: str | None = None,
     streaming: bool = False,
     timeout: int = DEFAULT_TIMEOUT,
     consumer: Consumer | None = None,
+    client: Client | None = None,
+    first_event_timeout: float | None = None,
 ):
-    """Returns dict with context_id, response and status (if exists)"""
+    """Returns dict with context_id, response and status (if exists)
+
+    If `client` is given it is reused as-is (see `Messenger`); otherwise a
+    one-shot connection is opened and the agent card is fetched first.
+    """
+    if client is not None:
+        return await _collect_outputs(client, message, context_id, timeout, first_event_timeout)
+
     async with httpx.AsyncClient(timeout=timeout) as httpx_client:
         resolver = A2ACardResolver(httpx_client=httpx_client, base_url=base_url)
         agent_card = await resolver.get_agent_card()
@@ -65,38 +204,230 @@ async def send_message(
         if consumer:
             await client.add_event_consumer(consumer)
 
-        outbound_msg = create_message(text=message, context_id=context_id)
-        last_event = None
-        outputs = {"response": "", "context_id": None}
+        return await _collect_outputs(client, message, context_id, timeout, first_event_timeout)
 
-        # if streaming == False, only one event is generated
-        async for event in client.send_message(outbound_msg):
-            last_event = event
 
-        match last_event:
-            case Message() as msg:
-                outputs["context_id"] = msg.context_id
-                outputs["response"] += merge_parts(msg.parts)
+@dataclass
+class _ConnectionPool:
+    """HTTP connections and A2A clients bound to one event loop."""
+
+    httpx_client: httpx.AsyncClient
+    # (base_url, streaming) -> (client, card expiry on the monotonic clock)
+    clients: dict[tuple[str, bool], tuple[Client, float]] = field(default_factory=dict)
+
+
+_messengers: "weakref.WeakSet[Messenger]" = weakref.WeakSet()
 
-            case (task, update):
-                outputs["context_id"] = task.context_id
-                outputs["status"] = task.status.state.value
-                msg = task.status.message
-                if msg:
-                    outputs["response"] += merge_parts(msg.parts)
-                if task.artifacts:
-                    for artifact in task.artifacts:
-                        outputs["response"] += merge_parts(artifact.parts)
 
-            case _:
-                pass
+def _total_pool_stat(name: str) -> int:
+    return sum(m.pool_stats()[name] for m in list(_messengers))
 
-        return outputs
+
+REGISTRY.gauge(
+    "tau2_messenger_http_clients",
+    "Open pooled HTTP clients to purple agents.",
+    function=lambda: _total_pool_stat("http_clients"),
+)
+REGISTRY.gauge(
+    "tau2_messenger_a2a_clients",
+    "Cached A2A clients (one per purple agent URL and event loop).",
+    function=lambda: _total_pool_stat("a2a_clients"),
+)
+REGISTRY.gauge(
+    "tau2_messenger_sessions",
+    "Open conversation sessions with purple agents.",
+    function=lambda: _total_pool_stat("sessions"),
+)
 
 
 class Messenger:
-    def __init__(self):
-        self._context_ids = {}
+    """
+    Talks to remote A2A agents over a long-lived, pooled HTTP client.
+
+    One A2A client is kept per agent base URL and rebuilt when its cached
+    agent card is older than `card_ttl` seconds, so a conversation turn costs
+    a single request on a kept-alive connection. httpx connections cannot
+    be shared between event loops, so each loop gets its own pool.
+
+    Failed requests are retried per `retry_policy` when the error is
+    retryable, and each agent URL has a `CircuitBreaker` that fails requests
+    fast while the agent is unreachable. Agent URLs come from requests, so at
+    most `max_breakers` breakers are kept; the least recently used closed
+    breaker is dropped first, with its metrics series.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        card_ttl: float = DEFAULT_CARD_TTL,
+        retry_policy: RetryPolicy | None = None,
+        breaker_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        breaker_reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+        max_breakers: int = DEFAULT_MAX_BREAKERS,
+    ):
+        self._sessions: dict[tuple[str, ...], ConversationSession] = {}
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._card_ttl = card_ttl
+        self._cards: dict[str, tuple[AgentCard, float]] = {}
+        self._pools: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _ConnectionPool] = (
+            weakref.WeakKeyDictionary()
+        )
+        self.retry_policy = retry_policy or RetryPolicy()
+        self._breaker_threshold = breaker_threshold
+        self._breaker_reset_timeout = breaker_reset_timeout
+        self._max_breakers = max_breakers
+        self._breakers: OrderedDict[str, CircuitBreaker] = OrderedDict()
+        _messengers.add(self)
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        breaker = self._breakers.get(url)
+        if breaker is not None:
+            self._breakers.move_to_end(url)
+            return breaker
+        if len(self._breakers) >= self._max_breakers:
+            self._drop_breaker()
+        breaker = CircuitBreaker(
+            url,
+            failure_threshold=self._breaker_threshold,
+            reset_timeout=self._breaker_reset_timeout,
+        )
+        self._breakers[url] = breaker
+        return breaker
+
+    def _drop_breaker(self) -> None:
+        """Drop the least recently used closed breaker, or the least recently used one."""
+        url = next((url for url, b in self._breakers.items() if b.state == CLOSED), None)
+        if url is None:
+            url = next(iter(self._breakers))
+        self._breakers.pop(url).discard()
+
+    def _pool(self) -> _ConnectionPool:
+        loop = asyncio.get_running_loop()
+        pool = self._pools.get(loop)
+        if pool is None or pool.httpx_client.is_closed:
+            pool = _ConnectionPool(
+                httpx_client=httpx.AsyncClient(timeout=DEFAULT_TIMEOUT, limits=self._limits)
+            )
+            self._pools[loop] = pool
+        return pool
+
+    async def get_agent_card(self, url: str) -> AgentCard:
+        """Return the agent card for `url`, fetching it at most once per TTL."""
+        cached = self._cards.get(url)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+        resolver = A2ACardResolver(httpx_client=self._pool().httpx_client, base_url=url)
+        agent_card = await resolver.get_agent_card()
+        self._cards[url] = (agent_card, time.monotonic() + self._card_ttl)
+        return agent_card
+
+    async def _get_client(self, url: str, streaming: bool = False) -> Client:
+        pool = self._pool()
+        cached = pool.clients.get((url, streaming))
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+        agent_card = await self.get_agent_card(url)
+        config = ClientConfig(httpx_client=pool.httpx_client, streaming=streaming)
+        client = ClientFactory(config).create(agent_card)
+        pool.clients[(url, streaming)] = (client, self._cards[url][1])
+        return client
+
+    def open_session(
+        self, url: str, *key: str, timer: PhaseTimer | None = None
+    ) -> "ConversationSession":
+        """
+        Open a conversation with the agent at `url`.
+
+        `key` identifies the conversation among others with the same agent,
+        e.g. `(evaluation_id, task_id)`. The session must be closed (or used as
+        a context manager) to release it. If `timer` is given, every
+        successful request is recorded in it as an `a2a_request` sample.
+        """
+        session_key = (*key, url)
+        if session_key in self._sessions:
+            raise ValueError(f"Conversation {session_key} is already open")
+        session = ConversationSession(self, url, session_key, timer=timer)
+        self._sessions[session_key] = session
+        return session
+
+    def release(self, session: "ConversationSession") -> None:
+        if self._sessions.get(session.key) is session:
+            del self._sessions[session.key]
+        session.closed = True
+
+    @property
+    def active_sessions(self) -> int:
+        return len(self._sessions)
+
+    def pool_stats(self) -> dict[str, int]:
+        pools = list(self._pools.values())
+        return {
+            "http_clients": sum(1 for pool in pools if not pool.httpx_client.is_closed),
+            "a2a_clients": sum(len(pool.clients) for pool in pools),
+            "sessions": len(self._sessions),
+        }
+
+    async def _talk(
+        self,
+        session: "ConversationSession",
+        message: str | list[Part],
+        new_conversation: bool,
+        timeout: int,
+        retries: int,
+        streaming: bool = False,
+        first_event_timeout: float | None = None,
+    ) -> dict:
+        url = session.url
+        breaker = self.breaker(url)
+        attempt = 0
+        while True:
+            if session.closed:
+                # The owning simulation was cancelled or finished; stop retrying.
+                raise RuntimeError(f"Conversation {session.key} is closed")
+            # Raises CircuitOpenError without sending anything while the agent is down.
+            breaker.before_request()
+            request_start = time.perf_counter()
+            try:
+                outputs = await send_message(
+                    message=message,
+                    base_url=url,
+                    context_id=None if new_conversation else session.context_id,
+                    timeout=timeout,
+                    client=await self._get_client(url, streaming=streaming),
+                    first_event_timeout=first_event_timeout,
+                )
+            except Exception as exc:
+                if not is_unavailable(exc):
+                    breaker.record_success()
+                    raise
+                breaker.record_failure()
+                # The agent may have restarted with a new card; re-resolve on retry.
+                self.invalidate_agent_card(url)
+                if attempt >= retries or not is_retryable(exc):
+                    raise
+                MESSENGER_RETRIES.inc()
+                await asyncio.sleep(self.retry_policy.delay(attempt))
+                attempt += 1
+                continue
+            except BaseException:
+                breaker.abandon()
+                raise
+
+            breaker.record_success()
+            if session.timer is not None:
+                session.timer.record(A2A_REQUEST, time.perf_counter() - request_start)
+                if streaming and outputs["ttfb_sec"] is not None:
+                    session.timer.record(A2A_FIRST_EVENT, outputs["ttfb_sec"])
+            if outputs.get("status", "completed") != "completed":
+                raise UnexpectedStatusError(f"{url} responded with: {outputs}")
+            session.context_id = outputs.get("context_id", None)
+            return outputs
 
     async def talk_to_agent(
         self,
@@ -105,41 +436,124 @@ class Messenger:
         new_conversation: bool = False,
         timeout: int = DEFAULT_TIMEOUT,
         retries: int = DEFAULT_RETRIES,
+        streaming: bool = False,
+        first_event_timeout: float | None = None,
     ):
         """
         Communicate with another agent by sending a message and receiving their response.
 
+        This uses one shared conversation per URL; use `open_session` to hold
+        several conversations with the same agent at once.
+
         Args:
             message: The message to send to the agent
             url: The agent's URL endpoint
             new_conversation: If True, start fresh conversation; if False, continue existing conversation
             timeout: Timeout in seconds for the request (default: 300)
+            streaming: If True, use SSE streaming when the agent supports it
+            first_event_timeout: Fail if the agent sends nothing within this many seconds
 
         Returns:
             str: The agent's response message
         """
-        last_error: Exception | None = None
-        for attempt in range(retries + 1):
-            try:
-                outputs = await send_message(
-                    message=message,
-                    base_url=url,
-                    context_id=None if new_conversation else self._context_ids.get(url, None),
-                    timeout=timeout,
-                )
-                if outputs.get("status", "completed") != "completed":
-                    raise RuntimeError(f"{url} responded with: {outputs}")
-                self._context_ids[url] = outputs.get("context_id", None)
-                return outputs["response"]
-            except Exception as exc:
-                last_error = exc
-                if attempt >= retries:
-                    break
-                await asyncio.sleep(min(0.5 * (attempt + 1), 2.0))
-
-        if last_error:
-            raise last_error
-        raise RuntimeError(f"{url} failed without a response")
+        session = self._sessions.get((url,)) or self.open_session(url)
+        return await session.talk(
+            message,
+            new_conversation=new_conversation,
+            timeout=timeout,
+            retries=retries,
+            streaming=streaming,
+            first_event_timeout=first_event_timeout,
+        )
 
     def reset(self):
-        self._context_ids = {}
+        for session in list(self._sessions.values()):
+            self.release(session)
+
+    def invalidate_agent_card(self, url: str | None = None) -> None:
+        """Drop cached agent cards (all of them if `url` is None)."""
+        if url is None:
+            self._cards.clear()
+        else:
+            self._cards.pop(url, None)
+        for pool in self._pools.values():
+            for key in [key for key in pool.clients if url is None or key[0] == url]:
+                del pool.clients[key]
+
+    async def aclose(self) -> None:
+        """Close pooled connections owned by the running event loop."""
+        pool = self._pools.pop(asyncio.get_running_loop(), None)
+        if pool is not None:
+            await pool.httpx_client.aclose()
+
+
+class ConversationSession:
+    """A single conversation with a remote agent, owned by a `Messenger`."""
+
+    def __init__(
+        self,
+        messenger: Messenger,
+        url: str,
+        key: tuple[str, ...],
+        timer: PhaseTimer | None = None,
+    ):
+        self.messenger = messenger
+        self.url = url
+        self.key = key
+        self.timer = timer
+        self.context_id: str | None = None
+        self.closed = False
+
+    async def talk(
+        self,
+        message: str,
+        new_conversation: bool = False,
+        timeout: int = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        streaming: bool = False,
+        first_event_timeout: float | None = None,
+    ) -> str:
+        """Send `message` in this conversation and return the agent's response."""
+        outputs = await self.exchange(
+            message,
+            new_conversation=new_conversation,
+            timeout=timeout,
+            retries=retries,
+            streaming=streaming,
+            first_event_timeout=first_event_timeout,
+        )
+        return outputs["response"]
+
+    async def exchange(
+        self,
+        message: str | list[Part],
+        new_conversation: bool = False,
+        timeout: int = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        streaming: bool = False,
+        first_event_timeout: float | None = None,
+    ) -> dict:
+        """
+        Send text or a list of parts and return the full reply: `response`
+        text, `data` (DataPart payloads), `context_id` and `ttfb_sec`.
+        """
+        if self.closed:
+            raise RuntimeError(f"Conversation {self.key} is closed")
+        return await self.messenger._talk(
+            self,
+            message,
+            new_conversation=new_conversation,
+            timeout=timeout,
+            retries=retries,
+            streaming=streaming,
+            first_event_timeout=first_event_timeout,
+        )
+
+    def close(self) -> None:
+        self.messenger.release(self)
+
+    def __enter__(self) -> "ConversationSession":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
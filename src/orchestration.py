@@ -0,0 +1,212 @@
+"""
+Async step driver for tau2's Orchestrator.
+
+`Orchestrator.run` is a blocking loop that calls the agent, the user simulator
+and the environment in turn. The driver below runs the same step loop on the
+caller's event loop instead: purple-agent turns are awaited directly (so every
+simulation shares one loop and one connection pool), the blocking user-LLM
+turn is pushed to a worker thread, and environment steps run inline. User
+turns should get their own thread pool, sized to the simulation budget: the
+loop's default executor is small and shared with other blocking work.
+
+Cancelling the coroutine that awaits `AsyncStepDriver.run` (e.g. a timeout in
+`asyncio.wait_for`) stops the simulation within one turn: a pending purple
+agent request is cancelled outright, and a user-LLM call already running in a
+worker thread finishes on its own but no further step is taken. Such threads
+are counted in `simulation_stats` until they return.
+"""
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+import uuid
+from concurrent.futures import Executor
+from dataclasses import asdict, dataclass
+from typing import Callable, Optional
+
+from tau2.data_model.simulation import SimulationRun, TerminationReason
+from tau2.orchestrator.orchestrator import Orchestrator, Role
+from tau2.utils.llm_utils import get_cost
+from tau2.utils.utils import get_now
+
+from metrics import REGISTRY
+from timings import ENVIRONMENT, USER_SIMULATOR, PhaseTimer
+
+
+@dataclass
+class SimulationStats:
+    """Process-wide counters for simulations driven by `AsyncStepDriver`."""
+
+    started: int = 0
+    completed: int = 0
+    cancelled: int = 0
+    failed: int = 0
+    in_flight: int = 0
+    # Worker threads still running a step for a simulation that was cancelled.
+    orphaned_threads: int = 0
+
+    def snapshot(self) -> dict[str, int]:
+        with _stats_lock:
+            return asdict(self)
+
+
+_stats_lock = threading.Lock()
+simulation_stats = SimulationStats()
+
+REGISTRY.gauge(
+    "tau2_simulations_in_flight",
+    "Simulations currently being driven.",
+    function=lambda: simulation_stats.in_flight,
+)
+REGISTRY.gauge(
+    "tau2_simulation_orphaned_threads",
+    "Worker threads still running a step for a cancelled simulation.",
+    function=lambda: simulation_stats.orphaned_threads,
+)
+
+
+class AsyncStepDriver:
+    """
+    Drive an `Orchestrator` step by step from a coroutine.
+
+    If `on_message` is given, it is called with every new trajectory message
+    right after the step that produced it. User steps run in `executor`, or
+    in the loop's default executor if it is None.
+    """
+
+    def __init__(
+        self,
+        orchestrator: Orchestrator,
+        timer: Optional[PhaseTimer] = None,
+        on_message: Optional[Callable[[object], None]] = None,
+        executor: Optional[Executor] = None,
+    ):
+        self.orchestrator = orchestrator
+        self.agent = orchestrator.agent
+        self.timer = timer or PhaseTimer()
+        self.on_message = on_message
+        self.executor = executor
+        self._emitted = 0
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        """Ask the step loop to stop before its next step."""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    async def run(self) -> SimulationRun:
+        """Async equivalent of `Orchestrator.run`."""
+        with _stats_lock:
+            simulation_stats.started += 1
+            simulation_stats.in_flight += 1
+        outcome = "failed"
+        try:
+            simulation_run = await self._run()
+            outcome = "completed"
+            return simulation_run
+        except asyncio.CancelledError:
+            self.cancel()
+            outcome = "cancelled"
+            raise
+        finally:
+            with _stats_lock:
+                simulation_stats.in_flight -= 1
+                setattr(simulation_stats, outcome, getattr(simulation_stats, outcome) + 1)
+
+    async def _run(self) -> SimulationRun:
+        orch = self.orchestrator
+        start_time = get_now()
+        start = time.perf_counter()
+        orch.initialize()
+        self._emit_new_messages()
+        while not orch.done:
+            if self.cancelled:
+                raise asyncio.CancelledError()
+            await self.step()
+            self._emit_new_messages()
+            if orch.step_count >= orch.max_steps:
+                orch.done = True
+                orch.termination_reason = TerminationReason.MAX_STEPS
+            if orch.num_errors >= orch.max_errors:
+                orch.done = True
+                orch.termination_reason = TerminationReason.TOO_MANY_ERRORS
+        duration = time.perf_counter() - start
+
+        messages = orch.get_trajectory()
+        costs = get_cost(messages)
+        agent_cost, user_cost = costs if costs is not None else (None, None)
+        return SimulationRun(
+            id=str(uuid.uuid4()),
+            task_id=orch.task.id,
+            start_time=start_time,
+            end_time=get_now(),
+            duration=duration,
+            termination_reason=orch.termination_reason.value,
+            reward_info=None,
+            user_cost=user_cost,
+            agent_cost=agent_cost,
+            messages=messages,
+            seed=orch.seed,
+        )
+
+    def _emit_new_messages(self) -> None:
+        if self.on_message is None:
+            return
+        trajectory = self.orchestrator.trajectory
+        for message in trajectory[self._emitted:]:
+            self.on_message(message)
+        self._emitted = len(trajectory)
+
+    async def step(self) -> None:
+        orch = self.orchestrator
+        if orch.to_role == Role.AGENT:
+            # Await the remote call here, then let the orchestrator consume the
+            # staged reply so its own bookkeeping and error handling still apply.
+            await self.agent.prefetch_next_message(orch.message, orch.agent_state)
+            orch.step()
+        elif orch.to_role == Role.USER:
+            with self.timer.measure(USER_SIMULATOR):
+                await self._step_in_thread()
+        else:
+            with self.timer.measure(ENVIRONMENT):
+                orch.step()
+
+    async def _step_in_thread(self) -> None:
+        # "pending" -> "running" -> "done", or "abandoned" if cancelled before
+        # the thread picked it up, or "orphaned" if cancelled while running.
+        state = "pending"
+
+        def guarded_step() -> None:
+            nonlocal state
+            with _stats_lock:
+                if state == "abandoned" or self.cancelled:
+                    state = "abandoned"
+                    return
+                state = "running"
+            try:
+                self.orchestrator.step()
+            finally:
+                with _stats_lock:
+                    if state == "orphaned":
+                        simulation_stats.orphaned_threads -= 1
+                    state = "done"
+
+        loop = asyncio.get_running_loop()
+        # Like asyncio.to_thread, run the step in a copy of the current context.
+        context_step = functools.partial(contextvars.copy_context().run, guarded_step)
+        try:
+            await loop.run_in_executor(self.executor, context_step)
+        except asyncio.CancelledError:
+            self.cancel()
+            with _stats_lock:
+                if state == "pending":
+                    state = "abandoned"
+                elif state == "running":
+                    state = "orphaned"
+                    simulation_stats.orphaned_threads += 1
+            raise
+
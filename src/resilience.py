@@ -0,0 +1,133 @@
+"""
+Retry and circuit-breaker policy for requests to purple agents.
+
+`RetryPolicy` spaces retries with exponential backoff and full jitter, and
+`is_retryable` limits them to errors that can succeed on a second try
+(connection failures, 408/425/429/5xx). A `CircuitBreaker` per agent URL
+opens after consecutive transport failures or timeouts, so further requests
+fail immediately with `CircuitOpenError` until a single probe request,
+allowed after `reset_timeout` seconds, succeeds.
+"""
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import httpx
+from a2a.client.errors import A2AClientHTTPError, A2AClientTimeoutError
+
+from metrics import REGISTRY
+
+DEFAULT_BASE_DELAY = 0.25
+DEFAULT_MAX_DELAY = 8.0
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 30.0
+
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+CIRCUIT_STATE = REGISTRY.gauge(
+    "tau2_circuit_breaker_state",
+    "Circuit breaker state per purple agent URL (0 closed, 1 half-open, 2 open).",
+    ("url",),
+)
+CIRCUIT_REJECTIONS = REGISTRY.counter(
+    "tau2_circuit_breaker_rejections_total", "Requests failed fast by an open circuit breaker."
+)
+
+
+class CircuitOpenError(RuntimeError):
+    """The purple agent's circuit breaker is open; the request was not sent."""
+
+    def __init__(self, url: str, retry_in: float):
+        self.url = url
+        self.retry_in = retry_in
+        super().__init__(f"Circuit breaker for {url} is open; next probe in {retry_in:.1f}s")
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """True for errors where the same request may succeed when sent again."""
+    if isinstance(exc, A2AClientHTTPError):
+        return exc.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(exc, httpx.TransportError) and not isinstance(exc, httpx.TimeoutException)
+
+
+def is_unavailable(exc: BaseException) -> bool:
+    """True for errors that suggest the agent is down; these trip the breaker."""
+    return is_retryable(exc) or isinstance(exc, (A2AClientTimeoutError, httpx.TimeoutException))
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    base_delay: float = DEFAULT_BASE_DELAY
+    max_delay: float = DEFAULT_MAX_DELAY
+    multiplier: float = 2.0
+
+    def delay(self, attempt: int, rand: Callable[[float, float], float] = random.uniform) -> float:
+        """Seconds to wait before retry number `attempt` (0-based), with full jitter."""
+        cap = min(self.max_delay, self.base_delay * self.multiplier ** attempt)
+        return rand(0.0, cap)
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one agent URL."""
+
+    def __init__(
+        self,
+        url: str,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.url = url
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        CIRCUIT_STATE.set(STATE_VALUES[CLOSED], url=url)
+
+    def discard(self) -> None:
+        """Remove this breaker's state series; call when the breaker is dropped."""
+        CIRCUIT_STATE.remove(url=self.url)
+
+    def _set_state(self, state: str) -> None:
+        self.state = state
+        CIRCUIT_STATE.set(STATE_VALUES[state], url=self.url)
+
+    def before_request(self) -> None:
+        """Raise `CircuitOpenError` unless a request may be sent now."""
+        if self.state == OPEN:
+            elapsed = self._clock() - self._opened_at
+            if elapsed < self.reset_timeout:
+                CIRCUIT_REJECTIONS.inc()
+                raise CircuitOpenError(self.url, self.reset_timeout - elapsed)
+            self._set_state(HALF_OPEN)
+        if self.state == HALF_OPEN:
+            if self._probe_in_flight:
+                CIRCUIT_REJECTIONS.inc()
+                raise CircuitOpenError(self.url, 0.0)
+            self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        self._probe_in_flight = False
+        self.failures = 0
+        if self.state != CLOSED:
+            self._set_state(CLOSED)
+
+    def abandon(self) -> None:
+        """The request was cancelled before it finished; let another probe through."""
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self._probe_in_flight = False
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self._opened_at = self._clock()
+            self._set_state(OPEN)
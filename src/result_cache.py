@@ -0,0 +1,118 @@
+"""
+Content-addressed on-disk cache of per-task results.
+
+A result is stored under the SHA-256 of everything that determines it (the
+purple agent's fingerprint, domain, task id, seed, user simulator settings,
+max_steps and tau2 version), one JSON file per entry. The cache is bounded by
+total size and evicts least recently used entries; file mtimes record use,
+so the LRU order survives restarts.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+from metrics import REGISTRY
+
+logger = logging.getLogger("tau2_green_agent.result_cache")
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_caches: "weakref.WeakSet[ResultCache]" = weakref.WeakSet()
+
+CACHE_LOOKUPS = REGISTRY.counter(
+    "tau2_result_cache_lookups_total",
+    "On-disk cache lookups, by cache (result, user_turn) and outcome (hit, miss).",
+    ("cache", "outcome"),
+)
+REGISTRY.gauge(
+    "tau2_result_cache_bytes",
+    "Bytes held by on-disk caches.",
+    function=lambda: sum(cache.size_bytes for cache in list(_caches)),
+)
+
+
+def cache_key(**fields: Any) -> str:
+    """Stable hash of `fields`, independent of their order."""
+    return hashlib.sha256(json.dumps(fields, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class ResultCache:
+    """Size-bounded LRU cache of JSON results in `directory`; `name` labels its metrics."""
+
+    def __init__(self, directory: str | Path, max_bytes: int = DEFAULT_MAX_BYTES, name: str = "result"):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.name = name
+        self._lock = threading.Lock()
+        # key -> size in bytes, least recently used first
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._size = 0
+        self._load_index()
+        _caches.add(self)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _load_index(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        files = sorted(self.directory.glob("*/*.json"), key=lambda path: path.stat().st_mtime)
+        for path in files:
+            size = path.stat().st_size
+            self._entries[path.stem] = size
+            self._size += size
+        self._evict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        with self._lock:
+            if key not in self._entries:
+                CACHE_LOOKUPS.inc(cache=self.name, outcome="miss")
+                return None
+            path = self._path(key)
+            try:
+                data = json.loads(path.read_text())
+                os.utime(path)
+            except (OSError, ValueError):
+                logger.warning("Dropping unreadable result cache entry %s", key)
+                self._remove(key)
+                CACHE_LOOKUPS.inc(cache=self.name, outcome="miss")
+                return None
+            self._entries.move_to_end(key)
+            CACHE_LOOKUPS.inc(cache=self.name, outcome="hit")
+            return data
+
+    def put(self, key: str, value: dict[str, Any]) -> None:
+        payload = json.dumps(value).encode()
+        path = self._path(key)
+        with self._lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(payload)
+            os.replace(tmp, path)
+            self._size += len(payload) - self._entries.pop(key, 0)
+            self._entries[key] = len(payload)
+            self._evict()
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes and self._entries:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str) -> None:
+        self._size -= self._entries.pop(key, 0)
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
+
@@ -0,0 +1,239 @@
+"""
+Compact, append-only binary export of per-task results.
+
+`ResultsExport` appends one record per evaluation run and one per finished
+task to a single file, so thousands of runs can be archived without the
+nested, duplicated JSON of the result artifact. Numeric columns are stored
+at fixed offsets, so `scan` reads rows straight out of a memory map and
+`aggregate` summarizes many files without decoding anything it does not
+need.
+
+File layout: the magic `MAGIC`, then records of `kind` (1 byte) and payload
+length (uint32), followed by the payload (little-endian):
+
+- run record (`R`): run id (16 bytes), start time (float64), then
+  compact JSON with the domain, agent URL and config.
+- task record (`T`): run id (16 bytes), reward (float64), duration
+  (float32), turns, tool calls (uint32), passed, cached (uint8), one
+  float32 per phase in `PHASES` (NaN if absent), then the task id and the
+  failure reason as length-prefixed UTF-8.
+
+A record cut short by a crash ends the scan; everything before it is kept.
+Writes block on the file system, so async callers run them in a thread.
+"""
+import argparse
+import json
+import logging
+import math
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+from timings import A2A_FIRST_EVENT, A2A_REQUEST, AGENT_TURN, ENVIRONMENT, EVALUATION, USER_SIMULATOR
+
+logger = logging.getLogger("tau2_green_agent.results_export")
+
+MAGIC = b"T2RX\x01"
+RUN = b"R"
+TASK = b"T"
+PHASES = (AGENT_TURN, A2A_REQUEST, A2A_FIRST_EVENT, USER_SIMULATOR, ENVIRONMENT, EVALUATION)
+
+_HEADER = struct.Struct("<cI")
+_RUN = struct.Struct("<16sd")
+_TASK = struct.Struct(f"<16sdfIIBB{len(PHASES)}fHH")
+
+
+@dataclass
+class TaskRow:
+    run_id: str
+    task_id: str
+    passed: bool
+    reward: float
+    duration_sec: float
+    turns: int
+    tool_calls: int
+    failure_reason: Optional[str]
+    cached: bool
+    timings: dict[str, float]
+
+
+class ResultsExport:
+    """Appends evaluation runs and their task rows to `path`."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        if os.fstat(self._fd).st_size == 0:
+            os.write(self._fd, MAGIC)
+
+    def _append(self, kind: bytes, payload: bytes) -> None:
+        # One write per record; O_APPEND keeps records whole across processes.
+        with self._lock:
+            if self._fd is None:
+                # An evaluation still running at shutdown; its row is lost.
+                logger.warning("Results export %s is closed; dropping a %s record", self.path, kind.decode())
+                return
+            os.write(self._fd, _HEADER.pack(kind, len(payload)) + payload)
+
+    def add_run(self, run_id: str, domain: str, agent_url: str, config: dict[str, Any]) -> None:
+        meta = json.dumps({"domain": domain, "agent_url": agent_url, "config": config}, separators=(",", ":"))
+        self._append(RUN, _RUN.pack(bytes.fromhex(run_id), time.time()) + meta.encode())
+
+    def add_task(self, run_id: str, result) -> None:
+        """Append a `TaskResult` of run `run_id`."""
+        task_id = result.task_id.encode()
+        failure = (result.failure_reason or "").encode()
+        timings = [result.timings.get(phase, math.nan) for phase in PHASES]
+        fixed = _TASK.pack(
+            bytes.fromhex(run_id),
+            result.reward,
+            result.duration_sec,
+            result.turns,
+            result.tool_calls,
+            result.passed,
+            result.cached,
+            *timings,
+            len(task_id),
+            len(failure),
+        )
+        self._append(TASK, fixed + task_id + failure)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+
+def _records(buffer) -> Iterator[tuple[bytes, int, int]]:
+    """Yield `(kind, payload offset, payload length)` for every complete record."""
+    if buffer[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not a results export file")
+    offset = len(MAGIC)
+    end = len(buffer)
+    while offset + _HEADER.size <= end:
+        kind, length = _HEADER.unpack_from(buffer, offset)
+        start = offset + _HEADER.size
+        if start + length > end:
+            break
+        yield kind, start, length
+        offset = start + length
+
+
+def _open_map(path: str | Path) -> Optional[mmap.mmap]:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def scan(path: str | Path) -> Iterator[TaskRow]:
+    """Yield every task row in `path`, decoded one at a time from a memory map."""
+    buffer = _open_map(path)
+    if buffer is None:
+        return
+    with buffer:
+        for kind, start, _ in _records(buffer):
+            if kind != TASK:
+                continue
+            run_id, reward, duration, turns, tool_calls, passed, cached, *rest = _TASK.unpack_from(buffer, start)
+            timings, (task_len, failure_len) = rest[:len(PHASES)], rest[len(PHASES):]
+            text = start + _TASK.size
+            failure = buffer[text + task_len:text + task_len + failure_len].decode()
+            yield TaskRow(
+                run_id=run_id.hex(),
+                task_id=buffer[text:text + task_len].decode(),
+                passed=bool(passed),
+                reward=reward,
+                duration_sec=duration,
+                turns=turns,
+                tool_calls=tool_calls,
+                failure_reason=failure or None,
+                cached=bool(cached),
+                timings={phase: value for phase, value in zip(PHASES, timings) if not math.isnan(value)},
+            )
+
+
+def runs(path: str | Path) -> dict[str, dict[str, Any]]:
+    """Return `{run id: {started_at, domain, agent_url, config}}` for the runs in `path`."""
+    buffer = _open_map(path)
+    if buffer is None:
+        return {}
+    found = {}
+    with buffer:
+        for kind, start, length in _records(buffer):
+            if kind == RUN:
+                run_id, started_at = _RUN.unpack_from(buffer, start)
+                meta = json.loads(buffer[start + _RUN.size:start + length])
+                found[run_id.hex()] = {"started_at": started_at, **meta}
+    return found
+
+
+def aggregate(paths: Iterable[str | Path]) -> dict[str, Any]:
+    """
+    Summarize task rows across files, per run and overall.
+
+    Only the fixed-width columns are read, except for failure reasons; no
+    file is loaded into memory as a whole.
+    """
+    per_run: dict[str, dict[str, Any]] = {}
+    failures: Counter = Counter()
+    for path in paths:
+        buffer = _open_map(path)
+        if buffer is None:
+            continue
+        with buffer:
+            for kind, start, _ in _records(buffer):
+                if kind != TASK:
+                    continue
+                run_id, reward, duration, turns, tool_calls, passed, _, *rest = _TASK.unpack_from(buffer, start)
+                task_len, failure_len = rest[len(PHASES):]
+                stats = per_run.setdefault(
+                    run_id.hex(),
+                    {"tasks": 0, "passed": 0, "reward": 0.0, "duration_sec": 0.0, "turns": 0, "tool_calls": 0},
+                )
+                stats["tasks"] += 1
+                stats["passed"] += passed
+                stats["reward"] += reward
+                stats["duration_sec"] += duration
+                stats["turns"] += turns
+                stats["tool_calls"] += tool_calls
+                if failure_len:
+                    reason_start = start + _TASK.size + task_len
+                    failures[buffer[reason_start:reason_start + failure_len].decode()] += 1
+
+    for stats in per_run.values():
+        stats["pass_rate"] = stats["passed"] / stats["tasks"] * 100
+    tasks = sum(stats["tasks"] for stats in per_run.values())
+    passed = sum(stats["passed"] for stats in per_run.values())
+    return {
+        "runs": per_run,
+        "total": {
+            "runs": len(per_run),
+            "tasks": tasks,
+            "passed": passed,
+            "pass_rate": passed / tasks * 100 if tasks else 0.0,
+            "failure_reasons": dict(failures),
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Summarize results export files.")
+    parser.add_argument("paths", nargs="+", type=Path, help="export files written with --results-export")
+    args = parser.parse_args()
+    json.dump(aggregate(args.paths), sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
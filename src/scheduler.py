@@ -0,0 +1,222 @@
+"""
+Server-wide admission control for simulations.
+
+Every evaluation registers with a `SimulationScheduler` and asks it for a
+slot before each simulation. At most `max_simulations` simulations run at
+once across the server, and at most `max_concurrency` per evaluation. Free
+slots go to waiting evaluations in arrival order ("fifo"), or to the one
+holding the fewest slots relative to its weight ("fair").
+"""
+import asyncio
+import itertools
+import time
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Optional
+
+from metrics import REGISTRY
+
+FIFO = "fifo"
+FAIR = "fair"
+POLICIES = (FIFO, FAIR)
+
+DEFAULT_MAX_SIMULATIONS = 32
+DEFAULT_POLICY = FAIR
+# Smoothing factor for the running mean of simulation durations used in ETAs.
+DURATION_EMA_ALPHA = 0.2
+
+_schedulers: "weakref.WeakSet[SimulationScheduler]" = weakref.WeakSet()
+
+QUEUE_WAIT = REGISTRY.histogram(
+    "tau2_scheduler_queue_wait_seconds",
+    "Time from an evaluation's arrival until its first simulation starts.",
+)
+REGISTRY.gauge(
+    "tau2_scheduler_slots_in_use",
+    "Simulation slots currently granted by the scheduler.",
+    function=lambda: sum(scheduler.in_use for scheduler in list(_schedulers)),
+)
+REGISTRY.gauge(
+    "tau2_scheduler_queued_evaluations",
+    "Evaluations waiting for their first simulation slot.",
+    function=lambda: sum(scheduler.num_queued for scheduler in list(_schedulers)),
+)
+
+
+@dataclass(eq=False)
+class Admission:
+    """An evaluation's place in the scheduler."""
+
+    evaluation_id: str
+    num_tasks: int
+    max_concurrency: int
+    weight: float
+    seq: int
+    registered_at: float = field(default_factory=time.monotonic)
+    admitted_at: Optional[float] = None
+    running: int = 0
+    started: int = 0
+    waiters: deque = field(default_factory=deque)
+    admitted: asyncio.Event = field(default_factory=asyncio.Event)
+
+    @property
+    def unstarted(self) -> int:
+        return max(self.num_tasks - self.started, 0)
+
+    @property
+    def queue_wait_sec(self) -> Optional[float]:
+        if self.admitted_at is None:
+            return None
+        return self.admitted_at - self.registered_at
+
+
+class SimulationScheduler:
+    """Grants simulation slots to evaluations under a global budget."""
+
+    def __init__(self, max_simulations: int = DEFAULT_MAX_SIMULATIONS, policy: str = DEFAULT_POLICY):
+        if max_simulations < 1:
+            raise ValueError("max_simulations must be at least 1")
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown scheduling policy '{policy}'. Choose from {list(POLICIES)}.")
+        self.max_simulations = max_simulations
+        self.policy = policy
+        self.in_use = 0
+        self._admissions: dict[str, Admission] = {}
+        self._seq = itertools.count()
+        self._mean_duration: Optional[float] = None
+        _schedulers.add(self)
+
+    @property
+    def num_queued(self) -> int:
+        return sum(1 for admission in self._admissions.values() if admission.admitted_at is None)
+
+    def register(
+        self,
+        evaluation_id: str,
+        num_tasks: int,
+        max_concurrency: int,
+        weight: float = 1.0,
+    ) -> Admission:
+        if evaluation_id in self._admissions:
+            raise ValueError(f"Evaluation {evaluation_id} is already registered")
+        admission = Admission(
+            evaluation_id=evaluation_id,
+            num_tasks=num_tasks,
+            max_concurrency=max_concurrency,
+            weight=weight,
+            seq=next(self._seq),
+        )
+        self._admissions[evaluation_id] = admission
+        return admission
+
+    def unregister(self, admission: Admission) -> None:
+        self._admissions.pop(admission.evaluation_id, None)
+        self._dispatch()
+
+    async def acquire(self, admission: Admission) -> None:
+        """Wait until `admission` is granted a simulation slot."""
+        future = asyncio.get_running_loop().create_future()
+        admission.waiters.append(future)
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just before the cancellation landed; hand the slot back.
+                self.release(admission)
+            elif future in admission.waiters:
+                admission.waiters.remove(future)
+            raise
+
+    def release(self, admission: Admission, duration_sec: Optional[float] = None) -> None:
+        admission.running -= 1
+        self.in_use -= 1
+        if duration_sec is not None:
+            if self._mean_duration is None:
+                self._mean_duration = duration_sec
+            else:
+                self._mean_duration += DURATION_EMA_ALPHA * (duration_sec - self._mean_duration)
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, admission: Admission) -> AsyncIterator["SlotLease"]:
+        """Hold a slot for the block; the lease may hand it back earlier."""
+        await self.acquire(admission)
+        lease = SlotLease(self, admission)
+        try:
+            yield lease
+        finally:
+            lease.release()
+
+    def queue_status(self, admission: Admission) -> tuple[int, Optional[float]]:
+        """
+        Return the queue position (1-based, among evaluations not yet started)
+        and the estimated seconds until `admission` gets its first slot, or
+        None when no simulation has finished yet to estimate from.
+        """
+        queued = sorted(
+            (a for a in self._admissions.values() if a.admitted_at is None),
+            key=lambda a: a.seq,
+        )
+        position = queued.index(admission) + 1 if admission in queued else 0
+        if self.policy == FIFO:
+            # Everything registered earlier is served before this evaluation.
+            slots_ahead = sum(a.unstarted for a in self._admissions.values() if a.seq < admission.seq)
+        else:
+            # A queued evaluation holds no slots, so it is next in line after
+            # the queued evaluations that arrived before it.
+            slots_ahead = max(position - 1, 0)
+
+        free = self.max_simulations - self.in_use
+        if slots_ahead < free:
+            return position, 0.0
+        if self._mean_duration is None:
+            return position, None
+        releases_needed = slots_ahead - free + 1
+        return position, self._mean_duration * releases_needed / self.max_simulations
+
+    def _next(self) -> Optional[Admission]:
+        candidates = [
+            a for a in self._admissions.values() if a.waiters and a.running < a.max_concurrency
+        ]
+        if not candidates:
+            return None
+        if self.policy == FIFO:
+            return min(candidates, key=lambda a: a.seq)
+        # Fewest slots held per unit of weight, then fewest simulations served.
+        return min(candidates, key=lambda a: (a.running / a.weight, a.started / a.weight, a.seq))
+
+    def _dispatch(self) -> None:
+        while self.in_use < self.max_simulations:
+            admission = self._next()
+            if admission is None:
+                return
+            future = admission.waiters.popleft()
+            if future.done():
+                # The waiter was cancelled while queued.
+                continue
+            admission.running += 1
+            admission.started += 1
+            self.in_use += 1
+            if admission.admitted_at is None:
+                admission.admitted_at = time.monotonic()
+                admission.admitted.set()
+                QUEUE_WAIT.observe(admission.queue_wait_sec)
+            future.set_result(None)
+
+
+class SlotLease:
+    """A granted slot. `release` frees it at most once, e.g. before post-processing."""
+
+    def __init__(self, scheduler: SimulationScheduler, admission: Admission):
+        self._scheduler = scheduler
+        self._admission = admission
+        self._start = time.monotonic()
+        self.released = False
+
+    def release(self) -> None:
+        if not self.released:
+            self.released = True
+            self._scheduler.release(self._admission, time.monotonic() - self._start)
@@ -1,28 +1,47 @@
 import argparse
+import asyncio
+import contextlib
+import logging
+from typing import Optional
+
+# First, so that the startup clock covers the imports below.
+from startup import STARTUP
+
 import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
 
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import InMemoryTaskStore
+from a2a.server.tasks import InMemoryTaskStore, TaskStore
 from a2a.types import (
     AgentCapabilities,
     AgentCard,
     AgentSkill,
 )
 
-from executor import Executor
+from evaluation_pool import EvaluationPool
+from executor import DEFAULT_AGENT_TTL_SECONDS, DEFAULT_MAX_AGENTS, Executor
+from metrics import REGISTRY
+from result_cache import DEFAULT_MAX_BYTES, ResultCache
+from results_export import ResultsExport
+from scheduler import DEFAULT_MAX_SIMULATIONS, DEFAULT_POLICY, POLICIES
+from task_store import CheckpointStore, SQLiteTaskStore
+from trajectories import TrajectoryStore
 
+logger = logging.getLogger("tau2_green_agent.server")
 
-def main():
-    parser = argparse.ArgumentParser(description="Run the A2A agent.")
-    parser.add_argument("--host", type=str, default="127.0.0.1", help="Host to bind the server")
-    parser.add_argument("--port", type=int, default=9009, help="Port to bind the server")
-    parser.add_argument("--card-url", type=str, help="URL to advertise in the agent card")
-    args = parser.parse_args()
 
+async def metrics_endpoint(request: Request) -> PlainTextResponse:
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+def create_agent_card(url: str) -> AgentCard:
     # Fill in your agent card
     # See: https://a2a-protocol.org/latest/tutorials/python/3-agent-skills-and-card/
-    
+
     skill = AgentSkill(
         id="tau2_evaluation",
         name="Tau2 Benchmark Evaluation",
@@ -33,10 +52,10 @@ def main():
         ]
     )
 
-    agent_card = AgentCard(
+    return AgentCard(
         name="Tau2GreenAgent",
         description="Tau2 benchmark evaluator - tests agents on customer service tasks",
-        url=args.card_url or f"http://{args.host}:{args.port}/",
+        url=url,
         version='1.0.0',
         default_input_modes=['text'],
         default_output_modes=['text'],
@@ -44,15 +63,164 @@ def main():
         skills=[skill]
     )
 
+
+async def _warm_up(executor: Executor) -> None:
+    try:
+        await executor.warm_up()
+    except Exception:
+        logger.exception("Warm-up failed; tau2 will be imported by the first evaluation")
+        return
+    STARTUP.mark("warm_up")
+
+
+def create_app(
+    card_url: str,
+    executor: Optional[Executor] = None,
+    task_store: Optional[TaskStore] = None,
+    warm_up: bool = True,
+) -> Starlette:
+    """
+    Build the green agent's A2A Starlette app.
+
+    The app serves its agent card before tau2 is imported; with `warm_up`,
+    tau2 and litellm are imported in the background once the server starts.
+    """
+    executor = executor or Executor()
+    task_store = task_store or InMemoryTaskStore()
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app: Starlette):
+        STARTUP.mark("serving")
+        logger.info("Startup timings (seconds since process start): %s", STARTUP.report())
+        warm_up_task = asyncio.create_task(_warm_up(executor)) if warm_up else None
+        sweeper = asyncio.create_task(executor.agents.sweep())
+        yield
+        if warm_up_task is not None:
+            warm_up_task.cancel()
+        sweeper.cancel()
+        await executor.aclose()
+        if isinstance(task_store, SQLiteTaskStore):
+            task_store.close()
+
     request_handler = DefaultRequestHandler(
-        agent_executor=Executor(),
-        task_store=InMemoryTaskStore(),
+        agent_executor=executor,
+        task_store=task_store,
     )
     server = A2AStarletteApplication(
-        agent_card=agent_card,
+        agent_card=create_agent_card(card_url),
         http_handler=request_handler,
     )
-    uvicorn.run(server.build(), host=args.host, port=args.port)
+    return server.build(
+        routes=[Route("/metrics", metrics_endpoint, methods=["GET"])],
+        lifespan=lifespan,
+    )
+
+
+def main():
+    # Configure logging here: agent.py, which used to do it, is imported lazily.
+    logging.basicConfig(level=logging.INFO)
+    STARTUP.mark("imports")
+    parser = argparse.ArgumentParser(description="Run the A2A agent.")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Host to bind the server")
+    parser.add_argument("--port", type=int, default=9009, help="Port to bind the server")
+    parser.add_argument("--card-url", type=str, help="URL to advertise in the agent card")
+    parser.add_argument("--max-agents", type=int, default=DEFAULT_MAX_AGENTS, help="Max idle agents kept per replica")
+    parser.add_argument(
+        "--agent-ttl",
+        type=float,
+        default=DEFAULT_AGENT_TTL_SECONDS,
+        help="Seconds an idle agent is kept before eviction",
+    )
+    parser.add_argument(
+        "--max-simulations",
+        type=int,
+        default=DEFAULT_MAX_SIMULATIONS,
+        help="Max simulations running at once across all evaluations",
+    )
+    parser.add_argument(
+        "--scheduling",
+        choices=POLICIES,
+        default=DEFAULT_POLICY,
+        help="How free simulation slots are shared between evaluations",
+    )
+    parser.add_argument(
+        "--state-db",
+        type=str,
+        help="SQLite file for tasks and per-task checkpoints (default: in memory, lost on restart)",
+    )
+    parser.add_argument(
+        "--result-cache-dir",
+        type=str,
+        help="Directory for cached task results (enables the cache_results config option)",
+    )
+    parser.add_argument(
+        "--result-cache-max-mb",
+        type=float,
+        default=DEFAULT_MAX_BYTES / (1024 * 1024),
+        help="Size limit of the result cache; least recently used entries are evicted",
+    )
+    parser.add_argument(
+        "--user-llm-cache-dir",
+        type=str,
+        help="Directory for recorded user simulator turns (enables the user_llm_cache config option)",
+    )
+    parser.add_argument(
+        "--eval-workers",
+        type=int,
+        default=0,
+        help="Processes for evaluate_simulation (default: 0, evaluate in a thread of the server process)",
+    )
+    parser.add_argument(
+        "--eval-warm-domains",
+        nargs="*",
+        default=[],
+        help="Domains whose data each evaluation worker loads at startup",
+    )
+    parser.add_argument(
+        "--results-export",
+        type=str,
+        help="Binary file to which every run and task result is appended (read with results_export.py)",
+    )
+    parser.add_argument(
+        "--trajectory-dir",
+        type=str,
+        help="Directory to which every simulation's messages are streamed as gzip JSONL, with an index",
+    )
+    parser.add_argument(
+        "--no-warm-up",
+        action="store_true",
+        help="Import tau2 on the first evaluation instead of in the background at startup",
+    )
+    args = parser.parse_args()
+
+    task_store = SQLiteTaskStore(args.state_db) if args.state_db else None
+    checkpoints = CheckpointStore(args.state_db) if args.state_db else None
+    result_cache = None
+    if args.result_cache_dir:
+        result_cache = ResultCache(args.result_cache_dir, max_bytes=int(args.result_cache_max_mb * 1024 * 1024))
+    user_turn_cache = ResultCache(args.user_llm_cache_dir, name="user_turn") if args.user_llm_cache_dir else None
+    evaluation_pool = EvaluationPool(workers=args.eval_workers, domains=args.eval_warm_domains)
+    evaluation_pool.start()
+    executor = Executor(
+        max_agents=args.max_agents,
+        agent_ttl_seconds=args.agent_ttl,
+        max_simulations=args.max_simulations,
+        scheduling_policy=args.scheduling,
+        checkpoints=checkpoints,
+        result_cache=result_cache,
+        user_turn_cache=user_turn_cache,
+        evaluation_pool=evaluation_pool,
+        results_export=ResultsExport(args.results_export) if args.results_export else None,
+        trajectory_store=TrajectoryStore(args.trajectory_dir) if args.trajectory_dir else None,
+    )
+    app = create_app(
+        args.card_url or f"http://{args.host}:{args.port}/",
+        executor=executor,
+        task_store=task_store,
+        warm_up=not args.no_warm_up,
+    )
+    STARTUP.mark("app_built")
+    uvicorn.run(app, host=args.host, port=args.port)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,41 @@
+"""
+Startup-phase timing report.
+
+`STARTUP` starts its clock when this module is imported, which `server.py`
+does before anything else. Each `mark` records the seconds since then at
+which a startup phase finished ("imports", "app_built", "serving",
+"warm_up"). The marks are logged, and exported as the
+`tau2_startup_seconds{phase}` gauge.
+"""
+import logging
+import time
+from typing import Any
+
+from metrics import REGISTRY
+
+logger = logging.getLogger("tau2_green_agent.startup")
+
+STARTUP_SECONDS = REGISTRY.gauge(
+    "tau2_startup_seconds",
+    "Seconds from process start until each startup phase finished.",
+    ("phase",),
+)
+
+
+class StartupTimer:
+    def __init__(self):
+        self._start = time.perf_counter()
+        self.phases: dict[str, float] = {}
+
+    def mark(self, phase: str) -> float:
+        elapsed = time.perf_counter() - self._start
+        self.phases[phase] = elapsed
+        STARTUP_SECONDS.set(elapsed, phase=phase)
+        logger.info("Startup: %s after %.3fs", phase, elapsed)
+        return elapsed
+
+    def report(self) -> dict[str, Any]:
+        return dict(self.phases)
+
+
+STARTUP = StartupTimer()
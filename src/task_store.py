@@ -0,0 +1,112 @@
+"""
+SQLite-backed persistence for A2A tasks and evaluation checkpoints.
+
+`SQLiteTaskStore` is a drop-in replacement for a2a's `InMemoryTaskStore`.
+`CheckpointStore` records every finished task of an evaluation so that a
+request resubmitted after a restart only runs the tasks that are missing.
+Both use WAL mode, so readers never block the writer, and may share one
+database file.
+"""
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from a2a.server.context import ServerCallContext
+from a2a.server.tasks import TaskStore
+from a2a.types import Task
+
+
+def _connect(path: str | Path) -> sqlite3.Connection:
+    if str(path) != ":memory:":
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    return conn
+
+
+class _SQLiteStore:
+    """One connection guarded by a lock; queries run in a worker thread."""
+
+    schema = ""
+
+    def __init__(self, path: str | Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = _connect(path)
+        self._conn.executescript(self.schema)
+
+    def _execute(self, sql: str, params: tuple = ()) -> list[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    async def _run(self, sql: str, params: tuple = ()) -> list[tuple]:
+        return await asyncio.to_thread(self._execute, sql, params)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class SQLiteTaskStore(_SQLiteStore, TaskStore):
+    """A2A `TaskStore` that keeps tasks in a SQLite database."""
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            task_id TEXT PRIMARY KEY,
+            context_id TEXT NOT NULL,
+            data TEXT NOT NULL,
+            updated_at REAL NOT NULL
+        );
+    """
+
+    async def save(self, task: Task, context: ServerCallContext | None = None) -> None:
+        await self._run(
+            "INSERT OR REPLACE INTO tasks (task_id, context_id, data, updated_at) VALUES (?, ?, ?, ?)",
+            (task.id, task.context_id, task.model_dump_json(), time.time()),
+        )
+
+    async def get(self, task_id: str, context: ServerCallContext | None = None) -> Task | None:
+        rows = await self._run("SELECT data FROM tasks WHERE task_id = ?", (task_id,))
+        return Task.model_validate_json(rows[0][0]) if rows else None
+
+    async def delete(self, task_id: str, context: ServerCallContext | None = None) -> None:
+        await self._run("DELETE FROM tasks WHERE task_id = ?", (task_id,))
+
+
+class CheckpointStore(_SQLiteStore):
+    """Finished task results per evaluation, keyed by a hash of its request."""
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS checkpoints (
+            evaluation_key TEXT NOT NULL,
+            task_index INTEGER NOT NULL,
+            task_id TEXT NOT NULL,
+            result TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            PRIMARY KEY (evaluation_key, task_index)
+        );
+    """
+
+    async def save(self, evaluation_key: str, index: int, task_id: str, result: dict[str, Any]) -> None:
+        await self._run(
+            "INSERT OR REPLACE INTO checkpoints (evaluation_key, task_index, task_id, result, created_at)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (evaluation_key, index, task_id, json.dumps(result), time.time()),
+        )
+
+    async def load(self, evaluation_key: str) -> dict[int, dict[str, Any]]:
+        """Return `{task index: result dict}` for every checkpointed task."""
+        rows = await self._run(
+            "SELECT task_index, result FROM checkpoints WHERE evaluation_key = ?",
+            (evaluation_key,),
+        )
+        return {index: json.loads(result) for index, result in rows}
+
+    async def clear(self, evaluation_key: str) -> None:
+        await self._run("DELETE FROM checkpoints WHERE evaluation_key = ?", (evaluation_key,))
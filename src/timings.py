@@ -0,0 +1,77 @@
+"""
+Per-phase latency accounting for evaluations.
+
+A `PhaseTimer` collects the durations of one task's phases (purple-agent
+turns, A2A requests and their time to first event, user-simulator turns,
+environment steps, evaluation).
+`EvalTimings` merges the timers of every task in an evaluation and reports
+p50/p95/p99 per phase.
+"""
+import math
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+AGENT_TURN = "agent_turn"
+A2A_REQUEST = "a2a_request"
+A2A_FIRST_EVENT = "a2a_first_event"
+USER_SIMULATOR = "user_simulator"
+ENVIRONMENT = "environment"
+EVALUATION = "evaluation"
+
+
+def percentile(values: list[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of `values` (None if empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(values: list[float]) -> dict[str, Any]:
+    return {
+        "count": len(values),
+        "total_sec": sum(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values, default=None),
+    }
+
+
+class PhaseTimer:
+    """Durations of each phase of a single task."""
+
+    def __init__(self):
+        self.samples: dict[str, list[float]] = defaultdict(list)
+
+    def record(self, phase: str, seconds: float) -> None:
+        self.samples[phase].append(seconds)
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - start)
+
+    def totals(self) -> dict[str, float]:
+        """Total seconds spent per phase."""
+        return {phase: sum(values) for phase, values in self.samples.items()}
+
+
+class EvalTimings:
+    """Per-phase samples across all tasks of an evaluation."""
+
+    def __init__(self):
+        self.samples: dict[str, list[float]] = defaultdict(list)
+
+    def add(self, timer: PhaseTimer) -> None:
+        for phase, values in timer.samples.items():
+            self.samples[phase].extend(values)
+
+    def to_dict(self) -> dict[str, dict[str, Any]]:
+        return {phase: summarize(values) for phase, values in sorted(self.samples.items())}
@@ -0,0 +1,158 @@
+"""
+Streaming, compressed storage of simulation trajectories.
+
+A `TrajectoryWriter` writes each message of a simulation to a gzip-compressed
+JSONL file as soon as the step that produced it finishes, so only the
+compressor's buffer is held in memory however long the conversation gets.
+When a task's file is closed, one line is appended to `index.jsonl` in the
+store directory; `TrajectoryStore.load` uses it to find any task's
+conversation by task id (and, optionally, run id) without scanning the
+trajectory files. The store reads each index line once, when a lookup first
+needs it, and keeps the latest entry per task in memory.
+
+Layout: `<directory>/<run id>/<task id>-<hash>.jsonl.gz` plus
+`<directory>/index.jsonl`. The task id is made file-name safe, and the short
+hash of the raw id keeps ids such as `a/b` and `a_b` apart.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+logger = logging.getLogger("tau2_green_agent.trajectories")
+
+INDEX_FILE = "index.jsonl"
+
+
+def _file_name(task_id: str) -> str:
+    safe = re.sub(r"[^A-Za-z0-9._-]", "_", task_id)
+    digest = hashlib.sha256(task_id.encode()).hexdigest()[:8]
+    return f"{safe}-{digest}.jsonl.gz"
+
+
+def _message_json(message) -> str:
+    if hasattr(message, "model_dump_json"):
+        return message.model_dump_json(exclude_none=True)
+    return json.dumps(message, default=str)
+
+
+class TrajectoryWriter:
+    """Appends one task's messages to its compressed JSONL file."""
+
+    def __init__(self, store: "TrajectoryStore", run_id: str, task_id: str, path: Path):
+        self.store = store
+        self.run_id = run_id
+        self.task_id = task_id
+        self.path = path
+        self.messages = 0
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+
+    def write(self, message) -> None:
+        self._file.write(_message_json(message) + "\n")
+        self.messages += 1
+
+    def close(self, complete: bool = True) -> None:
+        """Finish the file and index it; `complete` is False for an interrupted simulation."""
+        if self._file.closed:
+            return
+        self._file.close()
+        self.store._writers.discard(self)
+        self.store._add_to_index({
+            "run_id": self.run_id,
+            "task_id": self.task_id,
+            "path": str(self.path.relative_to(self.store.directory)),
+            "messages": self.messages,
+            "bytes": self.path.stat().st_size,
+            "complete": complete,
+            "created_at": time.time(),
+        })
+
+
+class TrajectoryStore:
+    """Directory of per-task trajectory files and their index."""
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._index_path = self.directory / INDEX_FILE
+        self._lock = threading.Lock()
+        self._writers: set[TrajectoryWriter] = set()
+        # Latest index entry per task id and per (run id, task id), for the
+        # index lines up to `_index_offset`.
+        self._latest: dict[str, dict[str, Any]] = {}
+        self._latest_in_run: dict[tuple[str, str], dict[str, Any]] = {}
+        self._index_offset = 0
+
+    def open(self, run_id: str, task_id: str) -> TrajectoryWriter:
+        run_dir = self.directory / run_id
+        run_dir.mkdir(exist_ok=True)
+        writer = TrajectoryWriter(self, run_id, task_id, run_dir / _file_name(task_id))
+        self._writers.add(writer)
+        return writer
+
+    def close(self) -> None:
+        """Close the files of simulations still being written, indexed as incomplete."""
+        for writer in list(self._writers):
+            writer.close(complete=False)
+
+    def _add_to_index(self, entry: dict[str, Any]) -> None:
+        line = (json.dumps(entry, separators=(",", ":")) + "\n").encode()
+        with self._lock:
+            fd = os.open(self._index_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+
+    def index(self) -> Iterator[dict[str, Any]]:
+        """Yield index entries, oldest first."""
+        if not self._index_path.exists():
+            return
+        with open(self._index_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    logger.warning("Skipping malformed trajectory index line")
+
+    def _read_new_index_lines(self) -> None:
+        # Other processes may append to the index too, so pick up whatever
+        # was written since the last lookup; a partly written line is left
+        # for the next one.
+        if not self._index_path.exists():
+            return
+        with open(self._index_path, "rb") as f:
+            f.seek(self._index_offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                logger.warning("Skipping malformed trajectory index line")
+                continue
+            self._latest[entry["task_id"]] = entry
+            self._latest_in_run[(entry["run_id"], entry["task_id"])] = entry
+        self._index_offset += end
+
+    def find(self, task_id: str, run_id: Optional[str] = None) -> Optional[dict[str, Any]]:
+        """Return the latest index entry for `task_id` (in `run_id`, if given)."""
+        with self._lock:
+            self._read_new_index_lines()
+            if run_id is None:
+                return self._latest.get(task_id)
+            return self._latest_in_run.get((run_id, task_id))
+
+    def load(self, task_id: str, run_id: Optional[str] = None) -> Optional[list[dict[str, Any]]]:
+        """Return the messages of `task_id`'s latest trajectory, or None if there is none."""
+        entry = self.find(task_id, run_id)
+        if entry is None:
+            return None
+        with gzip.open(self.directory / entry["path"], "rt", encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
@@ -0,0 +1,91 @@
+"""
+Record/replay of user simulator turns.
+
+`CachingUserSimulator` looks up each user turn by a hash of the user LLM,
+its arguments, the task instructions, the user tools and the conversation
+so far. In "record" mode a miss calls the LLM as usual and stores the turn;
+in "replay" mode a miss fails the task instead, so runs never reach the LLM
+and work offline. Message ids and timestamps are left out of the key, so a
+deterministic rerun hits the cache turn by turn.
+"""
+from typing import Any, Optional
+
+from tau2.data_model.message import MultiToolMessage, UserMessage
+from tau2.user.user_simulator import UserSimulator
+
+from result_cache import ResultCache, cache_key
+
+OFF = "off"
+RECORD = "record"
+REPLAY = "replay"
+MODES = (OFF, RECORD, REPLAY)
+
+
+class UserTurnReplayMiss(RuntimeError):
+    """A user turn was not recorded and replay mode may not call the LLM."""
+
+
+def _message_fields(message) -> list[dict[str, Any]]:
+    if message is None:
+        return []
+    if isinstance(message, MultiToolMessage):
+        return [fields for tool_message in message.tool_messages for fields in _message_fields(tool_message)]
+    tool_calls = getattr(message, "tool_calls", None) or []
+    return [
+        {
+            "role": str(message.role),
+            "content": message.content,
+            "tool_calls": [{"name": call.name, "arguments": call.arguments} for call in tool_calls],
+        }
+    ]
+
+
+class CachingUserSimulator(UserSimulator):
+    """`UserSimulator` whose turns are recorded to, and replayed from, `store`."""
+
+    def __init__(
+        self,
+        store: ResultCache,
+        mode: str = RECORD,
+        tools: Optional[list] = None,
+        instructions: Optional[str] = None,
+        llm: Optional[str] = None,
+        llm_args: Optional[dict] = None,
+    ):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown user turn cache mode '{mode}'")
+        super().__init__(tools=tools, instructions=instructions, llm=llm, llm_args=llm_args)
+        self.store = store
+        self.mode = mode
+        self._instructions = instructions
+        self._tool_names = sorted(tool.name for tool in tools or [])
+        self._llm = llm
+        self._llm_args = llm_args or {}
+
+    def turn_key(self, history: list, message) -> str:
+        return cache_key(
+            llm=getattr(self, "llm", self._llm),
+            llm_args=getattr(self, "llm_args", self._llm_args),
+            instructions=self._instructions,
+            tools=self._tool_names,
+            history=[fields for msg in history for fields in _message_fields(msg)],
+            message=_message_fields(message),
+        )
+
+    def generate_next_message(self, message, state):
+        key = self.turn_key(state.messages, message)
+        recorded = self.store.get(key)
+        if recorded is not None:
+            if isinstance(message, MultiToolMessage):
+                state.messages.extend(message.tool_messages)
+            elif message is not None:
+                state.messages.append(message)
+            user_message = UserMessage.model_validate(recorded)
+            state.messages.append(user_message)
+            return user_message, state
+
+        if self.mode == REPLAY:
+            raise UserTurnReplayMiss(f"No recorded user turn for key {key[:12]} (replay mode)")
+        user_message, state = super().generate_next_message(message, state)
+        self.store.put(key, user_message.model_dump(mode="json", include={"role", "content", "tool_calls"}))
+        return user_message, state
@@ -250,3 +250,11 @@ def test_rejects_missing_participants_http(agent):
     blob = json.dumps(body)
     assert "Traceback" not in blob
     assert "Missing roles" in blob
+
+
+def test_metrics_endpoint(agent):
+    r = httpx.get(f"{agent}/metrics", timeout=10)
+
+    assert r.status_code == 200
+    assert "# TYPE tau2_evaluations_in_flight gauge" in r.text
+    assert "# TYPE tau2_tasks_completed_total counter" in r.text
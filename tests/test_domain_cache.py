@@ -0,0 +1,58 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from domain_cache import DomainCache  # noqa: E402
+
+
+def test_tasks_are_loaded_once_per_domain(monkeypatch):
+    calls = []
+
+    def fake_get_tasks(task_set_name, task_split_name):
+        calls.append((task_set_name, task_split_name))
+        return [SimpleNamespace(id=f"{task_set_name}-{i}") for i in range(3)]
+
+    monkeypatch.setattr("domain_cache.get_tasks", fake_get_tasks)
+    cache = DomainCache()
+
+    assert [t.id for t in cache.get_tasks("mock")] == ["mock-0", "mock-1", "mock-2"]
+    assert [t.id for t in cache.get_tasks("mock", task_ids=["mock-2", "mock-0"])] == ["mock-0", "mock-2"]
+    with pytest.raises(ValueError):
+        cache.get_tasks("mock", task_ids=["missing"])
+
+    assert calls == [("mock", "base")]
+    stats = cache.snapshot()
+    assert stats["task_misses"] == 1
+    assert stats["task_hits"] == 2
+
+    cache.invalidate("mock")
+    cache.get_tasks("mock")
+    assert len(calls) == 2
+
+
+def test_environments_are_cloned_from_pristine_copy(monkeypatch):
+    constructed = []
+
+    def env_constructor(solo_mode=False):
+        env = SimpleNamespace(db={"users": []})
+        constructed.append(env)
+        return env
+
+    monkeypatch.setattr("domain_cache.registry.get_env_constructor", lambda domain: env_constructor)
+    cache = DomainCache()
+
+    first = cache.new_environment("mock")
+    first.db["users"].append("alice")
+    second = cache.new_environment("mock")
+
+    assert len(constructed) == 1
+    assert second.db == {"users": []}
+    assert first is not second
+    stats = cache.snapshot()
+    assert stats["env_misses"] == 1
+    assert stats["env_hits"] == 1
+    assert stats["clones"] == 2
@@ -0,0 +1,30 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from early_stop import EarlyStop, wilson_interval  # noqa: E402
+
+
+def test_wilson_interval_matches_reference_values():
+    low, high = wilson_interval(8, 10, confidence=0.95)
+    assert low == pytest.approx(0.4902, abs=1e-4)
+    assert high == pytest.approx(0.9433, abs=1e-4)
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+
+
+def test_decision_waits_for_min_tasks_and_settles_once():
+    rule = EarlyStop(threshold=0.5, min_tasks=3)
+    assert [rule.add(False) for _ in range(3)] == [None, None, None]
+    # 0/3 still admits a 56% pass rate; 0/4 does not.
+    assert rule.add(False) == "fail"
+    assert rule.add(True) == "fail"
+
+
+def test_clearly_passing_agent_is_settled_as_pass():
+    rule = EarlyStop(threshold=0.3, min_tasks=5)
+    decisions = [rule.add(True) for _ in range(6)]
+    assert decisions[-1] == "pass"
+    assert rule.to_dict()["ci_low"] >= 0.3
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import sys
 from pathlib import Path
@@ -9,7 +10,30 @@ from a2a.types import Message, Part, Role, TextPart, DataPart
 
 sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
 
-from agent import Agent, EvalConfig, TaskRunData  # noqa: E402
+from agent import (  # noqa: E402
+    MAX_STREAMED_ERROR_CHARS,
+    Agent,
+    EvalConfig,
+    RemoteA2AAgent,
+    RemoteAgentError,
+    TaskRunData,
+    render_agent_prompt,
+)
+from resilience import CircuitOpenError  # noqa: E402
+from result_cache import ResultCache  # noqa: E402
+from results_export import ResultsExport, runs, scan  # noqa: E402
+from scheduler import SimulationScheduler  # noqa: E402
+from task_store import CheckpointStore  # noqa: E402
+from domain_cache import domain_cache  # noqa: E402
+
+from tau2.data_model.message import MultiToolMessage, ToolMessage, UserMessage  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def fresh_domain_cache():
+    domain_cache.invalidate()
+    yield
+    domain_cache.invalidate()
 
 
 class FakeUpdater:
@@ -24,8 +48,8 @@ class FakeUpdater:
     async def update_status(self, state, message):
         self.status_updates.append((state, message))
 
-    async def add_artifact(self, parts, name):
-        self.artifacts.append({"name": name, "parts": parts})
+    async def add_artifact(self, parts, name, **kwargs):
+        self.artifacts.append({"name": name, "parts": parts, **kwargs})
 
 
 def _make_message(payload: dict) -> Message:
@@ -38,6 +62,44 @@ def _make_message(payload: dict) -> Message:
     )
 
 
+def task_run_data(reward: float = 1.0, **fields) -> TaskRunData:
+    """The outcome of a stub simulation; `fields` override the defaults."""
+    return TaskRunData(**{
+        "reward": reward,
+        "duration_sec": 0.1,
+        "turns": 3,
+        "tool_calls": 1,
+        "termination_reason": None,
+        "tool_error": False,
+        **fields,
+    })
+
+
+def fake_runner(reward: float = 1.0):
+    """A stand-in for `Agent._run_single_task` whose every task ends with `reward`."""
+
+    async def run_single_task(task, **_kwargs):
+        return task_run_data(reward)
+
+    return run_single_task
+
+
+@pytest.fixture
+def tasks(monkeypatch):
+    """`tasks(n)` makes the domain cache hold tasks task-0 to task-<n-1>; it returns the list of loads."""
+    loads = []
+
+    def install(n: int) -> list:
+        def get_tasks(task_set_name, task_split_name):
+            loads.append(task_set_name)
+            return [SimpleNamespace(id=f"task-{i}") for i in range(n)]
+
+        monkeypatch.setattr("domain_cache.get_tasks", get_tasks)
+        return loads
+
+    return install
+
+
 def test_eval_config_defaults():
     config = EvalConfig.model_validate({})
     assert config.domain == "mock"
@@ -46,6 +108,7 @@ def test_eval_config_defaults():
     assert config.timeout_seconds == 300
     assert config.max_steps == 50
     assert config.retries == 2
+    assert config.max_concurrency == 1
 
 
 def test_eval_config_invalid_domain():
@@ -54,26 +117,11 @@ def test_eval_config_invalid_domain():
 
 
 @pytest.mark.asyncio
-async def test_eval_request_artifact_schema(monkeypatch):
+async def test_eval_request_artifact_schema(monkeypatch, tasks):
     agent = Agent()
     updater = FakeUpdater()
-
-    monkeypatch.setattr(
-        "agent.get_tasks",
-        lambda task_set_name, task_split_name, task_ids=None: [SimpleNamespace(id="task-1")],
-    )
-
-    async def fake_run_single_task(**_kwargs):
-        return TaskRunData(
-            reward=1.0,
-            duration_sec=0.1,
-            turns=3,
-            tool_calls=1,
-            termination_reason=None,
-            tool_error=False,
-        )
-
-    monkeypatch.setattr(agent, "_run_single_task", fake_run_single_task)
+    tasks(1)
+    monkeypatch.setattr(agent, "_run_single_task", fake_runner())
 
     request_payload = {
         "participants": {"agent": "http://localhost:9019"},
@@ -103,5 +151,479 @@ async def test_eval_request_artifact_schema(monkeypatch):
     assert "task_rewards" in result
 
     assert result["config"]["domain"] == "mock"
-    assert result["tasks"][0]["task_id"] == "task-1"
+    assert result["tasks"][0]["task_id"] == "task-0"
     assert result["tasks"][0]["failure_reason"] is None
+    assert "timings" in result
+    assert "timings" in result["tasks"][0]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_tasks_keep_task_order(monkeypatch, tasks):
+    agent = Agent()
+    updater = FakeUpdater()
+    tasks(4)
+
+    running = 0
+    peak = 0
+
+    async def fake_run_single_task(task, **_kwargs):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        # Earlier tasks finish last so completion order differs from task order.
+        await asyncio.sleep(0.05 * (4 - int(task.id.split("-")[1])))
+        running -= 1
+        return task_run_data()
+
+    monkeypatch.setattr(agent, "_run_single_task", fake_run_single_task)
+
+    request_payload = {
+        "participants": {"agent": "http://localhost:9019"},
+        "config": {"domain": "mock", "num_tasks": 4, "max_concurrency": 2},
+    }
+
+    await agent.run(_make_message(request_payload), updater)
+
+    result = updater.artifacts[0]["parts"][1].root.data
+    assert [t["task_id"] for t in result["tasks"]] == [f"task-{i}" for i in range(4)]
+    assert result["config"]["max_concurrency"] == 2
+    assert peak == 2
+
+
+def test_agent_prompt_is_rendered_once_per_tool_set():
+    schema_reads = 0
+
+    class FakeTool:
+        def __init__(self, name):
+            self.name = name
+
+        @property
+        def openai_schema(self):
+            nonlocal schema_reads
+            schema_reads += 1
+            return {"type": "function", "function": {"name": self.name}}
+
+    tools = [FakeTool("get_user"), FakeTool("update_user")]
+    first = render_agent_prompt("cache-test policy", tools)
+    second = render_agent_prompt("cache-test policy", tools)
+    compact = render_agent_prompt("cache-test policy", tools, compact=True)
+
+    assert first is second
+    assert schema_reads == 4
+    assert '"name": "get_user"' in first
+    assert '"name":"get_user"' in compact
+    assert len(compact) < len(first)
+
+
+@pytest.mark.asyncio
+async def test_delta_protocol_sends_policy_once_and_structured_tool_results():
+    class FakeTool:
+        name = "get_user"
+        openai_schema = {"type": "function", "function": {"name": "get_user"}}
+
+    class FakeSession:
+        def __init__(self):
+            self.sent = []
+            self.replies = [
+                {"response": "", "data": [{"name": "get_user", "arguments": {"id": "u1"}}]},
+                {"response": '{"name": "respond", "arguments": {"content": "Found you."}}', "data": []},
+            ]
+
+        async def exchange(self, message, **_kwargs):
+            self.sent.append(message)
+            return self.replies.pop(0)
+
+    session = FakeSession()
+    agent = RemoteA2AAgent(
+        tools=[FakeTool()],
+        domain_policy="delta policy",
+        session=session,
+        timeout_seconds=10,
+        retries=0,
+        message_protocol="delta",
+    )
+    state = agent.get_init_state()
+
+    reply, state = await agent.agenerate_next_message(UserMessage(role="user", content="Hi"), state)
+    call_id = reply.tool_calls[0].id
+    tool_result = ToolMessage(role="tool", id=call_id, content='{"name": "Ann"}')
+    reply, state = await agent.agenerate_next_message(MultiToolMessage(role="tool", tool_messages=[tool_result]), state)
+
+    assert reply.content == "Found you."
+    first, second = session.sent
+    context = first[1].root.data
+    assert context["policy"] == "delta policy"
+    assert [tool["function"]["name"] for tool in context["tools"]] == ["get_user", "respond"]
+    assert context["messages"] == [{"role": "user", "content": "Hi"}]
+    assert len(second) == 1
+    assert second[0].root.data == {
+        "protocol": "tau2-delta/v1",
+        "messages": [{"role": "tool", "tool_call_id": call_id, "content": {"name": "Ann"}, "error": False}],
+    }
+
+
+def test_eval_config_rejects_unknown_message_protocol():
+    with pytest.raises(Exception):
+        EvalConfig.model_validate({"message_protocol": "binary"})
+
+
+@pytest.mark.asyncio
+async def test_next_simulation_starts_while_the_previous_task_is_scored(monkeypatch, tasks):
+    agent = Agent()
+    updater = FakeUpdater()
+    tasks(3)
+    events = []
+
+    async def fake_run_single_task(task, release_slot, **_kwargs):
+        events.append(f"simulate {task.id}")
+        await asyncio.sleep(0.05)
+        release_slot()
+        await asyncio.sleep(0.1)  # scoring, without the simulation slot
+        events.append(f"scored {task.id}")
+        return task_run_data()
+
+    monkeypatch.setattr(agent, "_run_single_task", fake_run_single_task)
+
+    request_payload = {
+        "participants": {"agent": "http://localhost:9019"},
+        "config": {"num_tasks": 3, "max_concurrency": 1},
+    }
+    await agent.run(_make_message(request_payload), updater)
+
+    # Task 1 is simulated while task 0 is scored, but with at most one task
+    # waiting for its score, task 2 has to wait for that score.
+    assert events.index("simulate task-1") < events.index("scored task-0")
+    assert events.index("scored task-0") < events.index("simulate task-2")
+    result = updater.artifacts[0]["parts"][1].root.data
+    assert [t["task_id"] for t in result["tasks"]] == ["task-0", "task-1", "task-2"]
+    assert result["summary"]["passed"] == 3
+
+
+@pytest.mark.asyncio
+async def test_stream_results_emits_task_chunks_then_summary(monkeypatch, tasks):
+    agent = Agent()
+    updater = FakeUpdater()
+    tasks(3)
+
+    async def fake_run_single_task(task, **_kwargs):
+        return task_run_data(float(task.id != "task-1"), eval_error="x" * 5000)
+
+    monkeypatch.setattr(agent, "_run_single_task", fake_run_single_task)
+
+    request_payload = {
+        "participants": {"agent": "http://localhost:9019"},
+        "config": {"domain": "mock", "num_tasks": 3, "stream_results": True},
+    }
+
+    await agent.run(_make_message(request_payload), updater)
+
+    assert len(updater.artifacts) == 4
+    assert len({artifact["artifact_id"] for artifact in updater.artifacts}) == 1
+    assert [artifact["append"] for artifact in updater.artifacts] == [False, True, True, True]
+    assert [artifact["last_chunk"] for artifact in updater.artifacts] == [False, False, False, True]
+
+    chunks = [artifact["parts"][0].root.data for artifact in updater.artifacts[:3]]
+    assert sorted(chunk["task_id"] for chunk in chunks) == ["task-0", "task-1", "task-2"]
+    assert all("index" in chunk for chunk in chunks)
+    [failed] = [chunk for chunk in chunks if not chunk["passed"]]
+    assert len(failed["error"]) == MAX_STREAMED_ERROR_CHARS + 3
+
+    summary = updater.artifacts[-1]["parts"][1].root.data
+    assert summary["summary"]["passed"] == 2
+    assert summary["summary"]["total"] == 3
+    assert "tasks" not in summary
+
+
+@pytest.mark.asyncio
+async def test_queued_evaluation_reports_position(monkeypatch, tasks):
+    scheduler = SimulationScheduler(max_simulations=1)
+    agent = Agent(scheduler=scheduler)
+    updater = FakeUpdater()
+    tasks(1)
+    monkeypatch.setattr(agent, "_run_single_task", fake_runner())
+
+    # Another evaluation holds the only slot.
+    other = scheduler.register("other", num_tasks=1, max_concurrency=1)
+    await scheduler.acquire(other)
+
+    request_payload = {
+        "participants": {"agent": "http://localhost:9019"},
+        "config": {"domain": "mock", "num_tasks": 1},
+    }
+    run = asyncio.create_task(agent.run(_make_message(request_payload), updater))
+    await asyncio.sleep(0.05)
+    assert not run.done()
+    scheduler.release(other)
+    await run
+
+    statuses = [message.parts[0].root.text for _, message in updater.status_updates]
+    assert any("Queued for a simulation slot (position 1" in status for status in statuses)
+    assert updater.artifacts
+
+
+@pytest.mark.asyncio
+async def test_resubmitted_evaluation_skips_checkpointed_tasks(monkeypatch, tmp_path, tasks):
+    checkpoints = CheckpointStore(tmp_path / "state.db")
+    tasks(3)
+    calls = []
+
+    async def fake_run_single_task(task, **_kwargs):
+        calls.append(task.id)
+        if task.id == "task-2" and len(calls) == 3:
+            raise asyncio.CancelledError  # the first run dies before the last task
+        return task_run_data()
+
+    request_payload = {
+        "participants": {"agent": "http://localhost:9019"},
+        "config": {"domain": "mock", "num_tasks": 3},
+    }
+
+    first = Agent(checkpoints=checkpoints)
+    monkeypatch.setattr(first, "_run_single_task", fake_run_single_task)
+    with pytest.raises(asyncio.CancelledError):
+        await first.run(_make_message(request_payload), FakeUpdater())
+
+    second = Agent(checkpoints=checkpoints)
+    monkeypatch.setattr(second, "_run_single_task", fake_run_single_task)
+    updater = FakeUpdater()
+    await second.run(_make_message(request_payload), updater)
+
+    assert calls == ["task-0", "task-1", "task-2", "task-2"]
+    result = updater.artifacts[0]["parts"][1].root.data
+    assert [t["task_id"] for t in result["tasks"]] == ["task-0", "task-1", "task-2"]
+    assert result["summary"]["resumed"] == 2
+    assert result["summary"]["passed"] == 3
+
+
+@pytest.mark.asyncio
+async def test_cached_results_skip_simulation(monkeypatch, tmp_path, tasks):
+    agent = Agent(result_cache=ResultCache(tmp_path))
+    tasks(2)
+    calls = []
+
+    async def fake_run_single_task(task, **_kwargs):
+        calls.append(task.id)
+        return task_run_data(1.0 if task.id == "task-0" else 0.0, tool_error=task.id == "task-1")
+
+    monkeypatch.setattr(agent, "_run_single_task", fake_run_single_task)
+
+    def payload(seed):
+        return {
+            "participants": {"agent": "http://localhost:9019"},
+            "config": {
+                "domain": "mock",
+                "num_tasks": 2,
+                "seed": seed,
+                "cache_results": True,
+                "agent_fingerprint": "build-123",
+            },
+        }
+
+    first, second, reseeded = FakeUpdater(), FakeUpdater(), FakeUpdater()
+    await agent.run(_make_message(payload(0)), first)
+    await agent.run(_make_message(payload(0)), second)
+    await agent.run(_make_message(payload(1)), reseeded)
+
+    assert calls == ["task-0", "task-1", "task-0", "task-1"]
+    result = second.artifacts[0]["parts"][1].root.data
+    assert result["cache"] == {"fingerprint": "build-123", "hits": 2, "misses": 0}
+    assert [t["cached"] for t in result["tasks"]] == [True, True]
+    assert result["summary"]["passed"] == 1
+    assert first.artifacts[0]["parts"][1].root.data["cache"]["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_plain_failures_are_cached_but_errors_are_not(monkeypatch, tmp_path, tasks):
+    agent = Agent(result_cache=ResultCache(tmp_path))
+    tasks(3)
+    calls = []
+
+    async def fake_run_single_task(task, **_kwargs):
+        calls.append(task.id)
+        if task.id == "task-1":
+            raise RuntimeError("environment crashed")
+        if task.id == "task-2":
+            return task_run_data(0.0, termination_reason="user_stop", eval_error="evaluation failed")
+        # The user ended the conversation and the agent earned nothing.
+        return task_run_data(0.0, termination_reason="user_stop")
+
+    monkeypatch.setattr(agent, "_run_single_task", fake_run_single_task)
+
+    payload = {
+        "participants": {"agent": "http://localhost:9019"},
+        "config": {"num_tasks": 3, "cache_results": True, "agent_fingerprint": "build-123"},
+    }
+    first, second = FakeUpdater(), FakeUpdater()
+    await agent.run(_make_message(payload), first)
+    await agent.run(_make_message(payload), second)
+
+    assert calls == ["task-0", "task-1", "task-2", "task-1", "task-2"]
+    result = second.artifacts[0]["parts"][1].root.data
+    assert result["cache"]["hits"] == 1 and result["cache"]["misses"] == 2
+    # All three keep the "unknown" label; only the ones with an error are re-run.
+    assert [(t["failure_reason"], t["cached"], bool(t["error"])) for t in result["tasks"]] == [
+        ("unknown", True, False),
+        ("unknown", False, True),
+        ("unknown", False, True),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_is_reported_as_failure_reason(monkeypatch, tasks):
+    agent = Agent()
+    updater = FakeUpdater()
+    tasks(1)
+
+    async def fake_run_single_task(**_kwargs):
+        error = CircuitOpenError("http://localhost:9019", 12.0)
+        raise RemoteAgentError(str(error)) from error
+
+    monkeypatch.setattr(agent, "_run_single_task", fake_run_single_task)
+
+    request_payload = {
+        "participants": {"agent": "http://localhost:9019"},
+        "config": {"domain": "mock", "num_tasks": 1},
+    }
+    await agent.run(_make_message(request_payload), updater)
+
+    task = updater.artifacts[0]["parts"][1].root.data["tasks"][0]
+    assert task["failure_reason"] == "circuit_open"
+    assert "circuit breaker: closed" in task["error"]
+
+
+@pytest.mark.asyncio
+async def test_batch_request_publishes_leaderboard(monkeypatch, tasks):
+    agent = Agent()
+    updater = FakeUpdater()
+    loads = tasks(2)
+
+    async def fake_run_single_task(task, agent_url, **_kwargs):
+        # The candidate passes every task, the baseline only the first one.
+        return task_run_data(float("candidate" in agent_url or task.id == "task-0"))
+
+    monkeypatch.setattr(agent, "_run_single_task", fake_run_single_task)
+
+    request_payload = {
+        "participants": {
+            "agent_baseline": "http://baseline:9019",
+            "agent_candidate": "http://candidate:9019",
+        },
+        "config": {"domain": "mock", "num_tasks": 2},
+    }
+
+    await agent.run(_make_message(request_payload), updater)
+
+    assert not updater.rejections
+    assert len(loads) == 1
+    assert [artifact["name"] for artifact in updater.artifacts] == ["Leaderboard"]
+    result = updater.artifacts[0]["parts"][1].root.data
+    assert [(e["rank"], e["role"], e["passed"]) for e in result["leaderboard"]] == [
+        (1, "agent_candidate", 2),
+        (2, "agent_baseline", 1),
+    ]
+    baseline = result["agents"]["agent_baseline"]
+    assert baseline["pass_rate"] == 50.0
+    assert [t["task_id"] for t in baseline["tasks"]] == ["task-0", "task-1"]
+    assert "config" in baseline and "summary" in baseline
+
+
+@pytest.mark.asyncio
+async def test_batch_failure_cancels_the_other_agents(monkeypatch, tasks):
+    scheduler = SimulationScheduler(max_simulations=4)
+    agent = Agent(scheduler=scheduler)
+    tasks(1)
+    cancelled = []
+
+    class FailingUpdater(FakeUpdater):
+        async def add_artifact(self, parts, name, **kwargs):
+            if name == "Result agent_broken":
+                raise ConnectionError("event queue closed")
+            await super().add_artifact(parts, name, **kwargs)
+
+    async def fake_run_single_task(agent_url, task, **_kwargs):
+        if "slow" in agent_url:
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.append(agent_url)
+                raise
+        return task_run_data()
+
+    monkeypatch.setattr(agent, "_run_single_task", fake_run_single_task)
+
+    request_payload = {
+        "participants": {"agent_broken": "http://broken:9019", "agent_slow": "http://slow:9019"},
+        "config": {"num_tasks": 1, "stream_results": True},
+    }
+    updater = FailingUpdater()
+    with pytest.raises(ConnectionError):
+        await agent.run(_make_message(request_payload), updater)
+
+    assert cancelled == ["http://slow:9019/"]
+    assert scheduler.in_use == 0
+    assert not updater.artifacts
+
+
+@pytest.mark.asyncio
+async def test_batch_request_rejects_duplicate_urls():
+    agent = Agent()
+    updater = FakeUpdater()
+
+    request_payload = {
+        "participants": {"agent_a": "http://localhost:9019", "agent_b": "http://localhost:9019"},
+        "config": {"domain": "mock"},
+    }
+
+    await agent.run(_make_message(request_payload), updater)
+
+    assert updater.rejections
+
+
+@pytest.mark.asyncio
+async def test_early_stop_skips_remaining_tasks(monkeypatch, tasks):
+    agent = Agent()
+    updater = FakeUpdater()
+    ran = []
+    tasks(10)
+
+    async def fake_run_single_task(task, **_kwargs):
+        ran.append(task.id)
+        return task_run_data(0.0)
+
+    monkeypatch.setattr(agent, "_run_single_task", fake_run_single_task)
+
+    request_payload = {
+        "participants": {"agent": "http://localhost:9019"},
+        "config": {"num_tasks": 10, "early_stop_pass_rate": 0.5, "early_stop_min_tasks": 3},
+    }
+
+    await agent.run(_make_message(request_payload), updater)
+
+    result = updater.artifacts[0]["parts"][1].root.data
+    assert ran == ["task-0", "task-1", "task-2", "task-3"]
+    assert result["summary"]["total"] == 4
+    assert [t["task_id"] for t in result["tasks"]] == ran
+    assert result["early_stop"]["decision"] == "fail"
+    assert result["early_stop"]["skipped"] == 6
+    assert result["early_stop"]["ci_high"] < 0.5
+
+
+@pytest.mark.asyncio
+async def test_results_export_receives_run_and_task_rows(monkeypatch, tmp_path, tasks):
+    export = ResultsExport(tmp_path / "results.t2rx")
+    agent = Agent(results_export=export)
+    updater = FakeUpdater()
+    tasks(2)
+    monkeypatch.setattr(agent, "_run_single_task", fake_runner())
+
+    request_payload = {
+        "participants": {"agent": "http://localhost:9019"},
+        "config": {"num_tasks": 2},
+    }
+
+    await agent.run(_make_message(request_payload), updater)
+    export.close()
+
+    [run] = runs(export.path).values()
+    assert run["agent_url"] == "http://localhost:9019/"
+    assert sorted(row.task_id for row in scan(export.path)) == ["task-0", "task-1"]
@@ -0,0 +1,69 @@
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+import evaluation_pool  # noqa: E402
+from domain_cache import domain_cache  # noqa: E402
+from evaluation_pool import EvaluationPool  # noqa: E402
+
+import tau2.evaluator.evaluator  # noqa: E402
+from tau2.data_model.simulation import SimulationRun  # noqa: E402
+
+
+def _simulation() -> SimulationRun:
+    return SimulationRun(
+        id="sim-1",
+        task_id="task-1",
+        start_time="2026-01-01T00:00:00",
+        end_time="2026-01-01T00:00:01",
+        duration=1.0,
+        termination_reason="user_stop",
+        messages=[],
+    )
+
+
+@pytest.mark.asyncio
+async def test_inline_pool_evaluates_off_the_event_loop(monkeypatch):
+    calls = []
+    threads = []
+
+    def fake_evaluate_simulation(simulation, task, **kwargs):
+        calls.append((simulation, task, kwargs["domain"]))
+        threads.append(threading.current_thread())
+        return SimpleNamespace(reward=1.0)
+
+    monkeypatch.setattr(tau2.evaluator.evaluator, "evaluate_simulation", fake_evaluate_simulation)
+    simulation = _simulation()
+    task = SimpleNamespace(id="task-1")
+
+    reward = await EvaluationPool(workers=0).evaluate(simulation, task, "mock")
+
+    assert reward == 1.0
+    assert calls == [(simulation, task, "mock")]
+    assert threads != [threading.main_thread()]
+
+
+def test_worker_evaluates_serialized_simulation(monkeypatch):
+    task = SimpleNamespace(id="task-1")
+    received = {}
+
+    def fake_evaluate_simulation(simulation, task, **kwargs):
+        received["simulation"] = simulation
+        received["task"] = task
+        return SimpleNamespace(reward=0.0)
+
+    monkeypatch.setattr(tau2.evaluator.evaluator, "evaluate_simulation", fake_evaluate_simulation)
+    monkeypatch.setattr(domain_cache, "get_tasks", lambda domain, task_ids: [task])
+
+    simulation = _simulation()
+    reward = evaluation_pool._evaluate_in_worker("mock", "task-1", simulation.model_dump_json())
+
+    assert reward == 0.0
+    assert received["task"] is task
+    assert received["simulation"].id == "sim-1"
+    assert received["simulation"].duration == 1.0
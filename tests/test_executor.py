@@ -0,0 +1,94 @@
+import asyncio
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from executor import AgentRegistry, Executor  # noqa: E402
+from messenger import Messenger  # noqa: E402
+from results_export import ResultsExport  # noqa: E402
+from task_store import CheckpointStore  # noqa: E402
+from trajectories import TrajectoryStore  # noqa: E402
+
+
+@pytest.mark.asyncio
+async def test_registry_evicts_least_recently_used_idle_agents():
+    registry = AgentRegistry(Messenger(), max_size=2)
+    for context_id in ("a", "b"):
+        await registry.acquire(context_id)
+        await registry.release(context_id)
+    await registry.acquire("a")
+    await registry.release("a")
+
+    await registry.acquire("c")
+    assert len(registry) == 2
+    assert registry.get("b") is None
+    assert registry.get("a") is not None and registry.get("c") is not None
+
+
+@pytest.mark.asyncio
+async def test_registry_keeps_busy_agents_and_drops_finished_ones():
+    registry = AgentRegistry(Messenger(), max_size=1, ttl_seconds=0.0)
+    busy = await registry.acquire("busy")
+    await registry.acquire("other")
+    assert registry.get("busy") is busy
+
+    await registry.release("busy", discard=True)
+    assert registry.get("busy") is None
+    await registry.release("other")
+    await registry.acquire("new")
+    assert registry.get("other") is None
+
+
+@pytest.mark.asyncio
+async def test_agents_share_the_registry_messenger():
+    messenger = Messenger()
+    registry = AgentRegistry(messenger)
+    first = await registry.acquire("a")
+    second = await registry.acquire("b")
+    assert first.messenger is messenger and second.messenger is messenger
+    await registry.close()
+    assert len(registry) == 0
+
+
+@pytest.mark.asyncio
+async def test_idle_registry_sweeps_expired_agents():
+    registry = AgentRegistry(Messenger(), ttl_seconds=0.05)
+    await registry.acquire("a")
+    await registry.release("a")
+    assert registry.get("a") is not None
+
+    sweeper = asyncio.create_task(registry.sweep(interval=0.02))
+    try:
+        await asyncio.sleep(0.2)
+    finally:
+        sweeper.cancel()
+    assert registry.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_aclose_closes_the_stores(tmp_path):
+    checkpoints = CheckpointStore(tmp_path / "state.db")
+    results_export = ResultsExport(tmp_path / "results.t2rx")
+    trajectory_store = TrajectoryStore(tmp_path / "trajectories")
+    writer = trajectory_store.open("run-1", "task-1")
+    executor = Executor(
+        checkpoints=checkpoints,
+        results_export=results_export,
+        trajectory_store=trajectory_store,
+    )
+
+    await executor.aclose()
+
+    assert results_export._fd is None
+    with pytest.raises(sqlite3.ProgrammingError):
+        checkpoints._execute("SELECT 1")
+    [entry] = trajectory_store.index()
+    assert entry["task_id"] == "task-1" and not entry["complete"]
+    # Closing twice is harmless.
+    results_export.close()
+    writer.close()
+    assert len(list(trajectory_store.index())) == 1
@@ -0,0 +1,237 @@
+import asyncio
+import socket
+import sys
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+import uvicorn
+
+from a2a.client.errors import A2AClientHTTPError
+from a2a.server.agent_execution import AgentExecutor
+from a2a.server.apps import A2AStarletteApplication
+from a2a.server.request_handlers import DefaultRequestHandler
+from a2a.server.tasks import InMemoryTaskStore
+from a2a.types import AgentCapabilities, AgentCard, DataPart, Part
+from a2a.utils import new_agent_parts_message, new_agent_text_message
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from messenger import FirstEventTimeoutError, Messenger  # noqa: E402
+from metrics import REGISTRY  # noqa: E402
+from resilience import CircuitOpenError, RetryPolicy  # noqa: E402
+from timings import A2A_FIRST_EVENT, PhaseTimer  # noqa: E402
+
+
+class EchoExecutor(AgentExecutor):
+    async def execute(self, context, event_queue):
+        data = [part for part in context.message.parts if isinstance(part.root, DataPart)]
+        if data:
+            await event_queue.enqueue_event(new_agent_parts_message(data, context_id=context.context_id))
+            return
+        if context.get_user_input().startswith("slow"):
+            await asyncio.sleep(0.5)
+        await event_queue.enqueue_event(
+            new_agent_text_message(f"echo: {context.get_user_input()}", context_id=context.context_id)
+        )
+
+    async def cancel(self, context, event_queue):
+        pass
+
+
+@pytest_asyncio.fixture
+async def echo_agent():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    url = f"http://127.0.0.1:{port}"
+
+    card = AgentCard(
+        name="Echo",
+        description="Echo agent",
+        url=f"{url}/",
+        version="1.0.0",
+        default_input_modes=["text"],
+        default_output_modes=["text"],
+        capabilities=AgentCapabilities(streaming=True),
+        skills=[],
+    )
+    app = A2AStarletteApplication(
+        agent_card=card,
+        http_handler=DefaultRequestHandler(agent_executor=EchoExecutor(), task_store=InMemoryTaskStore()),
+    ).build()
+
+    card_requests = 0
+
+    async def count_card_requests(scope, receive, send):
+        nonlocal card_requests
+        if scope["type"] == "http" and scope["path"].endswith("agent-card.json"):
+            card_requests += 1
+        await app(scope, receive, send)
+
+    server = uvicorn.Server(uvicorn.Config(count_card_requests, host="127.0.0.1", port=port, log_level="warning"))
+    serve_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    yield url, lambda: card_requests
+
+    server.should_exit = True
+    await serve_task
+
+
+@pytest.mark.asyncio
+async def test_messenger_reuses_agent_card_and_client(echo_agent):
+    url, card_requests = echo_agent
+    messenger = Messenger()
+    try:
+        for i in range(3):
+            response = await messenger.talk_to_agent(f"turn {i}", url, new_conversation=i == 0)
+            assert response == f"echo: turn {i}"
+    finally:
+        await messenger.aclose()
+
+    assert card_requests() == 1
+
+
+@pytest.mark.asyncio
+async def test_messenger_refetches_expired_agent_card(echo_agent):
+    url, card_requests = echo_agent
+    messenger = Messenger(card_ttl=0)
+    try:
+        await messenger.talk_to_agent("first", url, new_conversation=True)
+        await messenger.talk_to_agent("second", url)
+    finally:
+        await messenger.aclose()
+
+    assert card_requests() == 2
+
+
+@pytest.mark.asyncio
+async def test_sessions_keep_separate_contexts(echo_agent):
+    url, _ = echo_agent
+    messenger = Messenger()
+    try:
+        with messenger.open_session(url, "eval-1", "task-1") as first, \
+                messenger.open_session(url, "eval-1", "task-2") as second:
+            await asyncio.gather(
+                first.talk("hello", new_conversation=True),
+                second.talk("hello", new_conversation=True),
+            )
+            assert first.context_id and second.context_id
+            assert first.context_id != second.context_id
+            assert messenger.active_sessions == 2
+
+            with pytest.raises(ValueError):
+                messenger.open_session(url, "eval-1", "task-1")
+
+        assert messenger.active_sessions == 0
+        with pytest.raises(RuntimeError):
+            await first.talk("closed")
+    finally:
+        await messenger.aclose()
+
+
+@pytest.mark.asyncio
+async def test_unreachable_agent_opens_the_circuit_breaker():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        url = f"http://127.0.0.1:{s.getsockname()[1]}"
+    messenger = Messenger(retry_policy=RetryPolicy(base_delay=0.01), breaker_threshold=3)
+    try:
+        with pytest.raises(A2AClientHTTPError):
+            await messenger.talk_to_agent("hello", url, retries=1)
+        assert messenger.breaker(url).state == "closed"
+
+        # The third consecutive failure opens the breaker; retrying stops there.
+        with pytest.raises(CircuitOpenError):
+            await messenger.talk_to_agent("hello again", url, retries=5)
+        assert messenger.breaker(url).failures == 3
+        assert messenger.breaker(url).state == "open"
+
+        with pytest.raises(CircuitOpenError):
+            await messenger.talk_to_agent("and again", url, retries=5)
+    finally:
+        await messenger.aclose()
+
+
+def test_breakers_are_capped_and_drop_their_series():
+    messenger = Messenger(breaker_threshold=1, max_breakers=2)
+    down = messenger.breaker("http://down.example")
+    down.before_request()
+    down.record_failure()
+    messenger.breaker("http://first.example")
+    messenger.breaker("http://second.example")
+
+    # The open breaker is kept; the least recently used closed one is dropped.
+    assert set(messenger._breakers) == {"http://down.example", "http://second.example"}
+    text = REGISTRY.render()
+    assert 'tau2_circuit_breaker_state{url="http://first.example"}' not in text
+    assert 'tau2_circuit_breaker_state{url="http://down.example"} 2' in text
+
+
+class FixedDelay(RetryPolicy):
+    def delay(self, attempt, rand=None):
+        return 0.2
+
+
+@pytest.mark.asyncio
+async def test_closing_a_session_stops_its_retries():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        url = f"http://127.0.0.1:{s.getsockname()[1]}"
+    messenger = Messenger(retry_policy=FixedDelay(), breaker_threshold=10)
+    try:
+        session = messenger.open_session(url, "eval", "task")
+        talk = asyncio.create_task(session.talk("hello", retries=5))
+        while messenger.breaker(url).failures == 0:
+            await asyncio.sleep(0.01)
+        # The first attempt failed and the retry is backing off; the owner gives up.
+        session.close()
+        with pytest.raises(RuntimeError, match="is closed"):
+            await talk
+        assert messenger.breaker(url).failures == 1
+    finally:
+        await messenger.aclose()
+
+
+@pytest.mark.asyncio
+async def test_streaming_turn_records_time_to_first_event(echo_agent):
+    url, _ = echo_agent
+    messenger = Messenger()
+    timer = PhaseTimer()
+    try:
+        with messenger.open_session(url, "eval-1", "task-1", timer=timer) as session:
+            response = await session.talk("hello", new_conversation=True, streaming=True)
+    finally:
+        await messenger.aclose()
+
+    assert response == "echo: hello"
+    assert len(timer.samples[A2A_FIRST_EVENT]) == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_first_event_fails_without_retrying(echo_agent):
+    url, _ = echo_agent
+    messenger = Messenger()
+    try:
+        with pytest.raises(FirstEventTimeoutError):
+            await messenger.talk_to_agent("slow start", url, streaming=True, first_event_timeout=0.1, retries=3)
+        assert messenger.breaker(url).failures == 1
+    finally:
+        await messenger.aclose()
+
+
+@pytest.mark.asyncio
+async def test_session_exchanges_data_parts(echo_agent):
+    url, _ = echo_agent
+    messenger = Messenger()
+    payload = {"messages": [{"role": "tool", "content": {"balance": 10}}]}
+    try:
+        with messenger.open_session(url, "eval", "task") as session:
+            outputs = await session.exchange([Part(root=DataPart(data=payload))], new_conversation=True)
+    finally:
+        await messenger.aclose()
+
+    assert outputs["data"] == [payload]
+    assert outputs["response"] == '{"messages":[{"role":"tool","content":{"balance":10}}]}'
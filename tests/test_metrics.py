@@ -0,0 +1,58 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from metrics import MetricsRegistry, _Metric  # noqa: E402
+
+
+def test_render_prometheus_text_format():
+    registry = MetricsRegistry()
+    tasks = registry.counter("tasks_total", "Tasks.", ("failure_reason",))
+    in_flight = registry.gauge("in_flight", "In flight.")
+    pool = registry.gauge("pool_size", "Pool size.", function=lambda: 3)
+    latency = registry.histogram("latency_seconds", "Latency.", ("phase",), buckets=(0.1, 1.0))
+
+    tasks.inc(failure_reason="none")
+    tasks.inc(2, failure_reason="timeout")
+    in_flight.inc()
+    latency.observe(0.05, phase="agent_turn")
+    latency.observe(0.5, phase="agent_turn")
+
+    text = registry.render()
+
+    assert "# TYPE tasks_total counter" in text
+    assert 'tasks_total{failure_reason="timeout"} 2.0' in text
+    assert "in_flight 1.0" in text
+    assert "pool_size 3.0" in text
+    assert 'latency_seconds_bucket{phase="agent_turn",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{phase="agent_turn",le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{phase="agent_turn",le="+Inf"} 2' in text
+    assert 'latency_seconds_count{phase="agent_turn"} 2' in text
+    assert pool.value() == 3.0
+
+
+def test_labels_must_match_declaration():
+    registry = MetricsRegistry()
+    tasks = registry.counter("tasks_total", "Tasks.", ("failure_reason",))
+    with pytest.raises(ValueError):
+        tasks.inc(reason="timeout")
+    with pytest.raises(ValueError):
+        registry.counter("tasks_total", "Duplicate.")
+
+
+def test_removed_gauge_series_is_not_rendered():
+    registry = MetricsRegistry()
+    state = registry.gauge("state", "State.", ("url",))
+    state.set(2, url="http://a")
+    state.set(0, url="http://b")
+
+    state.remove(url="http://a")
+
+    text = registry.render()
+    assert 'state{url="http://a"}' not in text
+    assert 'state{url="http://b"} 0' in text
+    with pytest.raises(TypeError):
+        _Metric("abstract", "Not a metric.")
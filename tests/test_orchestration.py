@@ -0,0 +1,242 @@
+import asyncio
+import json
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from agent import RemoteA2AAgent, RemoteAgentError  # noqa: E402
+from orchestration import AsyncStepDriver, simulation_stats  # noqa: E402
+
+from tau2.data_model.message import ToolMessage, UserMessage  # noqa: E402
+from tau2.data_model.simulation import TerminationReason  # noqa: E402
+from tau2.orchestrator.orchestrator import Role  # noqa: E402
+
+
+def respond(content: str) -> dict:
+    return {"response": json.dumps({"name": "respond", "arguments": {"content": content}}), "data": []}
+
+
+def call_tool(name: str) -> dict:
+    return {"response": json.dumps({"name": name, "arguments": {}}), "data": []}
+
+
+class ScriptedSession:
+    """Conversation session whose purple agent answers with `reply(turn)`."""
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.sent = []
+
+    async def exchange(self, message, **_kwargs):
+        self.sent.append(message)
+        return self.reply(len(self.sent))
+
+
+class ScriptedOrchestrator:
+    """
+    Stand-in for tau2's Orchestrator: the agent, the user and the environment
+    take turns. `user_reply(message)` returns the user's next text, or None to
+    end the conversation; tool calls fail when `tool_error` is set.
+    """
+
+    def __init__(self, agent, user_reply=lambda message: None, tool_error=False, max_steps=20, max_errors=10):
+        self.agent = agent
+        self.user_reply = user_reply
+        self.tool_error = tool_error
+        self.task = SimpleNamespace(id="task-1")
+        self.seed = 7
+        self.max_steps = max_steps
+        self.max_errors = max_errors
+        self.steps = []
+
+    def initialize(self):
+        self.done = False
+        self.termination_reason = None
+        self.step_count = 0
+        self.num_errors = 0
+        self.agent_state = self.agent.get_init_state()
+        self.message = UserMessage(role="user", content="Hi")
+        self.trajectory = [self.message]
+        self.to_role = Role.AGENT
+
+    def step(self):
+        self.steps.append(self.to_role)
+        if self.to_role == Role.AGENT:
+            self.message, self.agent_state = self.agent.generate_next_message(self.message, self.agent_state)
+            self.to_role = Role.ENV if self.message.tool_calls else Role.USER
+        elif self.to_role == Role.USER:
+            content = self.user_reply(self.message)
+            if content is None:
+                self.done = True
+                self.termination_reason = TerminationReason.USER_STOP
+                return
+            self.message = UserMessage(role="user", content=content)
+            self.to_role = Role.AGENT
+        else:
+            call = self.message.tool_calls[0]
+            self.message = ToolMessage(
+                role="tool", id=call.id, content="failed" if self.tool_error else "ok", error=self.tool_error
+            )
+            self.num_errors += self.tool_error
+            self.to_role = Role.AGENT
+        self.trajectory.append(self.message)
+        self.step_count += 1
+
+    def get_trajectory(self):
+        return list(self.trajectory)
+
+
+def scripted_agent(reply) -> RemoteA2AAgent:
+    return RemoteA2AAgent(
+        tools=[],
+        domain_policy="scripted policy",
+        session=ScriptedSession(reply),
+        timeout_seconds=10,
+        retries=0,
+    )
+
+
+@pytest.mark.asyncio
+async def test_driver_hands_staged_replies_to_the_orchestrator():
+    agent = scripted_agent(lambda turn: respond(f"answer {turn}"))
+    user_replies = iter(["One more thing"])
+    orchestrator = ScriptedOrchestrator(agent, user_reply=lambda message: next(user_replies, None))
+    emitted = []
+
+    simulation = await AsyncStepDriver(orchestrator, on_message=emitted.append).run()
+
+    # RemoteA2AAgent refuses to answer synchronously, so each agent step used the staged reply.
+    assert orchestrator.steps == [Role.AGENT, Role.USER, Role.AGENT, Role.USER]
+    assert len(agent.session.sent) == 2
+    assert [m.content for m in simulation.messages] == ["Hi", "answer 1", "One more thing", "answer 2"]
+    assert emitted == orchestrator.trajectory
+    assert simulation.task_id == "task-1"
+    assert simulation.seed == 7
+    assert simulation.termination_reason == TerminationReason.USER_STOP.value
+    assert simulation.reward_info is None
+    assert simulation.duration >= 0
+
+
+@pytest.mark.asyncio
+async def test_driver_propagates_agent_errors():
+    def unreachable(turn):
+        raise ConnectionError("purple agent is down")
+
+    orchestrator = ScriptedOrchestrator(scripted_agent(unreachable))
+    before = simulation_stats.snapshot()
+
+    with pytest.raises(RemoteAgentError, match="purple agent is down"):
+        await AsyncStepDriver(orchestrator).run()
+
+    after = simulation_stats.snapshot()
+    assert after["failed"] == before["failed"] + 1
+    assert after["in_flight"] == before["in_flight"]
+    assert orchestrator.steps == [Role.AGENT]
+
+
+@pytest.mark.asyncio
+async def test_driver_stops_at_max_steps():
+    orchestrator = ScriptedOrchestrator(
+        scripted_agent(lambda turn: respond("go on")),
+        user_reply=lambda message: "and?",
+        max_steps=3,
+    )
+
+    simulation = await AsyncStepDriver(orchestrator).run()
+
+    assert simulation.termination_reason == TerminationReason.MAX_STEPS.value
+    assert orchestrator.steps == [Role.AGENT, Role.USER, Role.AGENT]
+
+
+@pytest.mark.asyncio
+async def test_driver_stops_after_too_many_tool_errors():
+    orchestrator = ScriptedOrchestrator(
+        scripted_agent(lambda turn: call_tool("get_user")),
+        tool_error=True,
+        max_errors=2,
+    )
+
+    simulation = await AsyncStepDriver(orchestrator).run()
+
+    assert simulation.termination_reason == TerminationReason.TOO_MANY_ERRORS.value
+    assert orchestrator.steps == [Role.AGENT, Role.ENV, Role.AGENT, Role.ENV]
+    assert [m.error for m in simulation.messages if isinstance(m, ToolMessage)] == [True, True]
+
+
+@pytest.mark.asyncio
+async def test_user_steps_run_in_the_given_executor():
+    threads = []
+
+    def user_reply(message):
+        threads.append(threading.current_thread().name)
+        return None
+
+    orchestrator = ScriptedOrchestrator(scripted_agent(lambda turn: respond("hello")), user_reply=user_reply)
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="user-steps") as executor:
+        await AsyncStepDriver(orchestrator, executor=executor).run()
+
+    assert len(threads) == 1 and threads[0].startswith("user-steps")
+
+
+@pytest.mark.asyncio
+async def test_cancel_during_agent_call_stops_the_simulation():
+    called = asyncio.Event()
+
+    class HangingSession:
+        async def exchange(self, message, **_kwargs):
+            called.set()
+            await asyncio.Event().wait()
+
+    agent = scripted_agent(lambda turn: respond("never sent"))
+    agent.session = HangingSession()
+    orchestrator = ScriptedOrchestrator(agent)
+    before = simulation_stats.snapshot()
+
+    run = asyncio.create_task(AsyncStepDriver(orchestrator).run())
+    await called.wait()
+    assert simulation_stats.snapshot()["in_flight"] == before["in_flight"] + 1
+    run.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await run
+
+    after = simulation_stats.snapshot()
+    assert after["cancelled"] == before["cancelled"] + 1
+    assert after["in_flight"] == before["in_flight"]
+    # The reply never arrived, so the orchestrator never took the agent step.
+    assert orchestrator.steps == []
+
+
+@pytest.mark.asyncio
+async def test_cancel_during_user_step_counts_the_orphaned_thread():
+    entered = threading.Event()
+    release = threading.Event()
+
+    def user_reply(message):
+        entered.set()
+        release.wait(5)
+        return "still here"
+
+    orchestrator = ScriptedOrchestrator(scripted_agent(lambda turn: respond("hello")), user_reply=user_reply)
+    before = simulation_stats.snapshot()
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        run = asyncio.create_task(AsyncStepDriver(orchestrator, executor=executor).run())
+        await asyncio.to_thread(entered.wait, 5)
+        run.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await run
+
+        assert simulation_stats.snapshot()["orphaned_threads"] == before["orphaned_threads"] + 1
+        release.set()
+
+    # The executor has been shut down, so the thread has returned.
+    after = simulation_stats.snapshot()
+    assert after["orphaned_threads"] == before["orphaned_threads"]
+    assert after["cancelled"] == before["cancelled"] + 1
+    assert orchestrator.steps == [Role.AGENT, Role.USER]
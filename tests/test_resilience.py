@@ -0,0 +1,75 @@
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+from a2a.client.errors import A2AClientHTTPError, A2AClientJSONError, A2AClientTimeoutError
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from resilience import (  # noqa: E402
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    is_retryable,
+    is_unavailable,
+)
+
+
+def test_backoff_grows_exponentially_up_to_the_cap():
+    policy = RetryPolicy(base_delay=0.5, max_delay=3.0)
+    upper = lambda low, high: high  # noqa: E731
+    assert [policy.delay(attempt, rand=upper) for attempt in range(4)] == [0.5, 1.0, 2.0, 3.0]
+    assert all(0.0 <= policy.delay(attempt) <= 3.0 for attempt in range(10))
+
+
+def test_only_transient_errors_are_retried():
+    assert is_retryable(A2AClientHTTPError(503, "Network communication error"))
+    assert is_retryable(A2AClientHTTPError(429, "Too many requests"))
+    assert is_retryable(httpx.ConnectError("refused"))
+    assert not is_retryable(A2AClientHTTPError(400, "Bad request"))
+    assert not is_retryable(A2AClientJSONError("bad json"))
+    assert not is_retryable(A2AClientTimeoutError("timed out"))
+    assert not is_retryable(RuntimeError("agent said no"))
+
+    assert is_unavailable(A2AClientTimeoutError("timed out"))
+    assert not is_unavailable(A2AClientJSONError("bad json"))
+
+
+def test_breaker_opens_probes_and_closes():
+    now = [0.0]
+    breaker = CircuitBreaker("http://agent", failure_threshold=2, reset_timeout=10.0, clock=lambda: now[0])
+
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    now[0] = 11.0
+    breaker.before_request()  # the probe
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()  # only one probe at a time
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    breaker.before_request()
+
+
+def test_failed_probe_reopens_the_breaker():
+    now = [0.0]
+    breaker = CircuitBreaker("http://agent", failure_threshold=1, reset_timeout=5.0, clock=lambda: now[0])
+    breaker.record_failure()
+    now[0] = 6.0
+    breaker.before_request()
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
@@ -0,0 +1,53 @@
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from result_cache import ResultCache, cache_key  # noqa: E402
+
+
+def test_cache_key_ignores_field_order():
+    assert cache_key(a=1, b={"x": 1, "y": 2}) == cache_key(b={"y": 2, "x": 1}, a=1)
+    assert cache_key(a=1) != cache_key(a=2)
+
+
+def test_cache_round_trip_and_reopen(tmp_path):
+    cache = ResultCache(tmp_path)
+    key = cache_key(task_id="task-1")
+    assert cache.get(key) is None
+
+    cache.put(key, {"task_id": "task-1", "reward": 1.0})
+    assert cache.get(key) == {"task_id": "task-1", "reward": 1.0}
+
+    reopened = ResultCache(tmp_path)
+    assert len(reopened) == 1
+    assert reopened.get(key) == {"task_id": "task-1", "reward": 1.0}
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    value = {"payload": "x" * 100}  # 117 bytes of JSON
+    cache = ResultCache(tmp_path, max_bytes=400)
+    keys = [cache_key(i=i) for i in range(3)]
+    for key in keys:
+        cache.put(key, value)
+    cache.get(keys[0])
+
+    cache.put(cache_key(i=3), value)
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == value
+    assert len(cache) == 3
+    assert cache.size_bytes <= 400
+
+
+def test_unreadable_entry_is_dropped(tmp_path):
+    cache = ResultCache(tmp_path)
+    key = cache_key(task_id="task-1")
+    cache.put(key, {"reward": 1.0})
+    path = tmp_path / key[:2] / f"{key}.json"
+    path.write_text("not json")
+
+    assert cache.get(key) is None
+    assert not os.path.exists(path)
+    assert len(cache) == 0
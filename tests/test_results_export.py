@@ -0,0 +1,78 @@
+import math
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from agent import TaskResult  # noqa: E402
+from results_export import ResultsExport, aggregate, runs, scan  # noqa: E402
+
+RUN_A = "a" * 32
+RUN_B = "b" * 32
+
+
+def _result(task_id: str, passed: bool, failure_reason=None, **timings) -> TaskResult:
+    return TaskResult(
+        task_id=task_id,
+        passed=passed,
+        reward=1.0 if passed else 0.0,
+        duration_sec=2.5,
+        turns=4,
+        tool_calls=1,
+        failure_reason=failure_reason,
+        error=None,
+        timings=timings,
+    )
+
+
+def test_rows_round_trip(tmp_path):
+    path = tmp_path / "results.t2rx"
+    export = ResultsExport(path)
+    export.add_run(RUN_A, "mock", "http://purple:9019", {"num_tasks": 2})
+    export.add_task(RUN_A, _result("task-1", True, agent_turn=1.5))
+    export.add_task(RUN_A, _result("task-2", False, "max_steps"))
+    export.close()
+
+    rows = list(scan(path))
+    assert [row.task_id for row in rows] == ["task-1", "task-2"]
+    assert rows[0].run_id == RUN_A and rows[0].passed and rows[0].turns == 4
+    assert math.isclose(rows[0].timings["agent_turn"], 1.5)
+    assert rows[1].failure_reason == "max_steps" and rows[1].timings == {}
+    assert runs(path)[RUN_A]["config"] == {"num_tasks": 2}
+
+
+def test_writes_after_close_are_dropped(tmp_path, caplog):
+    path = tmp_path / "results.t2rx"
+    export = ResultsExport(path)
+    export.add_run(RUN_A, "mock", "http://purple:9019", {})
+    export.close()
+
+    export.add_task(RUN_A, _result("task-1", True))
+
+    assert list(scan(path)) == []
+    assert "closed" in caplog.text
+
+
+def test_aggregate_across_files_ignores_truncated_tail(tmp_path):
+    first, second = tmp_path / "first.t2rx", tmp_path / "second.t2rx"
+    for path, run_id, outcomes in ((first, RUN_A, [True, True]), (second, RUN_B, [True, False])):
+        export = ResultsExport(path)
+        export.add_run(run_id, "mock", "http://purple:9019", {})
+        for i, passed in enumerate(outcomes):
+            export.add_task(run_id, _result(f"task-{i}", passed, None if passed else "timeout"))
+        export.close()
+    # A crash mid-write leaves a partial record at the end of the file.
+    with open(second, "ab") as f:
+        f.write(b"T\xff\x00\x00\x00partial")
+
+    summary = aggregate([first, second])
+
+    assert summary["runs"][RUN_A]["pass_rate"] == 100.0
+    assert summary["runs"][RUN_B]["passed"] == 1
+    assert summary["total"] == {
+        "runs": 2,
+        "tasks": 4,
+        "passed": 3,
+        "pass_rate": 75.0,
+        "failure_reasons": {"timeout": 1},
+    }
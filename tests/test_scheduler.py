@@ -0,0 +1,115 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from scheduler import SimulationScheduler  # noqa: E402
+
+
+async def _drain():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        SimulationScheduler(policy="lottery")
+
+
+@pytest.mark.asyncio
+async def test_global_budget_and_per_evaluation_cap():
+    scheduler = SimulationScheduler(max_simulations=3)
+    first = scheduler.register("first", num_tasks=4, max_concurrency=2)
+    second = scheduler.register("second", num_tasks=4, max_concurrency=2)
+
+    grants = [asyncio.create_task(scheduler.acquire(a)) for a in (first, first, first, second, second)]
+    await _drain()
+
+    assert scheduler.in_use == 3
+    assert first.running == 2
+    assert second.running == 1
+    assert not grants[2].done()
+
+    scheduler.release(second)
+    await _drain()
+    assert second.running == 1
+    assert first.running == 2
+    for grant in grants:
+        grant.cancel()
+
+
+@pytest.mark.asyncio
+async def test_fifo_serves_earlier_evaluations_first():
+    scheduler = SimulationScheduler(max_simulations=1, policy="fifo")
+    first = scheduler.register("first", num_tasks=3, max_concurrency=1)
+    await scheduler.acquire(first)
+    second = scheduler.register("second", num_tasks=1, max_concurrency=1)
+
+    waiting = [asyncio.create_task(scheduler.acquire(a)) for a in (second, first)]
+    await _drain()
+    scheduler.release(first, duration_sec=4.0)
+    await _drain()
+
+    assert waiting[1].done() and not waiting[0].done()
+    # The running task and first's last task finish before second starts.
+    assert scheduler.queue_status(second) == (1, 8.0)
+    waiting[0].cancel()
+
+
+@pytest.mark.asyncio
+async def test_fair_policy_favours_evaluations_holding_fewer_slots():
+    scheduler = SimulationScheduler(max_simulations=1, policy="fair")
+    first = scheduler.register("first", num_tasks=3, max_concurrency=1)
+    await scheduler.acquire(first)
+    second = scheduler.register("second", num_tasks=1, max_concurrency=1)
+
+    waiting = [asyncio.create_task(scheduler.acquire(a)) for a in (first, second)]
+    await _drain()
+    assert scheduler.queue_status(second) == (1, None)
+
+    scheduler.release(first, duration_sec=2.0)
+    await _drain()
+
+    assert waiting[1].done() and not waiting[0].done()
+    assert second.admitted.is_set()
+    assert second.queue_wait_sec is not None
+    waiting[0].cancel()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_take_a_slot():
+    scheduler = SimulationScheduler(max_simulations=1)
+    first = scheduler.register("first", num_tasks=1, max_concurrency=1)
+    second = scheduler.register("second", num_tasks=1, max_concurrency=1)
+    await scheduler.acquire(first)
+
+    waiter = asyncio.create_task(scheduler.acquire(second))
+    await _drain()
+    waiter.cancel()
+    await _drain()
+    scheduler.release(first)
+
+    assert scheduler.in_use == 0
+    assert not second.waiters
+
+
+@pytest.mark.asyncio
+async def test_slot_released_early_admits_the_next_simulation():
+    scheduler = SimulationScheduler(max_simulations=1)
+    admission = scheduler.register("first", num_tasks=2, max_concurrency=1)
+
+    async with scheduler.slot(admission) as lease:
+        waiter = asyncio.create_task(scheduler.acquire(admission))
+        await _drain()
+        assert not waiter.done()
+        lease.release()
+        await _drain()
+        assert waiter.done()
+
+    # Leaving the block does not release the slot a second time.
+    assert scheduler.in_use == 1
+    scheduler.release(admission)
+    assert scheduler.in_use == 0
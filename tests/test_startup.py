@@ -0,0 +1,62 @@
+import logging
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+sys.path.append(str(SRC))
+
+from executor import Executor  # noqa: E402
+from metrics import REGISTRY  # noqa: E402
+from startup import StartupTimer  # noqa: E402
+
+
+def test_server_import_defers_tau2():
+    code = (
+        "import sys, server; "
+        "heavy = [m for m in sys.modules if m == 'agent' or m.split('.')[0] in ('tau2', 'litellm')]; "
+        "print(heavy)"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=SRC, capture_output=True, text=True, check=True
+    ).stdout
+    assert out.strip() == "[]"
+
+
+@pytest.mark.asyncio
+async def test_warm_up_loads_the_agent_class_once():
+    executor = Executor()
+    try:
+        await executor.warm_up()
+        agent_class = executor.agents._agent_class
+        assert agent_class is not None and agent_class.__name__ == "Agent"
+
+        agent = await executor.agents.acquire("ctx")
+        assert isinstance(agent, agent_class)
+        assert await executor.agents.load_agent_class() is agent_class
+    finally:
+        await executor.aclose()
+
+
+def test_startup_marks_are_reported_and_exported():
+    timer = StartupTimer()
+    first = timer.mark("imports")
+    second = timer.mark("serving")
+
+    assert 0 <= first <= second
+    assert list(timer.report()) == ["imports", "serving"]
+    assert 'tau2_startup_seconds{phase="serving"}' in REGISTRY.render()
+
+
+def test_startup_timings_are_logged_without_warm_up(caplog):
+    from starlette.testclient import TestClient
+
+    from server import create_app
+
+    with caplog.at_level(logging.INFO, logger="tau2_green_agent.server"):
+        with TestClient(create_app("http://localhost:9009/", warm_up=False)):
+            pass
+
+    assert any(r.getMessage().startswith("Startup timings") and "serving" in r.getMessage() for r in caplog.records)
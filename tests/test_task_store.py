@@ -0,0 +1,58 @@
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+from a2a.types import Task, TaskState, TaskStatus
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from task_store import CheckpointStore, SQLiteTaskStore  # noqa: E402
+
+
+@pytest.mark.asyncio
+async def test_task_store_survives_reopen(tmp_path):
+    path = tmp_path / "state.db"
+    store = SQLiteTaskStore(path)
+    task = Task(id="task-1", context_id="ctx-1", status=TaskStatus(state=TaskState.working))
+    await store.save(task)
+    store.close()
+
+    reopened = SQLiteTaskStore(path)
+    loaded = await reopened.get("task-1")
+    assert loaded == task
+    assert reopened._execute("PRAGMA journal_mode")[0][0] == "wal"
+
+    await reopened.delete("task-1")
+    assert await reopened.get("task-1") is None
+
+
+@pytest.mark.asyncio
+async def test_checkpoints_are_scoped_to_an_evaluation(tmp_path):
+    checkpoints = CheckpointStore(tmp_path / "state.db")
+    await checkpoints.save("eval-a", 0, "task-0", {"task_id": "task-0", "reward": 1.0})
+    await checkpoints.save("eval-a", 2, "task-2", {"task_id": "task-2", "reward": 0.0})
+    await checkpoints.save("eval-b", 0, "task-0", {"task_id": "task-0", "reward": 0.0})
+
+    assert await checkpoints.load("eval-a") == {
+        0: {"task_id": "task-0", "reward": 1.0},
+        2: {"task_id": "task-2", "reward": 0.0},
+    }
+
+    await checkpoints.clear("eval-a")
+    assert await checkpoints.load("eval-a") == {}
+    assert len(await checkpoints.load("eval-b")) == 1
+
+
+def test_server_shutdown_closes_the_task_store(tmp_path):
+    from starlette.testclient import TestClient
+
+    from server import create_app
+
+    store = SQLiteTaskStore(tmp_path / "state.db")
+    with TestClient(create_app("http://localhost:9009/", task_store=store, warm_up=False)):
+        assert store._execute("SELECT 1") == [(1,)]
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        store._execute("SELECT 1")
@@ -0,0 +1,37 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from timings import EvalTimings, PhaseTimer, percentile  # noqa: E402
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 50) is None
+
+
+def test_eval_timings_merge_task_timers():
+    first = PhaseTimer()
+    first.record("agent_turn", 1.0)
+    first.record("agent_turn", 3.0)
+    second = PhaseTimer()
+    second.record("agent_turn", 2.0)
+    with second.measure("evaluation"):
+        pass
+
+    assert first.totals() == {"agent_turn": 4.0}
+
+    timings = EvalTimings()
+    timings.add(first)
+    timings.add(second)
+    summary = timings.to_dict()
+
+    assert summary["agent_turn"]["count"] == 3
+    assert summary["agent_turn"]["total_sec"] == 6.0
+    assert summary["agent_turn"]["p50"] == 2.0
+    assert summary["agent_turn"]["max"] == 3.0
+    assert summary["evaluation"]["count"] == 1
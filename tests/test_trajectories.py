@@ -0,0 +1,59 @@
+import gzip
+import re
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from trajectories import TrajectoryStore  # noqa: E402
+
+from tau2.data_model.message import AssistantMessage, UserMessage  # noqa: E402
+
+
+def test_messages_are_streamed_compressed_and_indexed(tmp_path):
+    store = TrajectoryStore(tmp_path)
+    writer = store.open("run-1", "task/1")
+    writer.write(UserMessage(role="user", content="Hi"))
+    writer.write(AssistantMessage(role="assistant", content="Hello"))
+    writer.close()
+
+    assert re.fullmatch(r"task_1-[0-9a-f]{8}\.jsonl\.gz", writer.path.name)
+    with gzip.open(writer.path, "rt") as f:
+        assert len(f.readlines()) == 2
+    [entry] = store.index()
+    assert entry["task_id"] == "task/1" and entry["messages"] == 2 and entry["complete"]
+    assert store.load("task/1") == [
+        {"role": "user", "content": "Hi"},
+        {"role": "assistant", "content": "Hello"},
+    ]
+
+
+def test_load_picks_latest_run_unless_one_is_given(tmp_path):
+    store = TrajectoryStore(tmp_path)
+    for run_id, content in (("run-1", "first"), ("run-2", "second")):
+        writer = store.open(run_id, "task-1")
+        writer.write(UserMessage(role="user", content=content))
+        writer.close(complete=run_id == "run-1")
+
+    assert store.load("task-1")[0]["content"] == "second"
+    assert store.load("task-1", run_id="run-1")[0]["content"] == "first"
+    assert store.find("task-1")["complete"] is False
+    assert store.load("task-2") is None
+
+
+def test_task_ids_with_the_same_safe_name_keep_separate_files(tmp_path):
+    store = TrajectoryStore(tmp_path)
+    for task_id in ("a/b", "a_b"):
+        writer = store.open("run-1", task_id)
+        writer.write(UserMessage(role="user", content=task_id))
+        writer.close()
+
+    assert store.load("a/b")[0]["content"] == "a/b"
+    assert store.load("a_b")[0]["content"] == "a_b"
+
+    # Entries indexed after a lookup are picked up by the next one.
+    writer = store.open("run-2", "a/b")
+    writer.write(UserMessage(role="user", content="again"))
+    writer.close()
+    assert store.load("a/b")[0]["content"] == "again"
+    assert store.load("a/b", run_id="run-1")[0]["content"] == "a/b"
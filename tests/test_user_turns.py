@@ -0,0 +1,70 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from tau2.data_model.message import AssistantMessage, UserMessage  # noqa: E402
+from tau2.user.user_simulator import UserSimulator  # noqa: E402
+
+from result_cache import ResultCache  # noqa: E402
+from user_turns import CachingUserSimulator, UserTurnReplayMiss  # noqa: E402
+
+
+@pytest.fixture
+def llm_calls(monkeypatch):
+    calls = []
+
+    def fake_generate_next_message(self, message, state):
+        calls.append(message.content)
+        state.messages.append(message)
+        user_message = UserMessage(role="user", content=f"reply to {message.content}")
+        state.messages.append(user_message)
+        return user_message, state
+
+    monkeypatch.setattr(UserSimulator, "generate_next_message", fake_generate_next_message)
+    return calls
+
+
+def _user(store, mode):
+    return CachingUserSimulator(
+        store=store, mode=mode, instructions="book a flight", llm="openai/gpt-4.1", llm_args={"temperature": 0.0}
+    )
+
+
+def _converse(user, turns):
+    state = SimpleNamespace(messages=[])
+    replies = []
+    for turn in turns:
+        reply, state = user.generate_next_message(AssistantMessage(role="assistant", content=turn), state)
+        replies.append(reply.content)
+    return replies, state
+
+
+def test_recorded_turns_are_replayed_without_the_llm(tmp_path, llm_calls):
+    store = ResultCache(tmp_path, name="user_turn")
+    recorded, _ = _converse(_user(store, "record"), ["hi", "which date?"])
+    replayed, state = _converse(_user(store, "replay"), ["hi", "which date?"])
+
+    assert llm_calls == ["hi", "which date?"]
+    assert replayed == recorded
+    assert [m.content for m in state.messages] == ["hi", "reply to hi", "which date?", "reply to which date?"]
+
+
+def test_replay_miss_does_not_call_the_llm(tmp_path, llm_calls):
+    store = ResultCache(tmp_path, name="user_turn")
+    _converse(_user(store, "record"), ["hi"])
+
+    with pytest.raises(UserTurnReplayMiss):
+        _converse(_user(store, "replay"), ["hello"])
+    assert llm_calls == ["hi"]
+
+
+def test_key_depends_on_llm_args(tmp_path):
+    store = ResultCache(tmp_path, name="user_turn")
+    cold = CachingUserSimulator(store=store, llm="openai/gpt-4.1", llm_args={"temperature": 0.0})
+    warm = CachingUserSimulator(store=store, llm="openai/gpt-4.1", llm_args={"temperature": 0.7})
+    message = AssistantMessage(role="assistant", content="hi")
+    assert cold.turn_key([], message) != warm.turn_key([], message)